@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+
+"""Values cached in simulations, and values derived from them, kept as long as these values stay in cache."""
+
+import collections
+import weakref
+
+from openfisca_core.entities import Projector
+from openfisca_core.formulas import ADD
+
+
+def get_tax_benefit_system_option(tax_benefit_system, name, default = None):
+    """Return the option `name` of `tax_benefit_system`, e.g. `fused_cotisations_sociales`.
+
+    Options are attributes of FranceTaxBenefitSystem: under a reform, they are read from the tax and benefit system the
+    reform is built on.
+    """
+    while getattr(tax_benefit_system, 'baseline', None) is not None:
+        tax_benefit_system = tax_benefit_system.baseline
+    return getattr(tax_benefit_system, name, default)
+
+
+# Keys (variable_name, period) of the values removed from the cache of each simulation only to free memory, by
+# simulation.
+released_keys_by_simulation = weakref.WeakKeyDictionary()
+
+
+def mark_released(simulation, variable_name, period):
+    """Record that the value of `variable_name` for `period` was removed from the cache of `simulation` only to free
+    memory, e.g. after its last planned request: it would be computed again from the same inputs, so the values
+    derived from it stay valid (see `DerivedValuesCache`)."""
+    released_keys_by_simulation.setdefault(simulation, set()).add((variable_name, period))
+
+
+class DerivedValuesCache(object):
+    """Values derived from monthly values cached in simulations, e.g. their sums over several months.
+
+    A derived value is kept with weak references to the monthly values it was computed from, and is returned only as
+    long as they are still the values cached by the holders of its simulation. It is thus forgotten as soon as one of
+    them is deleted or replaced, e.g. by `delete_arrays`, `set_input` or a numerical inversion, unless it was only
+    released to free memory (see `mark_released`).
+    """
+    def __init__(self):
+        # Derived values and their sources, by simulation and then by key.
+        self.entry_by_key_by_simulation = weakref.WeakKeyDictionary()
+
+    def get(self, simulation, key):
+        entry_by_key = self.entry_by_key_by_simulation.get(simulation)
+        entry = entry_by_key.get(key) if entry_by_key is not None else None
+        if entry is None:
+            return None
+        value, sources = entry
+        released_keys = released_keys_by_simulation.get(simulation, ())
+        for variable_name, month, array_reference in sources:
+            holder = simulation.get_variable_entity(variable_name).get_holder(variable_name)
+            array = holder.get_array(month)
+            if array is None:
+                valid = (variable_name, month) in released_keys
+            else:
+                valid = array_reference is not None and array_reference() is array
+            if not valid:
+                del entry_by_key[key]
+                return None
+        return value
+
+    def put(self, simulation, key, value, variable_names, period):
+        """Keep `value`, computed from the values of `variable_names` for each month of `period`.
+
+        The value is not kept when one of these monthly values is not cached (e.g. with `opt_out_cache`).
+        """
+        released_keys = released_keys_by_simulation.get(simulation, ())
+        sources = []
+        for variable_name in variable_names:
+            holder = simulation.get_variable_entity(variable_name).get_holder(variable_name)
+            month = period.first_month
+            for _ in range(period.size_in_months):
+                array = holder.get_array(month)
+                if array is not None:
+                    sources.append((variable_name, month, weakref.ref(array)))
+                elif (variable_name, month) in released_keys:
+                    sources.append((variable_name, month, None))
+                else:
+                    return
+                month = month.offset(1)
+        self.entry_by_key_by_simulation.setdefault(simulation, {})[key] = (value, sources)
+
+    def clear(self, simulation):
+        self.entry_by_key_by_simulation.pop(simulation, None)
+
+
+# Sums of monthly values over several months, by (variable_name, period).
+window_sums_cache = DerivedValuesCache()
+# Number of window sums requested and actually computed, by simulation and then by variable name.
+window_sum_calls_count_by_simulation = weakref.WeakKeyDictionary()
+window_sum_computations_count_by_simulation = weakref.WeakKeyDictionary()
+
+
+def get_window_sum_calls_count(simulation):
+    """Return the number of window sums requested in `simulation` (see `calculate_window_sum`), by variable name."""
+    return window_sum_calls_count_by_simulation.setdefault(simulation, collections.Counter())
+
+
+def get_window_sum_computations_count(simulation):
+    """Return the number of window sums computed in `simulation` (see `calculate_window_sum`), by variable name."""
+    return window_sum_computations_count_by_simulation.setdefault(simulation, collections.Counter())
+
+
+def calculate_window_sum(population, variable_name, period):
+    """Sum the monthly values of `variable_name` over `period`, like `population(variable_name, period, options = [ADD])`.
+
+    The sum of each window is computed once per simulation, as long as the monthly values it adds up stay in its cache
+    (see `DerivedValuesCache`): the RSA and the PPA of a month average the resources of the 3 previous months once for
+    each of these months, and consecutive months share the same resource windows. The sums are shared, hence
+    read-only. `population` may also be a projector, such as `individu.foyer_fiscal`.
+    """
+    if isinstance(population, Projector):
+        return population.transform_and_bubble_up(
+            calculate_window_sum(population.reference_entity, variable_name, period))
+
+    simulation = population.simulation
+    get_window_sum_calls_count(simulation)[variable_name] += 1
+    key = (variable_name, period)
+    window_sum = window_sums_cache.get(simulation, key)
+    if window_sum is None:
+        get_window_sum_computations_count(simulation)[variable_name] += 1
+        window_sum = population(variable_name, period, options = [ADD])
+        window_sum.flags.writeable = False
+        window_sums_cache.put(simulation, key, window_sum, [variable_name], period)
+    return window_sum
+
+
+def clear_window_sums(simulation):
+    """Forget the window sums kept for `simulation`, e.g. to free their memory."""
+    window_sums_cache.clear(simulation)
+
+
+# Keys (variable_name, period, extra_params) of the values computed with extra_params, by simulation, from the least
+# to the most recently used. Holders are not kept, as they reference their simulation.
+extra_params_keys_by_simulation = weakref.WeakKeyDictionary()
+# Number of values computed with extra_params found in cache and computed, by simulation and then by variable name.
+extra_params_hits_count_by_simulation = weakref.WeakKeyDictionary()
+extra_params_misses_count_by_simulation = weakref.WeakKeyDictionary()
+
+
+def get_extra_params_hits_count(simulation):
+    """Return the number of values requested with extra_params in `simulation` and found in its cache (see
+    `calculate_with_extra_params`), by variable name."""
+    return extra_params_hits_count_by_simulation.setdefault(simulation, collections.Counter())
+
+
+def get_extra_params_misses_count(simulation):
+    """Return the number of values requested with extra_params in `simulation` and computed (see
+    `calculate_with_extra_params`), by variable name."""
+    return extra_params_misses_count_by_simulation.setdefault(simulation, collections.Counter())
+
+
+def get_extra_params_cached_count(simulation):
+    """Return the number of values computed with extra_params still cached in `simulation`."""
+    return len(extra_params_keys_by_simulation.get(simulation, ()))
+
+
+def calculate_with_extra_params(population, variable_name, period, extra_params, options = []):
+    """Compute `variable_name` like `population(variable_name, period, extra_params = extra_params, options = options)`.
+
+    The RSA and the PPA of a month are computed from the resources of each of the 3 previous months, with the month of
+    the demand and the month of the resources as period and extra_params. The simulation caches these values like the
+    others, but they are only reused by the demands of the next months: once the tax benefit system
+    `extra_params_cache_max_size` is reached, the least recently used ones are removed from the cache of the simulation.
+    Values derived from the removed ones are then computed again (see `DerivedValuesCache`).
+    """
+    if ADD in options:
+        # Same summation as Holder.compute_add, month by month.
+        array = None
+        month = period.first_month
+        for _ in range(period.size_in_months):
+            value = calculate_with_extra_params(population, variable_name, month, extra_params)
+            if array is None:
+                array = value.copy()
+            else:
+                array += value
+            month = month.offset(1)
+        return array
+
+    simulation = population.simulation
+    holder = population.get_holder(variable_name)
+    key = (variable_name, period, tuple(extra_params))
+    keys = extra_params_keys_by_simulation.setdefault(simulation, collections.OrderedDict())
+    if holder.get_array(period, extra_params) is None:
+        get_extra_params_misses_count(simulation)[variable_name] += 1
+    else:
+        get_extra_params_hits_count(simulation)[variable_name] += 1
+    value = population(variable_name, period, extra_params = extra_params)
+    # Move the key to the most recently used end.
+    keys.pop(key, None)
+    keys[key] = None
+
+    max_size = get_tax_benefit_system_option(simulation.tax_benefit_system, 'extra_params_cache_max_size')
+    while max_size is not None and len(keys) > max_size:
+        (evicted_variable_name, evicted_period, evicted_extra_params), _ = keys.popitem(last = False)
+        evicted_holder = simulation.get_variable_entity(evicted_variable_name).get_holder(evicted_variable_name)
+        # Holders can only delete all their values: caching None instead frees the evicted value, which get_array then
+        # reports as missing, so that it is computed again when requested.
+        evicted_holder.put_in_cache(None, evicted_period, list(evicted_extra_params))
+    return value
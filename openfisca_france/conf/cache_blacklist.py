@@ -1,9 +1,9 @@
 # When using openfisca for a large population, having too many variables in cache make openfisca performances drop.
 # The following variables are intermediate results and do not need to be cached in those usecases.
+# Variables requested several times for the same period are not listed, as they would be computed again on each
+# request. `openfisca_france.microsimulation.build_cache_blacklist` finds such variables for given outputs.
 
 cache_blacklist = set([
-    'aide_logement_loyer_retenu',
-    'aide_logement_charges',
     'aide_logement_R0',
     'aide_logement_taux_famille',
     'aide_logement_taux_loyer',
@@ -13,8 +13,6 @@ cache_blacklist = set([
     'aide_logement_montant_brut_avant_degressivite',
     'aides_logement_primo_accedant',
     'aides_logement_primo_accedant_k',
-    'aides_logement_primo_accedant_nb_part',
     'aides_logement_primo_accedant_loyer_minimal',
     'aides_logement_primo_accedant_plafond_mensualite',
-    'aides_logement_primo_accedant_ressources',
 ])
@@ -3,16 +3,20 @@
 import os
 import glob
 
+from openfisca_core.base_functions import requested_period_default_value
 from openfisca_core.taxbenefitsystems import TaxBenefitSystem
 
 from .entities import entities
-from . import decompositions, scenarios
+from . import decompositions, parameters_snapshot, scenarios
 
 from .model.prelevements_obligatoires.prelevements_sociaux.cotisations_sociales import preprocessing
 from .conf.cache_blacklist import cache_blacklist as conf_cache_blacklist
+from .model.base import shared_default_value
 
 
 COUNTRY_DIR = os.path.dirname(os.path.abspath(__file__))
+PARAMETERS_DIR = os.path.join(COUNTRY_DIR, 'parameters')
+PARAMETERS_SNAPSHOT_PATH = os.path.join(COUNTRY_DIR, 'parameters.snapshot')
 
 
 class FranceTaxBenefitSystem(TaxBenefitSystem):
@@ -22,6 +26,18 @@ class FranceTaxBenefitSystem(TaxBenefitSystem):
     decomposition_file_path = os.path.join(
         os.path.dirname(os.path.abspath(decompositions.__file__)), 'decomp.xml')
     preprocess_parameters = staticmethod(preprocessing.preprocess_parameters)
+    # Set to None to always parse the YAML parameters, even when an up-to-date snapshot exists.
+    parameters_snapshot_path = PARAMETERS_SNAPSHOT_PATH
+    # Payroll mode: compute all the contributions of a period in one pass, and keep them as long as their inputs are
+    # cached. Faster when most contributions are needed (e.g. for salaire_net), at the cost of memory. Reforms use the
+    # options of the tax and benefit system they are built on (see `get_tax_benefit_system_option`).
+    fused_cotisations_sociales = False
+    # Number of values computed with extra_params (RSA and PPA for a month of demand) kept in each simulation, the least
+    # recently used ones being deleted first. Set to None to keep them all.
+    extra_params_cache_max_size = 256
+    # Input variables without value share a read-only array of default values instead of getting a new array each (see
+    # `shared_default_value`). Saves memory, but formulas and users must not write into the values of inputs.
+    shared_default_inputs = False
 
     REFORMS_DIR = os.path.join(COUNTRY_DIR, 'reformes')
     REV_TYP = None  # utils.REV_TYP  # Not defined for France
@@ -36,11 +52,25 @@ class FranceTaxBenefitSystem(TaxBenefitSystem):
         TaxBenefitSystem.__init__(self, entities)
         self.Scenario = scenarios.Scenario
 
-        param_dir = os.path.join(COUNTRY_DIR, 'parameters')
-        self.load_parameters(param_dir)
+        self.load_parameters(PARAMETERS_DIR)
 
         self.add_variables_from_directory(os.path.join(COUNTRY_DIR, 'model'))
         self.cache_blacklist = conf_cache_blacklist
+        if self.shared_default_inputs:
+            for variable in self.variables.itervalues():
+                if variable.is_input_variable() and \
+                        variable.formula.base_function.im_func is requested_period_default_value:
+                    variable.formula.base_function = shared_default_value
+
+    def load_parameters(self, path_to_yaml_dir):
+        # Use the precompiled snapshot (see `scripts/parameters/build_parameters_snapshot.py`) when it is up to date.
+        if self.parameters_snapshot_path is not None and path_to_yaml_dir == PARAMETERS_DIR:
+            parameters = parameters_snapshot.load_parameters_snapshot(self.parameters_snapshot_path, PARAMETERS_DIR,
+                extra_source_files = [preprocessing.__file__.replace('.pyc', '.py')])
+            if parameters is not None:
+                self.parameters = parameters
+                return
+        TaxBenefitSystem.load_parameters(self, path_to_yaml_dir)
 
     def prefill_cache(self):
         # Compute one "zone APL" variable, to pre-load CSV of "code INSEE commune" to "Zone APL".
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+"""Batched numerical inversion of formulas, such as the computation of the gross salary from the net salary.
+
+`calculate_inverse` finds, for every row at once, the value of an input variable for which a target variable reaches a
+given value. Each evaluation of the target is done in the simulation itself: only the values cached while computing
+the target (i.e. the variables between the input variable and the target) are deleted before the next evaluation,
+instead of cloning the whole simulation.
+"""
+
+from __future__ import division
+
+import logging
+
+from numpy import abs as abs_, full, inf, isfinite, logical_and as and_, maximum, minimum, where
+
+from openfisca_core.periods import ETERNITY
+
+from openfisca_france.cache import clear_window_sums
+from openfisca_france.model.prelevements_obligatoires.prelevements_sociaux.cotisations_sociales.base import \
+    clear_simulation_cache
+
+
+log = logging.getLogger(__name__)
+
+
+def iter_holders(simulation):
+    for entity in simulation.entities.itervalues():
+        for holder in entity._holders.itervalues():
+            yield holder
+
+
+def get_cached_keys(simulation):
+    """Return the set of (holder, period, extra_params) of the values cached in `simulation`."""
+    cached_keys = set()
+    for holder in iter_holders(simulation):
+        for period, value in (holder._array_by_period or {}).iteritems():
+            if isinstance(value, dict):
+                cached_keys.update((holder, period, extra_params) for extra_params in value)
+            else:
+                cached_keys.add((holder, period, None))
+    return cached_keys
+
+
+def delete_cached_values(cached_keys):
+    for holder, period, extra_params in cached_keys:
+        array_by_period = holder._array_by_period
+        if array_by_period is None or period not in array_by_period:
+            continue
+        if extra_params is None:
+            del array_by_period[period]
+        else:
+            value_by_extra_params = array_by_period[period]
+            value_by_extra_params.pop(extra_params, None)
+            if not value_by_extra_params:
+                del array_by_period[period]
+        if holder.variable.definition_period == ETERNITY:
+            holder._array = None
+
+
+def calculate_inverse(simulation, variable_name, target_name, target, period, initial_guess = None,
+        tolerance = 0.01, xtol = 0.01, max_iterations = 50):
+    """Return the values of `variable_name` for which `target_name` is equal to `target` over `period`.
+
+    `target_name` must be an increasing function of `variable_name`, row by row. The roots are searched with a secant
+    method, safeguarded by bisection as soon as a row is bracketed. A row stops moving once its target is reached
+    within `tolerance`, or once its bracket is narrower than `xtol`. The returned values are, for each row, the best
+    ones found.
+
+    The values cached in the simulation before the call are kept, and the value of `target_name`, if it was an input,
+    is restored.
+    """
+    holder = simulation.get_variable_entity(variable_name).get_holder(variable_name)
+    target_holder = simulation.get_variable_entity(target_name).get_holder(target_name)
+    target = target.astype(float)
+    x = target.copy() if initial_guess is None else initial_guess.astype(float)
+
+    # The inversion may be requested while computing a variable which depends on the target: forget the calculations in
+    # progress during the evaluations, to avoid spurious cycle errors.
+    requested_periods_by_variable_name = simulation.requested_periods_by_variable_name
+    max_nb_cycles = simulation.max_nb_cycles
+    simulation.requested_periods_by_variable_name = {}
+    target_input = target_holder.get_array(period)
+    before_keys = get_cached_keys(simulation)
+    subgraph_keys = set()
+    delete_cached_values([(target_holder, period, None)])
+
+    def evaluate(x):
+        delete_cached_values(subgraph_keys)
+        clear_simulation_cache(simulation)
+        clear_window_sums(simulation)
+        holder.put_in_cache(x.astype(holder.variable.dtype), period)
+        gap = simulation.calculate(target_name, period).astype(float) - target
+        # Formulas may take branches depending on their inputs: each trial may compute values the previous ones didn't.
+        subgraph_keys.update(get_cached_keys(simulation) - before_keys)
+        subgraph_keys.add((target_holder, period, None))
+        return gap
+
+    try:
+        gap = evaluate(x)
+        best_x, best_gap = x, gap
+        lower = full(len(x), -inf)
+        upper = full(len(x), inf)
+        previous_x = previous_gap = None
+        iteration = 0
+        while True:
+            lower = where(gap < 0, maximum(lower, x), lower)
+            upper = where(gap > 0, minimum(upper, x), upper)
+            improved = abs_(gap) < abs_(best_gap)
+            best_x = where(improved, x, best_x)
+            best_gap = where(improved, gap, best_gap)
+            converged = (abs_(best_gap) <= tolerance) | (upper - lower <= xtol)
+            if converged.all():
+                break
+            if iteration == max_iterations:
+                log.warning(u'Inversion of {} did not converge for {} rows after {} iterations'.format(
+                    target_name, (~converged).sum(), max_iterations))
+                break
+
+            if previous_x is None:
+                # The first step assumes a unit slope.
+                slope = 1
+            else:
+                slope = where(
+                    and_(x != previous_x, gap != previous_gap),
+                    (gap - previous_gap) / where(x != previous_x, x - previous_x, 1),
+                    1,
+                    )
+            next_x = x - gap / where(slope > 0, slope, 1)
+            bracketed = isfinite(lower) & isfinite(upper)
+            # Bisect when the secant step leaves the bracket, or when the function looks flat or decreasing.
+            bisect = bracketed & ((next_x <= lower) | (next_x >= upper) | (slope <= 0))
+            next_x = where(bisect, (where(bracketed, lower, 0) + where(bracketed, upper, 0)) / 2, next_x)
+            next_x = where(converged, best_x, next_x)
+
+            previous_x, previous_gap = x, gap
+            x = next_x
+            gap = evaluate(x)
+            iteration += 1
+    finally:
+        # The cached values computed for the last trial do not match the returned values.
+        delete_cached_values(subgraph_keys)
+        clear_simulation_cache(simulation)
+        clear_window_sums(simulation)
+        if target_input is not None:
+            target_holder.put_in_cache(target_input, period)
+        simulation.requested_periods_by_variable_name = requested_periods_by_variable_name
+        simulation.max_nb_cycles = max_nb_cycles
+
+    return best_x
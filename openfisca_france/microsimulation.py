@@ -0,0 +1,783 @@
+# -*- coding: utf-8 -*-
+
+"""Simulations of large populations, built from columnar input tables.
+
+A population is described by one table per entity, by plural (`individus`, `familles`, `foyers_fiscaux`, `menages`).
+A table maps column names to arrays of the same length. Besides the input variables of its entity, the `individus`
+table contains, for each group entity, the index of the entity of each person (e.g. `famille_id`, between 0 and the
+number of familles - 1) and the role of the person in it (e.g. `famille_role`). A role is either the key of a role of
+the entity (e.g. `demandeur`, `conjoint`, `enfant`), or its index in the flattened roles of the entity (e.g. 0, 1 and
+2 for a famille).
+
+Tables are read from CSV files (with a header line and only numbers) or from `.npz` archives, named after the plural
+of their entity.
+"""
+
+from __future__ import division
+
+import collections
+import gc
+import itertools
+import multiprocessing
+import os
+import time
+import weakref
+
+import numpy as np
+
+from openfisca_core import periods, simulations
+from openfisca_core.base_functions import requested_period_last_or_next_value, requested_period_last_value
+
+from openfisca_france.cache import mark_released
+
+
+def get_id_column(entity):
+    return '{}_id'.format(entity.key)
+
+
+def get_role_column(entity):
+    return '{}_role'.format(entity.key)
+
+
+def read_table(file_path):
+    """Read the columns of a CSV file or of a `.npz` archive."""
+    if file_path.endswith('.npz'):
+        with np.load(file_path) as archive:
+            return collections.OrderedDict((name, archive[name]) for name in archive.files)
+
+    with open(file_path, 'rb') as csv_file:
+        header = csv_file.readline().strip()
+        data = csv_file.read()
+    names = [name.strip().strip('"') for name in header.split(',')]
+    # Parse every cell at once, in C: the lines are joined, as if the file were a single line of numbers.
+    values = np.fromstring(data.replace('\r', '').replace('\n', ','), sep = ',')
+    if len(values) % len(names) != 0:
+        raise ValueError(u'Invalid CSV file {}: each line must contain {} numbers.'.format(
+            file_path, len(names)).encode('utf-8'))
+    values = values.reshape(-1, len(names))
+    return collections.OrderedDict((name, values[:, index]) for index, name in enumerate(names))
+
+
+def read_tables(tax_benefit_system, directory):
+    """Read the tables of `directory`: `<plural>.npz` or `<plural>.csv` for each entity."""
+    tables = {}
+    for entity in tax_benefit_system.entities:
+        for extension in ('.npz', '.csv'):
+            file_path = os.path.join(directory, entity.plural + extension)
+            if os.path.exists(file_path):
+                tables[entity.plural] = read_table(file_path)
+                break
+    return tables
+
+
+def write_tables(directory, tables, extension = '.npz'):
+    """Write each table of `tables` to `<plural>.npz`, or `<plural>.csv` if `extension` is `.csv`, in `directory`.
+
+    CSV files contain numbers only: roles must then be given by their index.
+    """
+    for plural, table in tables.iteritems():
+        file_path = os.path.join(directory, plural + extension)
+        if extension == '.csv':
+            np.savetxt(file_path, np.column_stack(table.values()), delimiter = ',', header = ','.join(table.keys()),
+                comments = '', fmt = '%.17g')
+        else:
+            np.savez(file_path, **table)
+
+
+def get_count(tables, entity):
+    """Return the number of entities described by `tables`.
+
+    The number of group entities without a table is deduced from the indexes of the individus.
+    """
+    table = tables.get(entity.plural)
+    if table:
+        return len(next(table.itervalues()))
+    entity_ids = tables['individus'][get_id_column(entity)]
+    return int(np.max(entity_ids)) + 1 if len(entity_ids) > 0 else 0
+
+
+def rank_in_groups(group):
+    """Return the position of each row among the rows having the same `group`, in the order of the rows."""
+    # Tables are usually sorted by group: sorting them again is the most expensive part of the loading.
+    is_sorted = (group[1:] >= group[:-1]).all()
+    if is_sorted:
+        sorted_group = group
+    else:
+        order = np.argsort(group, kind = 'mergesort')
+        sorted_group = group[order]
+    indexes = np.arange(len(group), dtype = np.int32)
+    is_first = np.ones(len(group), dtype = bool)
+    is_first[1:] = sorted_group[1:] != sorted_group[:-1]
+    first_indexes = np.maximum.accumulate(np.where(is_first, indexes, 0))
+    if is_sorted:
+        return indexes - first_indexes
+    rank = np.empty(len(group), dtype = np.int32)
+    rank[order] = indexes - first_indexes
+    return rank
+
+
+def get_role_indexes(entity, roles):
+    """Convert role keys or role indexes to indexes in the flattened roles of `entity`."""
+    flattened_roles = entity.flattened_roles
+    roles = np.asarray(roles)
+    if roles.dtype.kind in ('S', 'U', 'O'):
+        unique_roles, inverse = np.unique(roles, return_inverse = True)
+        role_index_by_key = {role.key: index for index, role in enumerate(flattened_roles)}
+        unknown_roles = [role_key for role_key in unique_roles if role_key not in role_index_by_key]
+        if unknown_roles:
+            raise ValueError(u'Unknown role {} in {}. Possible roles are: {}.'.format(
+                unknown_roles[0], get_role_column(entity),
+                u', '.join(role.key for role in flattened_roles)).encode('utf-8'))
+        return np.array([role_index_by_key[role_key] for role_key in unique_roles], dtype = np.int32)[inverse]
+
+    role_indexes = roles.astype(np.int32)
+    if (roles != role_indexes).any() or (role_indexes < 0).any() or (role_indexes >= len(flattened_roles)).any():
+        raise ValueError(u'Invalid role in {}: roles must be between 0 and {}.'.format(
+            get_role_column(entity), len(flattened_roles) - 1).encode('utf-8'))
+    return role_indexes
+
+
+def set_members(entity, entity_ids, role_indexes):
+    """Set the members of the group entity `entity`, and check the number of persons of each role."""
+    flattened_roles = entity.flattened_roles
+    roles_count = len(flattened_roles)
+    count = entity.count
+    if entity_ids.dtype.kind not in ('i', 'u', 'f') or (entity_ids != entity_ids.astype(np.int32)).any():
+        raise ValueError(u'Invalid {}: indexes must be integers.'.format(get_id_column(entity)).encode('utf-8'))
+    entity_ids = entity_ids.astype(np.int32)
+    if len(entity_ids) > 0 and (entity_ids.min() < 0 or entity_ids.max() >= count):
+        raise ValueError(u'Invalid {}: indexes must be between 0 and {}.'.format(
+            get_id_column(entity), count - 1).encode('utf-8'))
+
+    members_count_by_role = np.bincount(
+        entity_ids.astype(np.int64) * roles_count + role_indexes,
+        minlength = count * roles_count,
+        ).reshape(count, roles_count)
+    empty_entities = (members_count_by_role.sum(axis = 1) == 0).nonzero()[0]
+    if len(empty_entities) > 0:
+        raise ValueError(u'{} {} has no member.'.format(entity.key, empty_entities[0]).encode('utf-8'))
+    for role_index, role in enumerate(flattened_roles):
+        if role.max is not None:
+            crowded_entities = (members_count_by_role[:, role_index] > role.max).nonzero()[0]
+            if len(crowded_entities) > 0:
+                raise ValueError(u'{} {} has more than {} {}.'.format(
+                    entity.key, crowded_entities[0], role.max, role.key).encode('utf-8'))
+
+    # Legacy roles, numbered like openfisca_core.scenarios.iter_over_entity_members does.
+    legacy_role_start = []
+    ranked = []
+    legacy_role_index = 0
+    for role in entity.roles:
+        if role.subroles:
+            for subrole_index, subrole in enumerate(role.subroles):
+                legacy_role_start.append(legacy_role_index + subrole_index)
+                ranked.append(False)
+        else:
+            legacy_role_start.append(legacy_role_index)
+            ranked.append(True)
+        legacy_role_index += role.max or 1
+    members_legacy_role = np.array(legacy_role_start, dtype = np.int32)[role_indexes]
+    ranked = np.array(ranked)[role_indexes]
+    if ranked.any():
+        # Persons of a role without subroles are numbered in the order of the rows.
+        rank_in_role = rank_in_groups(entity_ids.astype(np.int64) * roles_count + role_indexes)
+        members_legacy_role = np.where(ranked, members_legacy_role + rank_in_role, members_legacy_role)
+
+    entity.members_entity_id = entity_ids
+    entity.members_role = np.array(flattened_roles, dtype = object)[role_indexes]
+    entity.members_legacy_role = members_legacy_role
+    entity._members_position = rank_in_groups(entity_ids)
+    entity.roles_count = members_legacy_role.max() + 1 if len(members_legacy_role) > 0 else 0
+
+
+def new_simulation_from_tables(tax_benefit_system, tables, period, debug = False, opt_out_cache = False,
+        trace = False):
+    """Build a simulation of the population described by `tables`, for `period`.
+
+    The input variables are set for `period`, like the inputs of a test case without explicit periods.
+    """
+    period = periods.period(period)
+    tables = {
+        plural: collections.OrderedDict((name, np.asarray(values)) for name, values in table.iteritems())
+        for plural, table in tables.iteritems()
+        }
+    simulation = simulations.Simulation(
+        debug = debug,
+        opt_out_cache = opt_out_cache,
+        period = period,
+        tax_benefit_system = tax_benefit_system,
+        trace = trace,
+        )
+    persons = simulation.persons
+    persons_table = tables.get(persons.plural)
+    if not persons_table:
+        raise ValueError(u'No table of {}.'.format(persons.plural).encode('utf-8'))
+    membership_columns = set()
+    for entity in simulation.entities.itervalues():
+        table = tables.get(entity.plural) or {}
+        counts = set(len(column) for column in table.itervalues())
+        if len(counts) > 1:
+            raise ValueError(u'The columns of the table of {} differ in length.'.format(entity.plural).encode('utf-8'))
+        if entity.is_person:
+            entity.count = counts.pop()
+            continue
+        id_column = get_id_column(entity)
+        if id_column not in persons_table:
+            raise ValueError(u'Missing column {} in the table of {}.'.format(
+                id_column, persons.plural).encode('utf-8'))
+        membership_columns.update([id_column, get_role_column(entity)])
+        entity.count = get_count(tables, entity)
+
+    for entity in simulation.entities.itervalues():
+        entity.step_size = entity.count
+        entity.ids = np.arange(entity.count)
+        if entity.is_person:
+            continue
+        role_column = get_role_column(entity)
+        if role_column in persons_table:
+            role_indexes = get_role_indexes(entity, persons_table[role_column])
+        else:
+            role_indexes = np.zeros(persons.count, dtype = np.int32)
+        set_members(entity, persons_table[get_id_column(entity)], role_indexes)
+
+    for entity in simulation.entities.itervalues():
+        for variable_name, values in (tables.get(entity.plural) or {}).iteritems():
+            if entity.is_person and variable_name in membership_columns:
+                continue
+            variable = tax_benefit_system.variables.get(variable_name)
+            if variable is None:
+                raise ValueError(u'Unknown variable {} in the table of {}.'.format(
+                    variable_name, entity.plural).encode('utf-8'))
+            if variable.entity.key != entity.key:
+                raise ValueError(u'Variable {} belongs to {}, not to {}.'.format(
+                    variable_name, variable.entity.plural, entity.plural).encode('utf-8'))
+            entity.get_holder(variable_name).set_input(period, np.asarray(values, dtype = variable.dtype))
+    return simulation
+
+
+def get_group_starts(sorted_group):
+    is_first = np.ones(len(sorted_group), dtype = bool)
+    is_first[1:] = sorted_group[1:] != sorted_group[:-1]
+    return is_first.nonzero()[0]
+
+
+def get_entity_ids(persons_table, entity):
+    """Return the indexes of `entity` in the table of the individus as integers, e.g. when read from a CSV file."""
+    entity_ids = np.asarray(persons_table[get_id_column(entity)])
+    if entity_ids.dtype.kind not in ('i', 'u', 'f') or (entity_ids != entity_ids.astype(np.int64)).any():
+        raise ValueError(u'Invalid {}: indexes must be integers.'.format(get_id_column(entity)).encode('utf-8'))
+    return entity_ids.astype(np.int64)
+
+
+def get_blocks(tax_benefit_system, entity_ids_by_key):
+    """Label each individu with the smallest index of the ménages linked to its ménage.
+
+    Two ménages are linked when a famille or a foyer fiscal has members in both of them. Individus with the same label
+    must thus be simulated together. `entity_ids_by_key` gives the integer indexes of each group entity.
+    """
+    block = entity_ids_by_key['menage']
+    groups = []
+    for entity in tax_benefit_system.group_entities:
+        entity_ids = entity_ids_by_key[entity.key]
+        order = np.argsort(entity_ids, kind = 'mergesort')
+        groups.append((order, get_group_starts(entity_ids[order])))
+    while True:
+        # Give the members of each entity the smallest label of its members, until no label changes.
+        previous_block = block
+        for order, starts in groups:
+            minimum_by_group = np.minimum.reduceat(block[order], starts)
+            sorted_block = np.repeat(minimum_by_group, np.diff(np.append(starts, len(order))))
+            block = np.empty_like(block)
+            block[order] = sorted_block
+        if (block == previous_block).all():
+            return block
+
+
+def iter_chunks(tax_benefit_system, tables, chunk_size):
+    """Split the population described by `tables` into chunks of whole ménages of about `chunk_size` individus.
+
+    The familles and foyers fiscaux of a chunk are complete too: ménages linked by a famille or a foyer fiscal belong to
+    the same chunk. Yield, for each chunk, the indexes of its rows in each table (by plural) and its own tables.
+    """
+    persons_table = tables['individus']
+    entity_ids_by_key = {}
+    for entity in tax_benefit_system.group_entities:
+        entity_ids = entity_ids_by_key[entity.key] = get_entity_ids(persons_table, entity)
+        count = get_count(tables, entity)
+        # minlength must be positive, even without entity.
+        empty_entities = (np.bincount(entity_ids, minlength = max(count, 1))[:count] == 0)
+        if empty_entities.any():
+            raise ValueError(u'{} {} has no member.'.format(entity.key, empty_entities.nonzero()[0][0]).encode('utf-8'))
+    if len(entity_ids_by_key['menage']) == 0:
+        # No individu: no chunk.
+        return
+    block = get_blocks(tax_benefit_system, entity_ids_by_key)
+    persons_count_by_block = np.bincount(block)
+    # Blocks are labelled by the index of their first ménage: chunks follow the order of the ménages.
+    chunk_by_block = (np.cumsum(persons_count_by_block) - persons_count_by_block) // chunk_size
+    person_chunk = chunk_by_block[block]
+    person_order = np.argsort(person_chunk, kind = 'mergesort')
+    chunk_starts = np.searchsorted(person_chunk[person_order], np.unique(person_chunk))
+    for person_indexes in np.split(person_order, chunk_starts[1:]):
+        index_by_plural = {'individus': person_indexes}
+        chunk_persons_table = collections.OrderedDict(
+            (name, np.asarray(values)[person_indexes])
+            for name, values in persons_table.iteritems()
+            )
+        chunk_tables = {'individus': chunk_persons_table}
+        for entity in tax_benefit_system.group_entities:
+            entity_indexes, chunk_persons_table[get_id_column(entity)] = np.unique(
+                entity_ids_by_key[entity.key][person_indexes], return_inverse = True)
+            index_by_plural[entity.plural] = entity_indexes
+            table = tables.get(entity.plural)
+            if table:
+                chunk_tables[entity.plural] = collections.OrderedDict(
+                    (name, np.asarray(values)[entity_indexes])
+                    for name, values in table.iteritems()
+                    )
+        yield index_by_plural, chunk_tables
+
+
+def calculate(simulation, variable_name, period):
+    """Calculate `variable_name` for `period`, adding the monthly values of a monthly variable over a longer period."""
+    if simulation.tax_benefit_system.variables[variable_name].definition_period == periods.MONTH and \
+            period.unit != periods.MONTH:
+        return simulation.calculate_add(variable_name, period)
+    return simulation.calculate(variable_name, period)
+
+
+# Number of individus of the sample on which `calculate_by_chunk` counts the requests of the intermediate values.
+requests_count_sample_size = 1000
+
+# Variables whose cached values are read directly by other formulas (see `ir.py`): they must stay in the cache.
+cached_variables_names = set(['age', 'age_en_mois', 'date_naissance'])
+
+
+class ChainedTracer(object):
+    """Base class of the stand-ins for the tracer of a simulation, forwarding their records to the tracer they replace,
+    if any (see `chain_tracer`). The other attributes, e.g. `print_computation_log`, are those of this tracer."""
+    tracer = None
+
+    def clone_chained_tracer(self):
+        return self.tracer.clone() if self.tracer is not None else None
+
+    def record_calculation_start(self, variable_name, period, **parameters):
+        if self.tracer is not None:
+            self.tracer.record_calculation_start(variable_name, period, **parameters)
+
+    def record_calculation_end(self, variable_name, period, result, **parameters):
+        if self.tracer is not None:
+            self.tracer.record_calculation_end(variable_name, period, result, **parameters)
+
+    def record_calculation_abortion(self, variable_name, period, **parameters):
+        if self.tracer is not None:
+            self.tracer.record_calculation_abortion(variable_name, period, **parameters)
+
+    def __getattr__(self, name):
+        tracer = self.__dict__.get('tracer')
+        if tracer is None:
+            raise AttributeError(name)
+        return getattr(tracer, name)
+
+
+def chain_tracer(simulation, tracer):
+    """Make `tracer` the tracer of `simulation`, forwarding its records to the current tracer if the simulation is
+    already traced. Return `tracer`."""
+    if simulation.trace:
+        tracer.tracer = simulation.tracer
+    simulation.trace = True
+    simulation.tracer = tracer
+    return tracer
+
+
+class RequestsCounter(ChainedTracer):
+    """Stand-in for the tracer of a simulation, counting the requests of each value.
+
+    Values are identified by `(variable_name, period, extra_params)` keys, `extra_params` being a tuple.
+    """
+    def __init__(self, tracer = None):
+        self.tracer = tracer
+        self.requests_count_by_key = collections.Counter()
+
+    def clone(self):
+        return RequestsCounter(self.clone_chained_tracer())
+
+    def record_calculation_start(self, variable_name, period, extra_params = None, **parameters):
+        self.requests_count_by_key[(variable_name, period, tuple(extra_params or ()))] += 1
+        if extra_params is not None:
+            parameters['extra_params'] = extra_params
+        ChainedTracer.record_calculation_start(self, variable_name, period, **parameters)
+
+
+class ValuesReleaser(ChainedTracer):
+    """Stand-in for the tracer of a simulation, removing each value from the cache after its last planned request.
+
+    `requests_count_by_key` gives the number of requests of the values to release, by
+    `(variable_name, period, extra_params)` key (see `count_requests`). A value requested more often than planned is
+    computed again, and a value requested less often than planned is kept. Clones of the simulation keep all their
+    values.
+    """
+    def __init__(self, simulation, requests_count_by_key, tracer = None):
+        # The releaser is an attribute of the simulation: don't keep it alive.
+        self.simulation = weakref.ref(simulation) if simulation is not None else None
+        self.pending_requests_count_by_key = dict(requests_count_by_key)
+        self.released_count = 0
+        self.tracer = tracer
+
+    def clone(self):
+        return ValuesReleaser(None, {}, self.clone_chained_tracer())
+
+    def record_calculation_end(self, variable_name, period, result, **parameters):
+        ChainedTracer.record_calculation_end(self, variable_name, period, result, **parameters)
+        self.release(variable_name, period, parameters.get('extra_params'))
+
+    def record_calculation_abortion(self, variable_name, period, **parameters):
+        ChainedTracer.record_calculation_abortion(self, variable_name, period, **parameters)
+        self.release(variable_name, period, parameters.get('extra_params'))
+
+    def release(self, variable_name, period, extra_params):
+        key = (variable_name, period, tuple(extra_params or ()))
+        pending_requests_count = self.pending_requests_count_by_key.get(key)
+        if pending_requests_count is None:
+            return
+        if pending_requests_count > 1:
+            self.pending_requests_count_by_key[key] = pending_requests_count - 1
+            return
+        del self.pending_requests_count_by_key[key]
+        # The value has been returned to its last consumer, which keeps a reference to it as long as it needs it.
+        simulation = self.simulation()
+        holder = simulation.get_variable_entity(variable_name).get_holder(variable_name)
+        value_by_period = holder._array_by_period
+        if not value_by_period or period not in value_by_period:
+            return
+        if extra_params:
+            value_by_extra_params = value_by_period[period]
+            if value_by_extra_params.pop(tuple(extra_params), None) is None:
+                return
+            if not value_by_extra_params:
+                del value_by_period[period]
+        else:
+            del value_by_period[period]
+            mark_released(simulation, variable_name, period)
+        self.released_count += 1
+
+
+# Base functions which may return the value cached for another period than the requested one: releasing a value of
+# their variables could change the values of the other periods.
+last_value_base_functions = set([requested_period_last_or_next_value, requested_period_last_value])
+
+
+def is_releasable(variable):
+    return not variable.is_input_variable() and variable.definition_period != periods.ETERNITY and \
+        variable.base_function not in last_value_base_functions
+
+
+def count_requests(tax_benefit_system, tables, period, variable_names):
+    """Count the requests of the values of the intermediate variables, when calculating `variable_names` for `period`.
+
+    The calculation is run on the population described by `tables`, which should be a small sample of the population to
+    simulate. Only the values that may be removed from the cache are counted: the values of the variables with a
+    formula that are neither inputs of the tables nor outputs. Return their requests counts, by
+    `(variable_name, period, extra_params)` key.
+    """
+    period = periods.period(period)
+    simulation = new_simulation_from_tables(tax_benefit_system, tables, period)
+    requests_counter = chain_tracer(simulation, RequestsCounter())
+    for variable_name in variable_names:
+        calculate(simulation, variable_name, period)
+
+    excluded_variables_names = set(variable_names) | cached_variables_names
+    for table in tables.itervalues():
+        excluded_variables_names.update(table)
+    return collections.Counter({
+        key: requests_count
+        for key, requests_count in requests_counter.requests_count_by_key.iteritems()
+        if key[0] not in excluded_variables_names and is_releasable(tax_benefit_system.variables[key[0]])
+        })
+
+
+def release_after_use(simulation, requests_count_by_key):
+    """Remove the values of `simulation` from its cache once they have been requested as planned.
+
+    `requests_count_by_key` is computed by `count_requests` for the outputs that will be calculated. The values needed
+    by a single formula are thus freed as soon as this formula has used them, instead of being kept until the
+    simulation is dropped. The values are released by a `ValuesReleaser`, chained to the tracer of the simulation if it
+    is traced, and returned.
+
+    The requests are usually counted on a sample, whose formulas may take other branches than on the whole population:
+    values requested more often than planned are then computed again, and values requested less often are kept. The
+    values of the variables reading the values of other periods (see `is_releasable`) are never released.
+    """
+    return chain_tracer(simulation, ValuesReleaser(simulation, requests_count_by_key))
+
+
+class VariableProfile(object):
+    """Statistics of the requests of a value or of a variable, gathered by a `Profiler`."""
+    def __init__(self):
+        self.calls_count = 0
+        self.own_time = 0
+        self.cumulative_time = 0
+        self.size = 0
+        self.allocated_bytes = 0
+
+
+class Profiler(ChainedTracer):
+    """Stand-in for the tracer of a simulation, measuring the time spent on each value and its memory.
+
+    Statistics are gathered by `(variable_name, period)` key and by variable name. The own time of a value excludes the
+    time spent on the values requested by its formula; its cumulative time includes it. Bytes are allocated when a
+    request returns an array not returned before, i.e. when a value is computed. The own times are also added by stack
+    of requested variables, for flame graphs (see `write_flame_graph`). The time of the chained tracer, if any, is
+    included.
+    """
+    def __init__(self, tracer = None):
+        self.tracer = tracer
+        self.profile_by_key = collections.defaultdict(VariableProfile)
+        self.profile_by_variable_name = collections.defaultdict(VariableProfile)
+        self.own_time_by_stack = collections.Counter()
+        # Frames of the requests being calculated: [key, start time, time spent on the requested values].
+        self.frames = []
+        # Number of frames by key and by variable name, not to count the time of nested requests twice.
+        self.frames_count_by_key = collections.Counter()
+        self.array_by_id = weakref.WeakValueDictionary()
+
+    def clone(self):
+        return Profiler(self.clone_chained_tracer())
+
+    def record_calculation_start(self, variable_name, period, **parameters):
+        key = (variable_name, period)
+        self.frames.append([key, time.time(), 0])
+        self.frames_count_by_key[key] += 1
+        self.frames_count_by_key[variable_name] += 1
+        ChainedTracer.record_calculation_start(self, variable_name, period, **parameters)
+
+    def pop_frame(self):
+        frame = self.frames.pop()
+        key = frame[0]
+        self.frames_count_by_key[key] -= 1
+        self.frames_count_by_key[key[0]] -= 1
+        return frame
+
+    def record_calculation_end(self, variable_name, period, result, **parameters):
+        ChainedTracer.record_calculation_end(self, variable_name, period, result, **parameters)
+        self.end_frame(variable_name, period, result)
+
+    def record_calculation_abortion(self, variable_name, period, **parameters):
+        ChainedTracer.record_calculation_abortion(self, variable_name, period, **parameters)
+        self.end_frame(variable_name, period, None)
+
+    def end_frame(self, variable_name, period, result):
+        end_time = time.time()
+        key = (variable_name, period)
+        # Requests failing before their end (e.g. for an invalid period) leave their frames on the stack.
+        while self.frames and self.frames[-1][0] != key:
+            self.pop_frame()
+        if not self.frames:
+            return
+        stack = tuple(frame_key[0] for frame_key, _, _ in self.frames)
+        _, start_time, requested_time = self.pop_frame()
+        duration = end_time - start_time
+        if self.frames:
+            self.frames[-1][2] += duration
+        self.own_time_by_stack[stack] += duration - requested_time
+        allocated_bytes = 0
+        if isinstance(result, np.ndarray) and self.array_by_id.get(id(result)) is not result:
+            allocated_bytes = result.nbytes
+            self.array_by_id[id(result)] = result
+        for profile_key, profile in ((key, self.profile_by_key[key]),
+                (variable_name, self.profile_by_variable_name[variable_name])):
+            profile.calls_count += 1
+            profile.own_time += duration - requested_time
+            if not self.frames_count_by_key[profile_key]:
+                profile.cumulative_time += duration
+            if isinstance(result, np.ndarray):
+                profile.size = result.size
+            profile.allocated_bytes += allocated_bytes
+
+    def format_report(self, count = 20, sort_key = 'own_time', by_period = False):
+        """Return the report of the `count` variables, or values if `by_period` is true, with the highest `sort_key`
+        attribute of their profile."""
+        if by_period:
+            items = [
+                (u'{}<{}>'.format(variable_name, period), profile)
+                for (variable_name, period), profile in self.profile_by_key.iteritems()
+                ]
+        else:
+            items = self.profile_by_variable_name.items()
+        items.sort(key = lambda item: getattr(item[1], sort_key), reverse = True)
+        lines = [u'{:<60} {:>8} {:>10} {:>10} {:>10} {:>10}'.format(
+            u'variable', u'calls', u'own s', u'cumul. s', u'size', u'MiB')]
+        for name, profile in items[:count]:
+            lines.append(u'{:<60} {:>8} {:>10.3f} {:>10.3f} {:>10} {:>10.1f}'.format(name, profile.calls_count,
+                profile.own_time, profile.cumulative_time, profile.size, profile.allocated_bytes / (1024 * 1024)))
+        return u'\n'.join(lines)
+
+    def write_flame_graph(self, file_path):
+        """Write the own times, in microseconds, by stack of requested variables, in the folded format of flame graph
+        tools (e.g. `flamegraph.pl`, speedscope)."""
+        with open(file_path, 'w') as flame_graph_file:
+            for stack, own_time in sorted(self.own_time_by_stack.iteritems()):
+                microseconds = int(round(own_time * 1e6))
+                if microseconds > 0:
+                    flame_graph_file.write('{} {}\n'.format(';'.join(stack), microseconds))
+
+
+def profile(simulation):
+    """Profile the calculations of `simulation`, and return the profiler (see `Profiler`).
+
+    The profiler is chained to the tracer of the simulation, if it is traced (see `chain_tracer`).
+    """
+    return chain_tracer(simulation, Profiler())
+
+
+def build_cache_blacklist(tax_benefit_system, tables, period, variable_names):
+    """Find the intermediate variables whose values are requested only once when calculating `variable_names`.
+
+    The requests of the values are counted on the population described by `tables` (see `count_requests`). A variable
+    is returned when each of its values is requested by a single formula, once. In a simulation with `opt_out_cache`,
+    the values of these variables are thus freed right after use, and never computed twice. The result is meant to be
+    set as the `cache_blacklist` of the tax and benefit system, for the same outputs.
+    """
+    requests_count_by_key = count_requests(tax_benefit_system, tables, period, variable_names)
+    candidates_names = set()
+    excluded_variables_names = set()
+    for (variable_name, _, _), requests_count in requests_count_by_key.iteritems():
+        if requests_count > 1:
+            excluded_variables_names.add(variable_name)
+        else:
+            candidates_names.add(variable_name)
+    return candidates_names - excluded_variables_names
+
+
+def new_outputs(tax_benefit_system, tables, variable_names, output_directory = None):
+    """Allocate the arrays of the values of `variable_names` for the population described by `tables`.
+
+    When `output_directory` is given, the arrays are memory maps of `<variable_name>.npy` files in this directory.
+    """
+    value_by_variable_name = collections.OrderedDict()
+    for variable_name in variable_names:
+        variable = tax_benefit_system.variables[variable_name]
+        shape = (get_count(tables, variable.entity), )
+        if output_directory is None:
+            value_by_variable_name[variable_name] = np.empty(shape, dtype = variable.dtype)
+        else:
+            value_by_variable_name[variable_name] = np.lib.format.open_memmap(
+                os.path.join(output_directory, variable_name + '.npy'), mode = 'w+', dtype = variable.dtype,
+                shape = shape)
+    return value_by_variable_name
+
+
+def calculate_chunk(tax_benefit_system, chunk_tables, period, variable_names, opt_out_cache = False,
+        requests_count_by_key = None):
+    simulation = new_simulation_from_tables(tax_benefit_system, chunk_tables, period, opt_out_cache = opt_out_cache)
+    if requests_count_by_key is not None:
+        release_after_use(simulation, requests_count_by_key)
+    values = [calculate(simulation, variable_name, period) for variable_name in variable_names]
+    # Simulations reference themselves through their entities: collect them before building the next one.
+    del simulation
+    gc.collect()
+    return values
+
+
+def set_chunk_values(tax_benefit_system, value_by_variable_name, index_by_plural, values):
+    for (variable_name, value), chunk_value in zip(value_by_variable_name.iteritems(), values):
+        variable = tax_benefit_system.variables[variable_name]
+        value[index_by_plural[variable.entity.plural]] = chunk_value
+
+
+def count_sample_requests(tax_benefit_system, tables, period, variable_names):
+    """Count the requests of the values of the intermediate variables (see `count_requests`) on the first ménages of
+    `tables`."""
+    first_chunk = next(iter_chunks(tax_benefit_system, tables, requests_count_sample_size), None)
+    if first_chunk is None:
+        return collections.Counter()
+    _, sample_tables = first_chunk
+    return count_requests(tax_benefit_system, sample_tables, period, variable_names)
+
+
+def flush_outputs(value_by_variable_name):
+    for value in value_by_variable_name.itervalues():
+        if isinstance(value, np.memmap):
+            value.flush()
+
+
+def calculate_by_chunk(tax_benefit_system, tables, period, variable_names, chunk_size = 100000,
+        output_directory = None, opt_out_cache = False, release_values = False):
+    """Calculate `variable_names` for `period` on the population described by `tables`, chunk by chunk.
+
+    Each chunk of about `chunk_size` individus (see `iter_chunks`) is simulated in a new simulation, dropped before the
+    next one: the memory used by the intermediate results is bounded by the size of the chunks. Return the values of
+    each variable, for the whole population in the order of the tables. When `output_directory` is given, the values
+    are written to `<variable_name>.npy` files as the chunks are simulated, and returned as memory maps of these files.
+    With `opt_out_cache`, the variables of the `cache_blacklist` of the tax and benefit system are not kept in cache.
+    With `release_values`, the requests of the intermediate values are counted on a sample of the tables, and each value
+    is removed from the cache after its last request (see `release_after_use`).
+    """
+    period = periods.period(period)
+    value_by_variable_name = new_outputs(tax_benefit_system, tables, variable_names, output_directory)
+    requests_count_by_key = count_sample_requests(tax_benefit_system, tables, period, variable_names) \
+        if release_values else None
+    for index_by_plural, chunk_tables in iter_chunks(tax_benefit_system, tables, chunk_size):
+        set_chunk_values(tax_benefit_system, value_by_variable_name, index_by_plural,
+            calculate_chunk(tax_benefit_system, chunk_tables, period, variable_names, opt_out_cache,
+                requests_count_by_key))
+    flush_outputs(value_by_variable_name)
+    return value_by_variable_name
+
+
+# Tax and benefit system of a worker process of `calculate_by_process`, set by `init_worker` in the worker only.
+worker_tax_benefit_system = None
+
+
+def init_worker(tax_benefit_system):
+    global worker_tax_benefit_system
+    worker_tax_benefit_system = tax_benefit_system
+
+
+def calculate_worker_chunk(arguments):
+    chunk_tables, period, variable_names, opt_out_cache, requests_count_by_key = arguments
+    return calculate_chunk(worker_tax_benefit_system, chunk_tables, period, variable_names, opt_out_cache,
+        requests_count_by_key)
+
+
+def calculate_by_process(tax_benefit_system, tables, period, variable_names, processes_count = None,
+        chunk_size = 100000, output_directory = None, opt_out_cache = False, release_values = False):
+    """Calculate `variable_names` like `calculate_by_chunk`, simulating the chunks in a pool of `processes_count`
+    processes (by default, one by CPU).
+
+    The tax and benefit system is handed to each worker process when the pool starts it (see `init_worker`). It is not
+    pickled: the workers must be forked, which requires a Unix-like system. They are then sent only the tables of their
+    chunks. The values of each chunk are put back in the order of the tables as soon as it is simulated.
+    """
+    period = periods.period(period)
+    value_by_variable_name = new_outputs(tax_benefit_system, tables, variable_names, output_directory)
+    requests_count_by_key = count_sample_requests(tax_benefit_system, tables, period, variable_names) \
+        if release_values else None
+    chunks = iter_chunks(tax_benefit_system, tables, chunk_size)
+    # The tables are checked when the first chunk is built: do it here, not in the thread of the pool feeding its
+    # tasks, where errors are not reported.
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        # No individu: there is nothing to simulate.
+        flush_outputs(value_by_variable_name)
+        return value_by_variable_name
+    index_by_plural_queue = collections.deque()
+
+    def iter_arguments():
+        for index_by_plural, chunk_tables in itertools.chain([first_chunk], chunks):
+            index_by_plural_queue.append(index_by_plural)
+            yield chunk_tables, period, variable_names, opt_out_cache, requests_count_by_key
+
+    pool = multiprocessing.Pool(processes_count, initializer = init_worker, initargs = (tax_benefit_system,))
+    try:
+        # imap returns the values of the chunks in the order of the arguments.
+        for values in pool.imap(calculate_worker_chunk, iter_arguments()):
+            set_chunk_values(tax_benefit_system, value_by_variable_name, index_by_plural_queue.popleft(), values)
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    flush_outputs(value_by_variable_name)
+    return value_by_variable_name
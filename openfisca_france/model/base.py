@@ -1,6 +1,13 @@
 # -*- coding: utf-8 -*-
 
+import collections
+import weakref
+
+import numpy as np
+from numpy import ascontiguousarray, int64
+
 from openfisca_core.model_api import *
+from openfisca_france.cache import calculate_window_sum, calculate_with_extra_params, get_tax_benefit_system_option
 from openfisca_france.entities import Famille, FoyerFiscal, Individu, Menage
 
 CATEGORIE_SALARIE = Enum([
@@ -34,3 +41,149 @@ PAC3 = QUIFOY['pac3']
 PART = QUIFAM['part']
 PREF = QUIMEN['pref']
 VOUS = QUIFOY['vous']
+
+
+def depcom_to_int(depcom):
+    """Encode an array of depcom codes (at most 5 characters, like "2A004") as integers preserving their order."""
+    # Null-padded to 8 bytes, each code reads as a big-endian integer.
+    return ascontiguousarray(depcom, dtype = 'S8').view('>i8').astype(int64)
+
+
+def depcom_startswith(depcom, prefixes):
+    """Tell whether each depcom code starts with `prefixes`, or with one of them if it is a list of prefixes.
+
+    The codes are compared as integers (see `depcom_to_int`): their first characters are the high bytes of their codes.
+    The prefixes are grouped by length, and the codes are compared once with each group.
+    """
+    if isinstance(prefixes, basestring):
+        prefixes = [prefixes]
+    depcom_int = depcom_to_int(depcom)
+    startswith = np.zeros(depcom_int.shape, dtype = bool)
+    for length in set(len(prefix) for prefix in prefixes):
+        shift = 8 * (8 - length)
+        same_length_prefixes = [prefix for prefix in prefixes if len(prefix) == length]
+        startswith |= np.in1d(depcom_int >> shift, depcom_to_int(same_length_prefixes) >> shift)
+    return startswith
+
+
+def rank_members(entity, key, condition = None, reverse = False):
+    """Rank the members of each entity of the group population `entity` by `key`, from 0.
+
+    Members with the same key are ranked in the order of their positions in the entity. With `condition`, only the
+    members satisfying it are ranked, and the others get -1. With `reverse`, the members are ranked by decreasing key.
+    The members of all entities are ranked by a single sort, on their entity ids followed by their keys.
+    """
+    entity_ids = np.asarray(entity.members_entity_id, dtype = int64)
+    key = np.asarray(key)
+    if not np.issubdtype(key.dtype, np.integer) or key.dtype == bool:
+        # Replace the keys by their ranks among all keys, to combine them with the entity ids in a single integer.
+        key = np.unique(key, return_inverse = True)[1]
+    key = key.astype(int64)
+    if len(key) > 0:
+        key = key - key.min()
+        if reverse:
+            key = key.max() - key
+    selected = condition if condition is not None else True
+    # Members not ranked go after the ranked ones.
+    span = int(key.max()) + 2 if len(key) > 0 else 1
+    if len(entity_ids) > 0 and int(entity_ids.max()) >= np.iinfo(int64).max // span:
+        raise ValueError(u'Too many entities or keys to rank the members of {}.'.format(entity.key).encode('utf-8'))
+    order = np.argsort(entity_ids * span + where(selected, key, span - 1), kind = 'mergesort')
+    sorted_entity_ids = entity_ids[order]
+    rank = np.empty(len(order), dtype = int64)
+    rank[order] = np.arange(len(order)) - np.searchsorted(sorted_entity_ids, sorted_entity_ids)
+    return where(selected, rank, -1)
+
+
+def nth_member_value(entity, array, rank, n, default = 0):
+    """Return, for each entity of the group population `entity`, the value of `array` for its member of rank `n`.
+
+    `rank` ranks the members of each entity (see `rank_members`). Entities without member of rank `n` get `default`.
+    """
+    result = entity.filled_array(default, dtype = array.dtype)
+    is_nth = rank == n
+    result[entity.members_entity_id[is_nth]] = array[is_nth]
+    return result
+
+
+# Read-only arrays of default values, shared by the inputs without value of a simulation, by simulation and then by
+# (entity key, dtype, default value).
+default_array_by_key_by_simulation = weakref.WeakKeyDictionary()
+# The same arrays, by id, to recognize them without their simulation.
+default_array_by_id = weakref.WeakValueDictionary()
+
+
+def get_shared_default_array(simulation, holder):
+    """Return the read-only array of the default value of `holder`, shared by the holders of its entity, dtype and
+    default value in `simulation`."""
+    variable = holder.variable
+    default_array_by_key = default_array_by_key_by_simulation.setdefault(simulation, {})
+    key = (holder.entity.key, variable.dtype, variable.default_value)
+    default_array = default_array_by_key.get(key)
+    if default_array is None:
+        default_array = holder.default_array()
+        default_array.flags.writeable = False
+        default_array_by_key[key] = default_array
+        default_array_by_id[id(default_array)] = default_array
+    return default_array
+
+
+def shared_default_value(formula, simulation, period, *extra_params):
+    """Base function of input variables, like `requested_period_default_value`, but sharing their default values.
+
+    The value of an input without value is a read-only array of its default value, shared with the other inputs of its
+    entity, dtype and default value, instead of a new array. Most declaration boxes (e.g. f7xx) are empty for almost
+    every foyer: they then cost no memory, and formulas can skip them (see `is_default_input`).
+    """
+    if formula.find_function(period) is not None:
+        return formula.exec_function(simulation, period, *extra_params)
+    return get_shared_default_array(simulation, formula.holder)
+
+
+def is_default_input(array):
+    """Tell whether `array` is the value of inputs without value (see `shared_default_value`)."""
+    return default_array_by_id.get(id(array)) is array
+
+
+# Number of formula calls skipped by `zero_if_default_inputs`, by simulation and then by variable name.
+skipped_formulas_count_by_simulation = weakref.WeakKeyDictionary()
+
+
+def get_skipped_formulas_count(simulation):
+    """Return the number of formula calls of `simulation` skipped by `zero_if_default_inputs`, by variable name."""
+    return skipped_formulas_count_by_simulation.setdefault(simulation, collections.Counter())
+
+
+def has_default_value(simulation, variable_name, period):
+    """Tell whether the input variable `variable_name` has its default value for every member of its entity during
+    `period`."""
+    variable = simulation.tax_benefit_system.variables[variable_name]
+    if variable.definition_period == MONTH and period.unit == YEAR:
+        array = simulation.calculate_add(variable_name, period)
+    elif variable.definition_period == YEAR:
+        array = simulation.calculate(variable_name, period.this_year)
+    else:
+        array = simulation.calculate(variable_name, period)
+    return is_default_input(array) or (array == variable.default_value).all()
+
+
+def zero_if_default_inputs(*input_variables):
+    """Return the base function of the variables whose formulas return their default value (usually zero) when each of
+    the `input_variables` has its default value.
+
+    The formula is then not called, and the value is the shared array of the default value (see
+    `get_shared_default_array`). Used for the réductions and crédits d'impôt, whose declaration boxes are empty for
+    almost every foyer. `input_variables` must list every input variable read by the formulas of the variable, which
+    must read them for the requested period. Formulas are skipped only when the tax and benefit system shares the
+    default values of its inputs (`shared_default_inputs`), and are always called otherwise.
+    """
+    def base_function(formula, simulation, period, *extra_params):
+        if formula.find_function(period) is None or extra_params or not get_tax_benefit_system_option(
+                simulation.tax_benefit_system, 'shared_default_inputs', False) or not all(
+                has_default_value(simulation, variable_name, period) for variable_name in input_variables):
+            return requested_period_default_value(formula, simulation, period, *extra_params)
+        get_skipped_formulas_count(simulation)[formula.holder.variable.name] += 1
+        return get_shared_default_array(simulation, formula.holder)
+
+    base_function.input_variables = input_variables
+    return base_function
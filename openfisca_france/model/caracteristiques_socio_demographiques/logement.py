@@ -1,8 +1,5 @@
 # -*- coding: utf-8 -*-
 
-from numpy.core.defchararray import startswith
-
-
 from openfisca_france.model.base import *  # noqa analysis:ignore
 
 class coloc(Variable):
@@ -97,7 +94,7 @@ class residence_guadeloupe(Variable):
 
     def formula(self, simulation, period):
         depcom = simulation.calculate('depcom', period)
-        return startswith(depcom, '971')
+        return depcom_startswith(depcom, '971')
 
 
 class residence_martinique(Variable):
@@ -107,7 +104,7 @@ class residence_martinique(Variable):
 
     def formula(self, simulation, period):
         depcom = simulation.calculate('depcom', period)
-        return startswith(depcom, '972')
+        return depcom_startswith(depcom, '972')
 
 
 class residence_guyane(Variable):
@@ -117,7 +114,7 @@ class residence_guyane(Variable):
 
     def formula(self, simulation, period):
         depcom = simulation.calculate('depcom', period)
-        return startswith(depcom, '973')
+        return depcom_startswith(depcom, '973')
 
 
 class residence_reunion(Variable):
@@ -127,7 +124,7 @@ class residence_reunion(Variable):
 
     def formula(self, simulation, period):
         depcom = simulation.calculate('depcom', period)
-        return startswith(depcom, '974')
+        return depcom_startswith(depcom, '974')
 
 
 class residence_mayotte(Variable):
@@ -137,4 +134,4 @@ class residence_mayotte(Variable):
 
     def formula(self, simulation, period):
         depcom = simulation.calculate('depcom', period)
-        return startswith(depcom, '976')
+        return depcom_startswith(depcom, '976')
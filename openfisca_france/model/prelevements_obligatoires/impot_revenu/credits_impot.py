@@ -254,6 +254,7 @@ class accult(Variable):
     entity = FoyerFiscal
     label = u"Acquisition de biens culturels"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7uo')
 
     def formula_2002(foyer_fiscal, period, parameters):
         '''
@@ -273,6 +274,7 @@ class acqgpl(Variable):
     label = u"Crédit d'impôt pour dépense d'acquisition ou de transformation d'un véhicule GPL ou mixte"
     end = '2007-12-31'
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7up', 'f7uq')
 
     def formula_2002(foyer_fiscal, period, parameters):
         '''
@@ -292,6 +294,7 @@ class aidmob(Variable):
     label = u"Crédit d'impôt aide à la mobilité"
     end = '2008-12-31'
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f1ar', 'f1br', 'f1cr', 'f1dr', 'f1er')
 
     def formula_2005(foyer_fiscal, period, parameters):
         '''
@@ -313,6 +316,7 @@ class aidper(Variable):
     entity = FoyerFiscal
     label = u"Crédits d’impôt pour dépenses en faveur de l’aide aux personnes"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7sf', 'f7wi', 'f7wj', 'f7wl', 'f7wr')
 
     def formula_2002_01_01(foyer_fiscal, period, parameters):
         '''
@@ -484,6 +488,7 @@ class assloy(Variable):
     entity = FoyerFiscal
     label = u"Crédit d’impôt primes d’assurance pour loyers impayés"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f4bf')
 
     def formula_2005(foyer_fiscal, period, parameters):
         '''
@@ -501,6 +506,7 @@ class autent(Variable):
     entity = FoyerFiscal
     label = u"autent"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f8uy')
 
     def formula_2009(foyer_fiscal, period, parameters):
         '''
@@ -517,6 +523,7 @@ class ci_garext(Variable):
     entity = FoyerFiscal
     label = u"Frais de garde des enfants à l’extérieur du domicile"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7ga', 'f7gb', 'f7gc', 'f7ge', 'f7gf', 'f7gg')
 
     def formula_2005(foyer_fiscal, period, parameters):
         '''
@@ -546,6 +553,7 @@ class creimp_exc_2008(Variable):
     entity = FoyerFiscal
     label = u"Crédit d'impôt exceptionnel sur les revenus 2008"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('elig_creimp_exc_2008')
 
     def formula(foyer_fiscal, period, parameters):
         '''
@@ -569,6 +577,11 @@ class creimp(Variable):
     entity = FoyerFiscal
     label = u"Avoirs fiscaux et crédits d'impôt"
     definition_period = YEAR
+    base_function = zero_if_default_inputs(
+        'f2ab', 'f2ck', 'f8ta', 'f8tb', 'f8tc', 'f8td_2002_2005', 'f8te', 'f8tf', 'f8tg', 'f8th', 'f8tl', 'f8to',
+        'f8tp', 'f8ts', 'f8tz', 'f8uw', 'f8uz', 'f8wa', 'f8wb', 'f8wc', 'f8wd', 'f8we', 'f8wr', 'f8ws', 'f8wt', 'f8wu',
+        'f8wv', 'f8wx',
+        )
     end = '2013-12-31'
 
     def formula_2002_01_01(foyer_fiscal, period, parameters):
@@ -831,6 +844,7 @@ class direpa(Variable):
     entity = FoyerFiscal
     label = u"Crédit d’impôt directive « épargne »"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f2bg')
 
     def formula(foyer_fiscal, period, parameters):
         '''
@@ -848,6 +862,7 @@ class divide(Variable):
     label = u"Crédit d'impôt dividendes"
     end = '2009-12-31'
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f2dc', 'f2gr')
 
     def formula_2005_01_01(foyer_fiscal, period, parameters):
         '''
@@ -870,6 +885,7 @@ class drbail(Variable):
     entity = FoyerFiscal
     label = u"Crédit d’impôt représentatif de la taxe additionnelle au droit de bail"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f4tq')
 
     def formula(foyer_fiscal, period, parameters):
         '''
@@ -888,6 +904,9 @@ class inthab(Variable):
     entity = FoyerFiscal
     label = u"Crédit d’impôt intérêts des emprunts pour l’habitation principale"
     definition_period = YEAR
+    base_function = zero_if_default_inputs(
+        'caseF', 'caseP', 'f7uh', 'f7vt', 'f7vu', 'f7vv', 'f7vw', 'f7vx', 'f7vy', 'f7vz', 'nbR',
+        )
     end = '2013-12-31'
 
     def formula_2007_01_01(foyer_fiscal, period, parameters):
@@ -1124,6 +1143,7 @@ class mecena(Variable):
     entity = FoyerFiscal
     label = u"Mécénat d'entreprise"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7us')
 
     def formula_2003_01_01(foyer_fiscal, period, parameters):
         '''
@@ -1141,6 +1161,7 @@ class percvm(Variable):
     label = u"Crédit d’impôt pertes sur cessions de valeurs mobilières"
     end = '2010-12-31'
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f3vv_end_2010')
 
     def formula_2010_01_01(foyer_fiscal, period, parameters):
         '''
@@ -1158,6 +1179,7 @@ class preetu(Variable):
     entity = FoyerFiscal
     label = u"Crédit d’impôt pour souscription de prêts étudiants"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7td', 'f7uk', 'f7vo')
 
     def formula_2005_01_01(foyer_fiscal, period, parameters):
         '''
@@ -1208,6 +1230,7 @@ class prlire(Variable):
     label = u"Prélèvement libératoire à restituer (case 2DH)"
     end = '2013-12-31'
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f2ch', 'f2dh')
 
     def formula(foyer_fiscal, period, parameters):
         '''
@@ -1229,6 +1252,11 @@ class quaenv(Variable):
     entity = FoyerFiscal
     label = u"Crédits d’impôt pour dépenses en faveur de la qualité environnementale"
     definition_period = YEAR
+    base_function = zero_if_default_inputs(
+        'f7sb', 'f7sc', 'f7sd', 'f7se', 'f7sf', 'f7sg', 'f7sh', 'f7si', 'f7sj', 'f7sk', 'f7sl', 'f7sm', 'f7sn', 'f7so',
+        'f7sp', 'f7sq', 'f7sr', 'f7ss', 'f7st', 'f7su', 'f7sv', 'f7sw', 'f7sz', 'f7tt', 'f7tu', 'f7tv', 'f7tw', 'f7tx',
+        'f7ty', 'f7wc', 'f7we', 'f7wf', 'f7wg', 'f7wh', 'f7wk', 'f7wq',
+        )
     end = '2013-12-31'
 
     def formula_2005_01_01(foyer_fiscal, period, parameters):
@@ -1563,6 +1591,7 @@ class saldom2(Variable):
     entity = FoyerFiscal
     label = u"Crédit d’impôt emploi d’un salarié à domicile"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7db', 'f7dg', 'f7dl', 'f7dq')
     end = '2013-12-31'
 
     def formula_2007_01_01(foyer_fiscal, period, parameters):
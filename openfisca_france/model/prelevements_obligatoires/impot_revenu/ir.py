@@ -3,6 +3,7 @@
 from __future__ import division
 
 
+from functools import cmp_to_key
 import logging
 
 from numpy import datetime64, logical_and as and_, logical_or as or_, logical_xor as xor_, round as round_
@@ -55,6 +56,25 @@ class jour_xyz(Variable):
 ###############################################################################
 
 
+def compare_periods(a, b):
+    return periods.compare_period_start(a, b) or periods.compare_period_size(a, b)
+
+
+def get_last_known_value(holder, start):
+    """Return the latest period known by `holder` starting on the same day of month as `start`, and its value.
+
+    Return None when there is no such period. The known periods are scanned once, without sorting them.
+    """
+    array_by_period = holder._array_by_period
+    if not array_by_period:
+        return None
+    known_periods = [known_period for known_period in array_by_period if known_period.start.day == start.day]
+    if not known_periods:
+        return None
+    last_period = max(known_periods, key = cmp_to_key(compare_periods))
+    return last_period, array_by_period[last_period]
+
+
 class age(Variable):
     base_function = missing_value
     unit = 'years'
@@ -67,12 +87,6 @@ class age(Variable):
     set_input = set_input_dispatch_by_period
 
     def formula(individu, period, parameters):
-        def compare_periods(x, y):
-            a = x[0]
-            b = y[0]
-
-            return periods.compare_period_start(a, b) or periods.compare_period_size(a, b)
-
         has_birth = individu.get_holder('date_naissance')._array is not None
         if not has_birth:
             has_age_en_mois = bool(individu.get_holder('age_en_mois')._array_by_period)
@@ -80,14 +94,12 @@ class age(Variable):
                 return individu('age_en_mois', period) // 12
 
             # If age is known at the same day of another year, compute the new age from it.
-            holder = individu.get_holder('age')
             start = period.start
-            if holder._array_by_period is not None:
-                for last_period, last_array in sorted(holder._array_by_period.iteritems(), cmp = compare_periods, reverse = True):
-                    last_start = last_period.start
-                    if last_start.day == start.day:
-                        return last_array + int((start.year - last_start.year) +
-                            (start.month - last_start.month) / 12)
+            last_known_value = get_last_known_value(individu.get_holder('age'), start)
+            if last_known_value is not None:
+                last_period, last_array = last_known_value
+                last_start = last_period.start
+                return last_array + int((start.year - last_start.year) + (start.month - last_start.month) / 12)
 
         date_naissance = individu('date_naissance', period)
         return (datetime64(period.start) - date_naissance).astype('timedelta64[Y]')
@@ -104,21 +116,13 @@ class age_en_mois(Variable):
     definition_period = MONTH
 
     def formula(individu, period, parameters):
-
-        def compare_periods(x, y):
-            a = x[0]
-            b = y[0]
-
-            return periods.compare_period_start(a, b) or periods.compare_period_size(a, b)
-
         # If age_en_mois is known at the same day of another month, compute the new age_en_mois from it.
-        holder = individu.get_holder('age_en_mois')
         start = period.start
-        if holder._array_by_period is not None:
-            for last_period, last_array in sorted(holder._array_by_period.iteritems(), cmp = compare_periods, reverse = True):
-                last_start = last_period.start
-                if last_start.day == start.day:
-                    return last_array + ((start.year - last_start.year) * 12 + (start.month - last_start.month))
+        last_known_value = get_last_known_value(individu.get_holder('age_en_mois'), start)
+        if last_known_value is not None:
+            last_period, last_array = last_known_value
+            last_start = last_period.start
+            return last_array + ((start.year - last_start.year) * 12 + (start.month - last_start.month))
 
         has_birth = individu.get_holder('date_naissance')._array is not None
         if not has_birth:
@@ -440,6 +440,7 @@ class adhcga(Variable):
     entity = FoyerFiscal
     label = u"adhcga"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7ff', 'f7fg')
 
     def formula(self, simulation, period):
         '''
@@ -459,6 +460,7 @@ class assvie(Variable):
     label = u"assvie"
     end = '2004-12-31'
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7gw', 'f7gx', 'f7gy')
 
     def formula_2002_01_01(self, simulation, period):
         '''
@@ -480,6 +482,7 @@ class cappme(Variable):
     entity = FoyerFiscal
     label = u"cappme"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7cc', 'f7cf', 'f7cl', 'f7cm', 'f7cn', 'f7cq', 'f7cu')
     end = '2013-12-31'
 
     def formula_2002_01_01(self, simulation, period):
@@ -635,6 +638,7 @@ class cotsyn(Variable):
     entity = FoyerFiscal
     label = u"cotsyn"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7ac')
 
     def formula(self, simulation, period):
         '''
@@ -671,6 +675,7 @@ class creaen(Variable):
     entity = FoyerFiscal
     label = u"creaen"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7fy', 'f7gy', 'f7hy', 'f7iy', 'f7jy', 'f7ky', 'f7ly', 'f7my')
     end = '2014-12-31'
 
     def formula_2006_01_01(self, simulation, period):
@@ -740,6 +745,7 @@ class deffor(Variable):
     entity = FoyerFiscal
     label = u"deffor"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7uc')
 
     def formula_2006_01_01(self, simulation, period):
         '''
@@ -757,6 +763,7 @@ class daepad(Variable):
     entity = FoyerFiscal
     label = u"daepad"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7cd', 'f7ce')
 
     def formula(self, simulation, period):
         '''
@@ -775,6 +782,7 @@ class dfppce(Variable):
     entity = FoyerFiscal
     label = u"dfppce"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7uf', 'f7uh', 'f7vc', 'f7xs', 'f7xt', 'f7xu', 'f7xw', 'f7xy')
     end = '2013-12-31'
 
     def formula_2002_01_01(self, simulation, period):
@@ -946,6 +954,15 @@ class doment(Variable):
     entity = FoyerFiscal
     label = u"doment"
     definition_period = YEAR
+    base_function = zero_if_default_inputs(
+        'f7ks', 'f7kt', 'f7ku', 'f7lg', 'f7lh', 'f7li', 'f7ls', 'f7ma', 'f7mb', 'f7mc', 'f7mm', 'f7mn', 'f7nu', 'f7nv',
+        'f7nw', 'f7ny', 'f7oz', 'f7pa', 'f7pb', 'f7pd', 'f7pe', 'f7pf', 'f7ph', 'f7pi', 'f7pj', 'f7pl', 'f7pm', 'f7pn',
+        'f7po', 'f7pp', 'f7pr', 'f7ps', 'f7pt', 'f7pu', 'f7pw', 'f7px', 'f7py', 'f7pz', 'f7qe', 'f7qf', 'f7qg', 'f7qh',
+        'f7qi', 'f7qj', 'f7qo', 'f7qp', 'f7qq', 'f7qr', 'f7qs', 'f7qv', 'f7qz', 'f7rg', 'f7ri', 'f7rj', 'f7rk', 'f7rl',
+        'f7rm', 'f7ro', 'f7rp', 'f7rq', 'f7rr', 'f7rt', 'f7ru', 'f7rv', 'f7rw', 'f7rx', 'f7ry', 'f7rz', 'f7sz', 'f7ur',
+        'fhsa', 'fhsb', 'fhsc', 'fhse', 'fhsf', 'fhsg', 'fhsh', 'fhsj', 'fhsk', 'fhsl', 'fhsm', 'fhso', 'fhsp', 'fhsq',
+        'fhsr', 'fhst', 'fhsu', 'fhsv', 'fhsw', 'fhsz', 'fhta', 'fhtb', 'fhtd',
+        )
     end = '2013-12-31'
 
     def formula_2005_01_01(self, simulation, period):
@@ -1239,6 +1256,11 @@ class domlog(Variable):
     entity = FoyerFiscal
     label = u"domlog"
     definition_period = YEAR
+    base_function = zero_if_default_inputs(
+        'f7oa', 'f7ob', 'f7oc', 'f7oh', 'f7oi', 'f7oj', 'f7ok', 'f7ol', 'f7om', 'f7on', 'f7oo', 'f7op', 'f7oq', 'f7or',
+        'f7os', 'f7ot', 'f7ou', 'f7ov', 'f7ow', 'f7qb', 'f7qc', 'f7qd', 'f7qk', 'f7ql', 'f7qm', 'f7qt', 'f7ua', 'f7ub',
+        'f7uc', 'f7ui', 'f7uj', 'fhod', 'fhoe', 'fhof', 'fhog', 'fhox', 'fhoy', 'fhoz',
+        )
     end = '2013-12-31'
 
     def formula_2002_01_01(self, simulation, period):
@@ -1430,6 +1452,9 @@ class domsoc(Variable):
     entity = FoyerFiscal
     label = u"domsoc"
     definition_period = YEAR
+    base_function = zero_if_default_inputs(
+        'f7kg', 'f7kh', 'f7ki', 'f7qj', 'f7qk', 'f7qn', 'f7qs', 'f7qu', 'f7qw', 'f7qx', 'fhra', 'fhrb', 'fhrc', 'fhrd',
+        )
     end = '2013-12-31'
 
 
@@ -1481,6 +1506,7 @@ class donapd(Variable):
     entity = FoyerFiscal
     label = u"donapd"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7ud', 'f7va')
     end = '2013-12-31'
 
     def formula_2002_01_01(self, simulation, period):
@@ -1508,6 +1534,7 @@ class duflot(Variable):
     entity = FoyerFiscal
     label = u"duflot"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7gh', 'f7gi')
 
     def formula_2013_01_01(self, simulation, period):
         '''
@@ -1529,6 +1556,7 @@ class ecodev(Variable):
     label = u"ecodev"
     end = '2009-12-31'
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7uh')
 
     def formula_2009_01_01(self, simulation, period):
         '''
@@ -1547,6 +1575,7 @@ class ecpess(Variable):
     entity = FoyerFiscal
     label = u"ecpess"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7ea', 'f7eb', 'f7ec', 'f7ed', 'f7ef', 'f7eg')
 
     def formula(self, simulation, period):
         '''
@@ -1570,6 +1599,7 @@ class garext(Variable):
     entity = FoyerFiscal
     label = u"garext"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7ga', 'f7gb', 'f7gc', 'f7ge', 'f7gf', 'f7gg')
     end = '2005-12-31'
 
 
@@ -1618,6 +1648,7 @@ class intagr(Variable):
     entity = FoyerFiscal
     label = u"intagr"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7um')
 
     def formula_2005_01_01(self, simulation, period):
         '''
@@ -1638,6 +1669,7 @@ class intcon(Variable):
     label = u"intcon"
     end = '2005-12-31'
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7uh')
 
     def formula_2004_01_01(self, simulation, period):
         '''
@@ -1657,6 +1689,7 @@ class intemp(Variable):
     label = u"intemp"
     end = '2003-12-31'
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7wg')
 
     def formula_2002_01_01(self, simulation, period):
         '''
@@ -1676,6 +1709,9 @@ class invfor(Variable):
     entity = FoyerFiscal
     label = u"invfor"
     definition_period = YEAR
+    base_function = zero_if_default_inputs(
+        'f7te', 'f7tf', 'f7tg', 'f7th', 'f7ul', 'f7un', 'f7up', 'f7uq', 'f7uu', 'f7uv', 'f7uw', 'f7ux',
+        )
     end = '2013-12-31'
 
 
@@ -1826,6 +1862,10 @@ class invlst(Variable):
     entity = FoyerFiscal
     label = u"invlst"
     definition_period = YEAR
+    base_function = zero_if_default_inputs(
+        'f7uy', 'f7uz', 'f7xa', 'f7xb', 'f7xc', 'f7xd', 'f7xe', 'f7xf', 'f7xg', 'f7xh', 'f7xi', 'f7xj', 'f7xk', 'f7xl',
+        'f7xm', 'f7xn', 'f7xo', 'f7xp', 'f7xq', 'f7xr', 'f7xv', 'f7xx', 'f7xz',
+        )
     end = '2013-12-31'
 
     def formula_2004_01_01(self, simulation, period):
@@ -2038,6 +2078,7 @@ class invrev(Variable):
     label = u"invrev"
     end = '2003-12-31'
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7gs', 'f7gt', 'f7gu', 'f7gv', 'f7xg')
 
     def formula_2002_01_01(self, simulation, period):
         '''
@@ -2065,6 +2106,11 @@ class locmeu(Variable):
     entity = FoyerFiscal
     label = u"locmeu"
     definition_period = YEAR
+    base_function = zero_if_default_inputs(
+        'f7ia', 'f7ib', 'f7ic', 'f7id', 'f7ie', 'f7if', 'f7ig', 'f7ih', 'f7ij', 'f7ik', 'f7il', 'f7im', 'f7in', 'f7io',
+        'f7ip', 'f7iq', 'f7ir', 'f7is', 'f7it', 'f7iu', 'f7iv', 'f7iw', 'f7ix', 'f7iy', 'f7iz', 'f7jc', 'f7ji', 'f7js',
+        'f7jt', 'f7ju', 'f7jv', 'f7jw', 'f7jx', 'f7jy',
+        )
     end = '2013-12-31'
 
     def formula_2009_01_01(self, simulation, period):
@@ -2214,6 +2260,7 @@ class mohist(Variable):
     entity = FoyerFiscal
     label = u"mohist"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7nz')
 
     def formula_2008_01_01(self, simulation, period):
         '''
@@ -2231,6 +2278,7 @@ class patnat(Variable):
     entity = FoyerFiscal
     label = u"patnat"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7ka', 'f7kb', 'f7kc', 'f7kd')
     end = '2013-12-31'
 
     def formula_2010_01_01(self, simulation, period):
@@ -2289,6 +2337,7 @@ class prcomp(Variable):
     entity = FoyerFiscal
     label = u"Prestations compensatoires"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7wm', 'f7wn', 'f7wo', 'f7wp')
 
     def formula(self, simulation, period):
         '''
@@ -2340,6 +2389,7 @@ class repsoc(Variable):
     entity = FoyerFiscal
     label = u"repsoc"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7fh')
 
     def formula_2003_01_01(self, simulation, period):
         '''
@@ -2359,6 +2409,7 @@ class resimm(Variable):
     entity = FoyerFiscal
     label = u"resimm"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7ra', 'f7rb', 'f7rc', 'f7rd', 'f7re', 'f7rf', 'f7sx', 'f7sy')
     end = '2013-12-31'
 
 
@@ -2443,6 +2494,7 @@ class rsceha(Variable):
     entity = FoyerFiscal
     label = u"rsceha"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7gz', 'nbR')
 
     def formula(self, simulation, period):
         '''
@@ -2463,6 +2515,7 @@ class saldom(Variable):
     entity = FoyerFiscal
     label = u"saldom"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7db', 'f7df', 'f7dg', 'f7dl', 'f7dq')
     end = '2013-12-31'
 
 
@@ -2552,6 +2605,14 @@ class scelli(Variable):
     entity = FoyerFiscal
     label = u"scelli"
     definition_period = YEAR
+    base_function = zero_if_default_inputs(
+        'f7fa', 'f7fb', 'f7fc', 'f7fd', 'f7gj', 'f7gk', 'f7gl', 'f7gp', 'f7gs', 'f7gt', 'f7gu', 'f7gv', 'f7gw', 'f7gx',
+        'f7ha', 'f7hb', 'f7hd', 'f7he', 'f7hf', 'f7hg', 'f7hh', 'f7hj', 'f7hk', 'f7hl', 'f7hm', 'f7hn', 'f7ho', 'f7hr',
+        'f7hs', 'f7ht', 'f7hu', 'f7hv', 'f7hw', 'f7hx', 'f7hz', 'f7ja', 'f7jb', 'f7jd', 'f7je', 'f7jf', 'f7jg', 'f7jh',
+        'f7jj', 'f7jk', 'f7jl', 'f7jm', 'f7jn', 'f7jo', 'f7jp', 'f7jq', 'f7jr', 'f7la', 'f7lb', 'f7lc', 'f7ld', 'f7le',
+        'f7lf', 'f7lm', 'f7ls', 'f7lz', 'f7mg', 'f7na', 'f7nb', 'f7nc', 'f7nd', 'f7ne', 'f7nf', 'f7ng', 'f7nh', 'f7ni',
+        'f7nj', 'f7nk', 'f7nl', 'f7nm', 'f7nn', 'f7no', 'f7np', 'f7nq', 'f7nr', 'f7ns', 'f7nt',
+        )
     end = '2013-12-31'
 
 
@@ -2867,6 +2928,7 @@ class sofica(Variable):
     entity = FoyerFiscal
     label = u"sofica"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7fn', 'f7gn')
 
     def formula_2006_01_01(self, simulation, period):
         '''
@@ -2889,6 +2951,7 @@ class sofipe(Variable):
     label = u"sofipe"
     end = '2011-01-01'
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7gs')
 
     def formula_2009_01_01(self, simulation, period):
         """
@@ -2910,6 +2973,7 @@ class spfcpi(Variable):
     entity = FoyerFiscal
     label = u"spfcpi"
     definition_period = YEAR
+    base_function = zero_if_default_inputs('f7fl', 'f7fm', 'f7fq', 'f7gq')
     end = '2014-12-31'
 
 
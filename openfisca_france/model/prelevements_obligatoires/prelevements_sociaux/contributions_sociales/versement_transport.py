@@ -3,7 +3,7 @@
 import json
 
 
-from numpy import logical_or as or_, fromiter
+from numpy import array, cumsum, datetime64, int64, logical_or as or_, minimum, searchsorted, zeros
 
 from openfisca_france.model.base import *  # noqa analysis:ignore
 from openfisca_france.france_taxbenefitsystem import COUNTRY_DIR
@@ -21,15 +21,8 @@ class taux_versement_transport(Variable):
 
         seuil_effectif = simulation.parameters_at(period.start).cotsoc.versement_transport.seuil_effectif
 
-        preload_taux_versement_transport()
         public = (categorie_salarie >= 2)
-        taux_versement_transport = fromiter(
-            (
-                get_taux_versement_transport(code_commune, period)
-                for code_commune in depcom_entreprise
-                ),
-            dtype = 'float',
-            )
+        taux_versement_transport = get_taux_versement_transport(depcom_entreprise, period.start)
         # "L'entreprise emploie-t-elle plus de 9 ou 10 salariés dans le périmètre de l'Autorité organisatrice de transport
         # (AOT) suivante ou syndicat mixte de transport (SMT)"
         return taux_versement_transport * or_(effectif_entreprise >= seuil_effectif, public) / 100
@@ -48,34 +41,83 @@ class versement_transport(Variable):
         return cotisation
 
 
+# File loading and parsing
+
+# The table is compiled once into flat arrays, sorted by commune code (see `depcom_to_int`):
+# each commune owns the slice `[breakpoint_offsets[i], breakpoint_offsets[i + 1])` of `breakpoints` (dates at which
+# its rate changes, in increasing order) and of `taux_by_breakpoint` (the AOT + SMT rate in force from that date).
+versement_transport_depcom_index = None
+versement_transport_breakpoint_offsets = None
+versement_transport_breakpoints = None
+versement_transport_taux_by_breakpoint = None
+# Rate of each commune of the index, by instant.
+taux_versement_transport_by_instant = {}
 
-# File loading and parsing -> global table_versement_transport
 
 def preload_taux_versement_transport():
-    if not 'table_versement_transport' in globals():
-        global table_versement_transport
+    global versement_transport_depcom_index, versement_transport_breakpoint_offsets, \
+        versement_transport_breakpoints, versement_transport_taux_by_breakpoint
+    if versement_transport_depcom_index is None:
         with open(COUNTRY_DIR + '/assets/versement_transport/taux.json') as data_file:
             table_versement_transport = json.load(data_file)
 
-
-def get_taux_versement_transport(code_commune, period):
-    instant = period.start
-    taux_commune = table_versement_transport.get(code_commune, None)
-    if taux_commune is None:
-        return 0.0 + 0.0
-    else:
-        aot = taux_commune.get('aot', None)
-        smt = taux_commune.get('smt', None)
-        return select_temporal_taux_versement_transport(aot, instant) + select_temporal_taux_versement_transport(smt, instant)
-
-
-def select_temporal_taux_versement_transport(rates, instant):
-
-        if rates is None:
-            return 0.0
-
-        taux = rates.get('taux')
-        for date in sorted(taux, reverse=True):
-            if str(instant) >= date:
-                return float(taux[date])
-        return 0.0
+        code_communes = sorted(table_versement_transport.keys())
+        breakpoints = []
+        taux_by_breakpoint = []
+        breakpoints_count = []
+        for code_commune in code_communes:
+            taux_commune = table_versement_transport[code_commune]
+            aot_by_date = taux_commune.get('aot', {}).get('taux', {})
+            smt_by_date = taux_commune.get('smt', {}).get('taux', {})
+            dates = sorted(set(aot_by_date) | set(smt_by_date))
+            breakpoints.extend(dates)
+            taux_by_breakpoint.extend(
+                select_temporal_taux_versement_transport(aot_by_date, date) +
+                select_temporal_taux_versement_transport(smt_by_date, date)
+                for date in dates
+                )
+            breakpoints_count.append(len(dates))
+
+        depcom_index = depcom_to_int(code_communes)
+        breakpoint_offsets = zeros(len(code_communes) + 1, dtype = int64)
+        cumsum(breakpoints_count, out = breakpoint_offsets[1:])
+        versement_transport_breakpoint_offsets = breakpoint_offsets
+        versement_transport_breakpoints = array(breakpoints, dtype = 'datetime64[D]')
+        versement_transport_taux_by_breakpoint = array(taux_by_breakpoint, dtype = float)
+        versement_transport_depcom_index = depcom_index
+
+
+def select_temporal_taux_versement_transport(taux_by_date, date):
+    """Return the rate in force at `date` (a "YYYY-MM-DD" string), given rates indexed by their start date."""
+    for start_date in sorted(taux_by_date, reverse = True):
+        if date >= start_date:
+            return float(taux_by_date[start_date])
+    return 0.0
+
+
+def get_taux_versement_transport_by_commune(instant):
+    """Return the rate in force at `instant` for every commune of `versement_transport_depcom_index`."""
+    taux_by_commune = taux_versement_transport_by_instant.get(instant)
+    if taux_by_commune is None:
+        preload_taux_versement_transport()
+        offsets = versement_transport_breakpoint_offsets
+        # Breakpoints are sorted within each commune: count those already passed and take the rate of the last one.
+        started = (versement_transport_breakpoints <= datetime64(str(instant), 'D')).astype(int64)
+        started_cumsum = zeros(len(started) + 1, dtype = int64)
+        cumsum(started, out = started_cumsum[1:])
+        started_count = started_cumsum[offsets[1:]] - started_cumsum[offsets[:-1]]
+        taux_by_commune = zeros(len(offsets) - 1)
+        has_started = started_count > 0
+        taux_by_commune[has_started] = versement_transport_taux_by_breakpoint[
+            offsets[:-1][has_started] + started_count[has_started] - 1]
+        taux_versement_transport_by_instant[instant] = taux_by_commune
+    return taux_by_commune
+
+
+def get_taux_versement_transport(depcom_entreprise, instant):
+    preload_taux_versement_transport()
+    taux_by_commune = get_taux_versement_transport_by_commune(instant)
+    depcom_index = versement_transport_depcom_index
+    depcom_codes = depcom_to_int(depcom_entreprise)
+    positions = minimum(searchsorted(depcom_index, depcom_codes), len(depcom_index) - 1)
+    return where(depcom_index[positions] == depcom_codes, taux_by_commune[positions], 0.0)
@@ -2,17 +2,14 @@
 
 from __future__ import division
 
-from functools import partial
 import logging
 
-from numpy import (
-    busday_count as original_busday_count, datetime64, logical_or as or_, logical_and as and_, timedelta64
-    )
+from numpy import busday_count, datetime64, logical_or as or_, logical_and as and_, timedelta64
 
 from openfisca_core import periods
 
 from openfisca_france.model.base import *  # noqa analysis:ignore
-from openfisca_france.assets.holidays import holidays
+from openfisca_france.assets.holidays import count_month_working_days, holidays_calendar
 
 
 log = logging.getLogger(__name__)
@@ -69,25 +66,19 @@ class coefficient_proratisation(Variable):
         # Décompte des jours en début et fin de contrat
         # http://www.gestiondelapaie.com/flux-paie/?1029-la-bonne-premiere-paye
 
-        # Méthode numpy de calcul des jours travaillés
-        busday_count = partial(original_busday_count, holidays=holidays)  # @holidays : jours feriés français
-
+        # Méthode numpy de calcul des jours travaillés, du lundi au vendredi hors jours fériés français
         debut_mois = datetime64(period.start.offset('first-of', 'month'))
         fin_mois = datetime64(period.start.offset('last-of', 'month')) + timedelta64(1,
                                                                                      'D')  # busday ignores the last day
 
-        jours_ouvres_ce_mois = busday_count(
-            debut_mois,
-            fin_mois,
-            weekmask='1111100'
-        )
+        jours_ouvres_ce_mois = count_month_working_days(debut_mois)
 
         mois_incomplet = or_(contrat_de_travail_debut > debut_mois, contrat_de_travail_fin < fin_mois)
         # jours travaillables sur l'intersection du contrat de travail et du mois en cours
         jours_ouvres_ce_mois_incomplet = busday_count(
             max_(contrat_de_travail_debut, debut_mois),
             min_(contrat_de_travail_fin, fin_mois),
-            weekmask='1111100'
+            busdaycal = holidays_calendar,
         )
 
         duree_legale_mensuelle = 35 * 52 / 12  # ~151,67
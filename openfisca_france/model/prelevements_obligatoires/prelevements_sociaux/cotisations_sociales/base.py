@@ -1,6 +1,35 @@
 # -*- coding: utf-8 -*-
 
-from openfisca_france.model.base import CATEGORIE_SALARIE
+import collections
+
+from numpy import array, finfo, inf, maximum, minimum, outer, round as round_, zeros
+from openfisca_core.periods import YEAR
+from openfisca_core.taxscales import MarginalRateTaxScale
+
+from openfisca_france.cache import DerivedValuesCache
+from openfisca_france.model.base import CATEGORIE_SALARIE, get_tax_benefit_system_option
+
+
+# Variables from which the contribution scales are evaluated.
+BAREME_INPUT_VARIABLES = ['assiette_cotisations_sociales', 'plafond_securite_sociale', 'categorie_salarie']
+
+# Results of the fused evaluation of the contribution scales, by (cotisation_type, period).
+fused_cotisations_cache = DerivedValuesCache()
+# Running sums of monthly values since January, by (variable_name, year).
+cumul_cache = DerivedValuesCache()
+
+
+def get_rows_by_categorie_salarie(categorie_salarie):
+    """Partition the population by categorie_salarie.
+
+    The partition is not cached: a categorie_salarie array may be modified in place, e.g. when an input is set again
+    with the same buffer.
+    """
+    return [
+        (type_sal_name, (categorie_salarie == type_sal_index).nonzero()[0])
+        for type_sal_name, type_sal_index in CATEGORIE_SALARIE
+        ]
+
 
 def apply_bareme_for_relevant_type_sal(
         bareme_by_type_sal_name,
@@ -15,43 +44,136 @@ def apply_bareme_for_relevant_type_sal(
     assert categorie_salarie is not None
     assert base is not None
     assert plafond_securite_sociale is not None
-    def iter_cotisations():
-        for type_sal_name, type_sal_index in CATEGORIE_SALARIE:
-            if type_sal_name not in bareme_by_type_sal_name:  # to deal with public_titulaire_militaire
-                continue
-
-            node = bareme_by_type_sal_name[type_sal_name]
-            if bareme_name in node._children:
-                bareme = getattr(node, bareme_name)
-                yield bareme.calc(
-                    base * (categorie_salarie == type_sal_index),
-                    factor = plafond_securite_sociale,
-                    round_base_decimals = round_base_decimals,
-                    )
-    return - sum(iter_cotisations())
+    # Evaluate each scale only on the rows of its categorie_salarie, and scatter the results back.
+    cotisation = zeros(len(categorie_salarie))
+    for type_sal_name, rows in get_rows_by_categorie_salarie(categorie_salarie):
+        if type_sal_name not in bareme_by_type_sal_name:  # to deal with public_titulaire_militaire
+            continue
+        if len(rows) == 0:
+            continue
+
+        node = bareme_by_type_sal_name[type_sal_name]
+        if bareme_name in node._children:
+            bareme = getattr(node, bareme_name)
+            cotisation[rows] = bareme.calc(
+                base[rows],
+                factor = plafond_securite_sociale[rows],
+                round_base_decimals = round_base_decimals,
+                )
+    return - cotisation
+
+
+def apply_all_baremes_for_relevant_type_sal(
+        bareme_by_type_sal_name,
+        categorie_salarie,
+        base,
+        plafond_securite_sociale,
+        round_base_decimals = 2,
+        ):
+    """Evaluate at once every contribution scale of `bareme_by_type_sal_name`.
+
+    Return the contributions by scale name, as `apply_bareme_for_relevant_type_sal` would compute them one by one.
+    Within each categorie_salarie, the base is split into brackets once for all the scales sharing the same thresholds.
+    """
+    cotisation_by_bareme_name = {}
+    for type_sal_name, rows in get_rows_by_categorie_salarie(categorie_salarie):
+        if type_sal_name not in bareme_by_type_sal_name:  # to deal with public_titulaire_militaire
+            continue
+        if len(rows) == 0:
+            continue
+
+        node = bareme_by_type_sal_name[type_sal_name]
+        bareme_by_name_by_thresholds = collections.defaultdict(dict)
+        for bareme_name, bareme in node._children.iteritems():
+            if isinstance(bareme, MarginalRateTaxScale):
+                bareme_by_name_by_thresholds[tuple(bareme.thresholds)][bareme_name] = bareme
+
+        base_rows = base[rows]
+        # Same computation as MarginalRateTaxScale.calc, shared by the scales having the same thresholds.
+        factor = plafond_securite_sociale[rows] + finfo(float).eps
+        for thresholds, bareme_by_name in bareme_by_name_by_thresholds.iteritems():
+            bracket_limits = outer(factor, array(thresholds + (inf,)))
+            if round_base_decimals is not None:
+                bracket_limits = round_(bracket_limits, round_base_decimals)
+            base_by_bracket = maximum(
+                minimum(base_rows[:, None], bracket_limits[:, 1:]) - bracket_limits[:, :-1],
+                0,
+                )
+            if round_base_decimals is not None:
+                base_by_bracket = round_(base_by_bracket, round_base_decimals)
+            for bareme_name, bareme in bareme_by_name.iteritems():
+                cotisation = cotisation_by_bareme_name.get(bareme_name)
+                if cotisation is None:
+                    cotisation_by_bareme_name[bareme_name] = cotisation = zeros(len(categorie_salarie))
+                if round_base_decimals is None:
+                    cotisation[rows] = base_by_bracket.dot(bareme.rates)
+                else:
+                    cotisation[rows] = round_(base_by_bracket * bareme.rates, round_base_decimals).sum(axis = 1)
+    return {
+        bareme_name: - cotisation
+        for bareme_name, cotisation in cotisation_by_bareme_name.iteritems()
+        }
+
+
+def calculate_cumul(simulation, variable_name, period, **parameters):
+    """Sum the monthly values of `variable_name` over `period`, like `simulation.calculate_add`.
+
+    In payroll mode (see `fused_cotisations_sociales`), periods starting in January are summed with a running sum per
+    variable and year, extended month after month, and kept as long as the monthly values it adds up stay in the cache
+    of the simulation (see `DerivedValuesCache`). In December, the yearly assiette of every contribution and the
+    regularisation of every anticipated contribution thus reuse the months already added up. The running sums are
+    read-only, as they are shared by their callers.
+    """
+    months_count = period.size * 12 if period.unit == YEAR else period.size
+    if period.start.month != 1 or not 1 < months_count <= 12 or \
+            not get_tax_benefit_system_option(simulation.tax_benefit_system, 'fused_cotisations_sociales', False):
+        return simulation.calculate_add(variable_name, period, **parameters)
+
+    key = (variable_name, period.start.year)
+    cumul_months_count, cumul = cumul_cache.get(simulation, key) or (0, None)
+    if cumul_months_count > months_count:
+        return simulation.calculate_add(variable_name, period, **parameters)
+    month = period.start.period('month').offset(cumul_months_count)
+    while cumul_months_count < months_count:
+        value = simulation.calculate(variable_name, month, **parameters)
+        # Never add in place: previous sums may still be used by the caller which got them.
+        cumul = value.copy() if cumul is None else cumul + value
+        cumul_months_count += 1
+        month = month.offset(1)
+    cumul.flags.writeable = False
+    cumul_cache.put(simulation, key, (cumul_months_count, cumul), [variable_name],
+        period.start.period('month', cumul_months_count))
+    return cumul
+
+
+def clear_simulation_cache(simulation):
+    """Forget the running sums and fused contributions kept for `simulation`, e.g. to free their memory."""
+    fused_cotisations_cache.clear(simulation)
+    cumul_cache.clear(simulation)
 
 
 def apply_bareme(simulation, period, cotisation_type = None, bareme_name = None, variable_name = None):
     # period = period.first_month
     cotisation_mode_recouvrement = simulation.calculate('cotisation_sociale_mode_recouvrement', period)
-    cotisation = (
-        # en fin d'année
-        cotisation_mode_recouvrement == 1) * (
-            compute_cotisation_annuelle(
-                simulation,
-                period,
-                cotisation_type = cotisation_type,
-                bareme_name = bareme_name,
-                )
-            ) + (
-        # anticipé
-        cotisation_mode_recouvrement == 0) * (
+    # en fin d'année
+    cotisation_annuelle = compute_cotisation_annuelle(
+        simulation,
+        period,
+        cotisation_type = cotisation_type,
+        bareme_name = bareme_name,
+        )
+    cotisation = (cotisation_mode_recouvrement == 1) * cotisation_annuelle
+    # anticipé
+    anticipe = cotisation_mode_recouvrement == 0
+    if anticipe.any():
+        cotisation = cotisation + anticipe * (
             compute_cotisation_anticipee(
                 simulation,
                 period,
                 cotisation_type = cotisation_type,
                 bareme_name = bareme_name,
                 variable_name = variable_name,
+                cotisation_annuelle = cotisation_annuelle if period.start.month == 12 else None,
                 )
             )
     return cotisation
@@ -60,6 +182,11 @@ def apply_bareme(simulation, period, cotisation_type = None, bareme_name = None,
 def compute_cotisation(simulation, period, cotisation_type = None, bareme_name = None):
 
     assert cotisation_type is not None
+    if get_tax_benefit_system_option(simulation.tax_benefit_system, 'fused_cotisations_sociales', False):
+        cotisation_by_bareme_name = compute_cotisations(simulation, period, cotisation_type = cotisation_type)
+        if bareme_name in cotisation_by_bareme_name:
+            return cotisation_by_bareme_name[bareme_name]
+
     law = simulation.parameters_at(period.start)
     if cotisation_type == "employeur":
         bareme_by_type_sal_name = law.cotsoc.cotisations_employeur
@@ -67,9 +194,9 @@ def compute_cotisation(simulation, period, cotisation_type = None, bareme_name =
         bareme_by_type_sal_name = law.cotsoc.cotisations_salarie
     assert bareme_name is not None
 
-    assiette_cotisations_sociales = simulation.calculate_add('assiette_cotisations_sociales', period)
-    plafond_securite_sociale = simulation.calculate_add('plafond_securite_sociale', period)
-    categorie_salarie = simulation.calculate_add('categorie_salarie', period)
+    assiette_cotisations_sociales = calculate_cumul(simulation, 'assiette_cotisations_sociales', period)
+    plafond_securite_sociale = calculate_cumul(simulation, 'plafond_securite_sociale', period)
+    categorie_salarie = calculate_cumul(simulation, 'categorie_salarie', period)
 
     cotisation = apply_bareme_for_relevant_type_sal(
         bareme_by_type_sal_name = bareme_by_type_sal_name,
@@ -81,6 +208,31 @@ def compute_cotisation(simulation, period, cotisation_type = None, bareme_name =
     return cotisation
 
 
+def compute_cotisations(simulation, period, cotisation_type = None):
+    """Compute every contribution of `cotisation_type` for `period` in one pass.
+
+    The results are kept as long as the monthly values of the assiette, plafond and categorie they were computed from
+    stay in the cache of the simulation (see `DerivedValuesCache`).
+    """
+    cotisation_by_bareme_name = fused_cotisations_cache.get(simulation, (cotisation_type, period))
+    if cotisation_by_bareme_name is None:
+        law = simulation.parameters_at(period.start)
+        if cotisation_type == "employeur":
+            bareme_by_type_sal_name = law.cotsoc.cotisations_employeur
+        elif cotisation_type == "salarie":
+            bareme_by_type_sal_name = law.cotsoc.cotisations_salarie
+
+        cotisation_by_bareme_name = apply_all_baremes_for_relevant_type_sal(
+            bareme_by_type_sal_name = bareme_by_type_sal_name,
+            base = calculate_cumul(simulation, 'assiette_cotisations_sociales', period),
+            plafond_securite_sociale = calculate_cumul(simulation, 'plafond_securite_sociale', period),
+            categorie_salarie = calculate_cumul(simulation, 'categorie_salarie', period),
+            )
+        fused_cotisations_cache.put(simulation, (cotisation_type, period), cotisation_by_bareme_name,
+            BAREME_INPUT_VARIABLES, period)
+    return cotisation_by_bareme_name
+
+
 def compute_cotisation_annuelle(simulation, period, cotisation_type = None, bareme_name = None):
     if period.start.month < 12:
         return 0
@@ -93,7 +245,8 @@ def compute_cotisation_annuelle(simulation, period, cotisation_type = None, bare
             )
 
 
-def compute_cotisation_anticipee(simulation, period, cotisation_type = None, bareme_name = None, variable_name = None):
+def compute_cotisation_anticipee(simulation, period, cotisation_type = None, bareme_name = None, variable_name = None,
+        cotisation_annuelle = None):
     if period.start.month < 12:
         return compute_cotisation(
             simulation,
@@ -103,12 +256,16 @@ def compute_cotisation_anticipee(simulation, period, cotisation_type = None, bar
             )
     if period.start.month == 12:
         assert variable_name is not None
-        cumul = simulation.calculate_add(variable_name, period.start.offset('first-of', 'month').offset(
-            -11, 'month').period('month', 11), max_nb_cycles = 1) # December variable_name depends on variable_name in the past 11 months. We need to explicitely allow this recursion.
+        # December variable_name depends on variable_name in the past 11 months. We need to explicitely allow this
+        # recursion.
+        cumul = calculate_cumul(simulation, variable_name, period.this_year.start.period('month', 11),
+            max_nb_cycles = 1)
 
-        return compute_cotisation(
-            simulation,
-            period.this_year,
-            cotisation_type = cotisation_type,
-            bareme_name = bareme_name,
-            ) - cumul
+        if cotisation_annuelle is None:
+            cotisation_annuelle = compute_cotisation(
+                simulation,
+                period.this_year,
+                cotisation_type = cotisation_type,
+                bareme_name = bareme_name,
+                )
+        return cotisation_annuelle - cumul
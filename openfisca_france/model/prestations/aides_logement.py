@@ -7,7 +7,7 @@ import json
 import logging
 import pkg_resources
 
-from numpy import ceil, fromiter, int16, logical_or as or_, logical_and as and_, take
+from numpy import argsort, array, ceil, int16, logical_or as or_, logical_and as and_, minimum, searchsorted, take
 
 import openfisca_france
 from openfisca_core.periods import Instant
@@ -18,7 +18,9 @@ from openfisca_france.model.caracteristiques_socio_demographiques.logement impor
 
 log = logging.getLogger(__name__)
 
-zone_apl_by_depcom = None
+# Sorted depcom codes (see `depcom_to_int`) and the APL zone of each of them, filled by `preload_zone_apl`.
+zone_apl_depcom_index = None
+zone_apl_by_depcom_index = None
 
 
 class al_nb_personnes_a_charge(Variable):
@@ -828,39 +830,52 @@ class zone_apl(Variable):
         en fonction du depcom (code INSEE)
         '''
         depcom = menage('depcom', period)
-
-        preload_zone_apl()
-        default_value = 2
-        return fromiter(
-            (
-                zone_apl_by_depcom.get(depcom_cell, default_value)
-                for depcom_cell in depcom
-                ),
-            dtype = int16,
-            )
+        return get_zone_apl(depcom)
+
+
+def get_zone_apl(depcom, default_value = 2):
+    preload_zone_apl()
+    depcom_codes = depcom_to_int(depcom)
+    positions = minimum(searchsorted(zone_apl_depcom_index, depcom_codes), len(zone_apl_depcom_index) - 1)
+    return where(
+        zone_apl_depcom_index[positions] == depcom_codes,
+        zone_apl_by_depcom_index[positions],
+        default_value,
+        ).astype(int16)
+
+
+def load_zone_apl_by_depcom():
+    with pkg_resources.resource_stream(
+            openfisca_france.__name__,
+            'assets/apl/20110914_zonage.csv',
+            ) as csv_file:
+        csv_reader = csv.DictReader(csv_file)
+        zone_apl_by_depcom = {
+            # Keep only first char of Zonage column because of 1bis value considered equivalent to 1.
+            row['CODGEO']: int(row['Zonage'][0])
+            for row in csv_reader
+            }
+    # Add subcommunes (arrondissements and communes associées), use the same value as their parent commune.
+    with pkg_resources.resource_stream(
+            openfisca_france.__name__,
+            'assets/apl/commune_depcom_by_subcommune_depcom.json',
+            ) as json_file:
+        commune_depcom_by_subcommune_depcom = json.load(json_file)
+        for subcommune_depcom, commune_depcom in commune_depcom_by_subcommune_depcom.iteritems():
+            zone_apl_by_depcom[subcommune_depcom] = zone_apl_by_depcom[commune_depcom]
+    return zone_apl_by_depcom
 
 
 def preload_zone_apl():
-    global zone_apl_by_depcom
-    if zone_apl_by_depcom is None:
-        with pkg_resources.resource_stream(
-                openfisca_france.__name__,
-                'assets/apl/20110914_zonage.csv',
-                ) as csv_file:
-            csv_reader = csv.DictReader(csv_file)
-            zone_apl_by_depcom = {
-                # Keep only first char of Zonage column because of 1bis value considered equivalent to 1.
-                row['CODGEO']: int(row['Zonage'][0])
-                for row in csv_reader
-                }
-        # Add subcommunes (arrondissements and communes associées), use the same value as their parent commune.
-        with pkg_resources.resource_stream(
-                openfisca_france.__name__,
-                'assets/apl/commune_depcom_by_subcommune_depcom.json',
-                ) as json_file:
-            commune_depcom_by_subcommune_depcom = json.load(json_file)
-            for subcommune_depcom, commune_depcom in commune_depcom_by_subcommune_depcom.iteritems():
-                zone_apl_by_depcom[subcommune_depcom] = zone_apl_by_depcom[commune_depcom]
+    global zone_apl_depcom_index, zone_apl_by_depcom_index
+    if zone_apl_depcom_index is None:
+        zone_apl_by_depcom = load_zone_apl_by_depcom()
+        depcom_codes = depcom_to_int(zone_apl_by_depcom.keys())
+        zones = array(zone_apl_by_depcom.values(), dtype = int16)
+        sorter = argsort(depcom_codes)
+        zone_apl_by_depcom_index = zones[sorter]
+        zone_apl_depcom_index = depcom_codes[sorter]
+
 
 class aides_logement_primo_accedant(Variable):
     value_type = float
@@ -14,12 +14,11 @@ class eligibilite_anah(Variable):
     definition_period = YEAR
 
     def formula(menage, period):
-        # depcom est le code INSEE de la localité, les deux premiers chiffres sont le département
-        # le reste de la division entière par 1000 donne ces deux chiffres sans manipulation de chaînes
-        departement = menage('depcom', period.first_month).astype(int) / 1000
+        # depcom est le code INSEE de la localité, les deux premiers caractères sont le département
+        depcom = menage('depcom', period.first_month)
 
-        departements_idf = [75, 77, 78, 91, 92, 93, 94, 95]
-        in_idf = sum([departement == departement_idf for departement_idf in departements_idf])
+        departements_idf = ['75', '77', '78', '91', '92', '93', '94', '95']
+        in_idf = depcom_startswith(depcom, departements_idf)
 
         rfr_declarants_principaux_du_menage = menage.members.has_role(FoyerFiscal.DECLARANT_PRINCIPAL) * menage.members.foyer_fiscal('rfr', period.n_2)
         rfr = menage.sum(rfr_declarants_principaux_du_menage)
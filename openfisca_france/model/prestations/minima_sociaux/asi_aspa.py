@@ -70,14 +70,18 @@ class asi_aspa_base_ressources_individu(Variable):
             ]
 
         # Revenus du foyer fiscal que l'on projette sur le premier invidividus
-        rev_cap_bar_foyer_fiscal = max_(0, individu.foyer_fiscal('rev_cap_bar', three_previous_months, options = [ADD]))
-        rev_cap_lib_foyer_fiscal = max_(0, individu.foyer_fiscal('rev_cap_lib', three_previous_months, options = [ADD]))
-        retraite_titre_onereux_foyer_fiscal = individu.foyer_fiscal('retraite_titre_onereux', three_previous_months, options = [ADD])
+        rev_cap_bar_foyer_fiscal = max_(0, calculate_window_sum(
+            individu.foyer_fiscal, 'rev_cap_bar', three_previous_months))
+        rev_cap_lib_foyer_fiscal = max_(0, calculate_window_sum(
+            individu.foyer_fiscal, 'rev_cap_lib', three_previous_months))
+        retraite_titre_onereux_foyer_fiscal = calculate_window_sum(
+            individu.foyer_fiscal, 'retraite_titre_onereux', three_previous_months)
         revenus_foyer_fiscal = rev_cap_bar_foyer_fiscal + rev_cap_lib_foyer_fiscal + retraite_titre_onereux_foyer_fiscal
         revenus_foyer_fiscal_individu = revenus_foyer_fiscal * individu.has_role(FoyerFiscal.DECLARANT_PRINCIPAL)
 
         def revenus_tns():
-            revenus_auto_entrepreneur = individu('tns_auto_entrepreneur_benefice', three_previous_months, options = [ADD])
+            revenus_auto_entrepreneur = calculate_window_sum(
+                individu, 'tns_auto_entrepreneur_benefice', three_previous_months)
             # Les revenus TNS hors AE sont estimés en se basant sur le revenu N-1
 
             tns_micro_entreprise_benefice = individu('tns_micro_entreprise_benefice', last_year) * (3 / 12)
@@ -94,12 +98,11 @@ class asi_aspa_base_ressources_individu(Variable):
         asi_eligibilite = individu('asi_eligibilite', period)
 
         # Inclus l'AAH si conjoint non éligible ASPA, retraite et pension invalidité
-        aah = individu('aah', three_previous_months, options = [ADD])
+        aah = calculate_window_sum(individu, 'aah', three_previous_months)
         aah = aah * not_(aspa_eligibilite) * not_(asi_eligibilite) * not_(pension_invalidite)
 
-        pensions_alimentaires_versees = individu(
-            'pensions_alimentaires_versees_individu', three_previous_months, options = [ADD]
-            )
+        pensions_alimentaires_versees = calculate_window_sum(
+            individu, 'pensions_alimentaires_versees_individu', three_previous_months)
 
         def abattement_salaire():
             aspa_couple = individu.famille('aspa_couple', period)
@@ -116,12 +119,12 @@ class asi_aspa_base_ressources_individu(Variable):
                 )
 
             abattement_forfaitaire = abattement_forfaitaire_base * taux_abattement_forfaitaire
-            salaire_de_base = individu('salaire_de_base', three_previous_months, options = [ADD])
+            salaire_de_base = calculate_window_sum(individu, 'salaire_de_base', three_previous_months)
 
             return min_(salaire_de_base, abattement_forfaitaire)
 
         base_ressources_3_mois = sum(
-            max_(0, individu(ressource_type, three_previous_months, options = [ADD]))
+            max_(0, calculate_window_sum(individu, ressource_type, three_previous_months))
             for ressource_type in ressources_incluses
             ) + aah + revenus_foyer_fiscal_individu + revenus_tns() - abs_(pensions_alimentaires_versees) - abattement_salaire()
 
@@ -2,9 +2,7 @@
 
 from __future__ import division
 
-from functools import partial
-
-from numpy import absolute as abs_, apply_along_axis, array, int32, logical_or as or_
+from numpy import absolute as abs_, int32, logical_or as or_
 
 from openfisca_france.model.base import *  # noqa analysis:ignore
 
@@ -138,44 +136,27 @@ class cmu_c_plafond(Variable):
     label = u"Plafond annuel de ressources pour l'éligibilité à la CMU-C"
     definition_period = MONTH
 
-    def formula(self, simulation, period):
-        age_holder = simulation.compute('age', period)
-        alt_holder = simulation.compute('garde_alternee', period)
-        cmu_eligible_majoration_dom = simulation.calculate('cmu_eligible_majoration_dom', period)
-        # cmu_nbp_foyer = simulation.calculate('cmu_nbp_foyer', period)
-        P = simulation.parameters_at(period.start).cmu
-
-        PAC = [PART] + ENFS
+    def formula(famille, period, parameters):
+        age = famille.members('age', period)
+        garde_alternee = famille.members('garde_alternee', period)
+        cmu_eligible_majoration_dom = famille('cmu_eligible_majoration_dom', period)
+        # cmu_nbp_foyer = famille('cmu_nbp_foyer', period)
+        P = parameters(period).cmu
 
         # Calcul du coefficient personnes à charge, avec prise en compte de la garde alternée
 
-        # Tableau des coefficients
-        coefficients_array = array(
-            [P.coeff_p2, P.coeff_p3_p4, P.coeff_p3_p4] + [P.coeff_p5_plus] * (len(PAC) - 3)
+        # Tri des personnes à charge, le conjoint en premier, les enfants par âge décroissant
+        personne_a_charge = not_(famille.members.has_role(Famille.DEMANDEUR)) * (age >= 0)
+        rang = rank_members(
+            famille,
+            famille.members.has_role(Famille.CONJOINT) * 10000 + age * 10 + garde_alternee,
+            condition = personne_a_charge,
+            reverse = True,
             )
 
-        # Tri des personnes à charge, le conjoint en premier, les enfants par âge décroissant
-        age_by_role = self.split_by_roles(age_holder, roles = PAC)
-        alt_by_role = self.split_by_roles(alt_holder, roles = PAC)
-
-        age_and_alt_matrix = array(
-            [
-                (role == PART) * 10000 + age_by_role[role] * 10 + alt_by_role[role] - (age_by_role[role] < 0) * 999999
-                for role in sorted(age_by_role)
-                ]
-            ).transpose()
-
-        # Calcul avec matrices intermédiaires
-        reverse_sorted = partial(sorted, reverse = True)
-
-        sorted_age_and_alt_matrix = apply_along_axis(reverse_sorted, 1, age_and_alt_matrix)
-        # Calcule weighted_alt_matrix, qui vaut 0.5 pour les enfants en garde alternée, 1 sinon.
-        sorted_present_matrix = sorted_age_and_alt_matrix >= 0
-        sorted_alt_matrix = (sorted_age_and_alt_matrix % 10) * sorted_present_matrix
-        weighted_alt_matrix = sorted_present_matrix - sorted_alt_matrix * 0.5
-
-        # Calcul final du coefficient
-        coeff_pac = weighted_alt_matrix.dot(coefficients_array)
+        # Coefficient de chaque personne à charge selon son rang, réduit de moitié pour les enfants en garde alternée
+        coefficient = select([rang == 0, rang <= 2], [P.coeff_p2, P.coeff_p3_p4], P.coeff_p5_plus)
+        coeff_pac = famille.sum(personne_a_charge * (1 - 0.5 * garde_alternee) * coefficient)
 
         return (P.plafond_base *
             (1 + cmu_eligible_majoration_dom * P.majoration_dom) *
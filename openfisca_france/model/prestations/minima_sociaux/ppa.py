@@ -37,7 +37,8 @@ class ppa_eligibilite_etudiants(Variable):
         plancher_ressource = 169 * P.cotsoc.gen.smic_h_b * P.prestations.prestations_familiales.af.seuil_rev_taux
 
         def condition_ressource(period2):
-            revenu_activite = famille.members('ppa_revenu_activite_individu', period2, extra_params = [period])
+            revenu_activite = calculate_with_extra_params(
+                famille.members, 'ppa_revenu_activite_individu', period2, [period])
             return revenu_activite > plancher_ressource
 
         m_1 = period.offset(-1, 'month')
@@ -103,8 +104,8 @@ class ppa_revenu_activite(Variable):
     definition_period = MONTH
 
     def formula(famille, period, parameters, mois_demande):
-        ppa_revenu_activite_i = famille.members(
-            'ppa_revenu_activite_individu', period, extra_params = [mois_demande])
+        ppa_revenu_activite_i = calculate_with_extra_params(
+            famille.members, 'ppa_revenu_activite_individu', period, [mois_demande])
         ppa_revenu_activite = famille.sum(ppa_revenu_activite_i)
 
         return ppa_revenu_activite
@@ -174,10 +175,9 @@ class ppa_ressources_hors_activite(Variable):
     definition_period = MONTH
 
     def formula(famille, period, parameters, mois_demande):
-        pf = famille(
-            'ppa_base_ressources_prestations_familiales', period, extra_params = [mois_demande])
-        ressources_hors_activite_i = famille.members(
-            'ppa_ressources_hors_activite_individu', period, extra_params = [mois_demande])
+        pf = calculate_with_extra_params(famille, 'ppa_base_ressources_prestations_familiales', period, [mois_demande])
+        ressources_hors_activite_i = calculate_with_extra_params(
+            famille.members, 'ppa_ressources_hors_activite_individu', period, [mois_demande])
         ressources = [
             'ass',
             'asi',
@@ -214,8 +214,8 @@ class ppa_ressources_hors_activite_individu(Variable):
 
         ressources_hors_activite_mensuel_i = sum(
             individu(ressource, period) for ressource in ressources)
-        revenus_activites = individu(
-            'ppa_revenu_activite_individu', period, extra_params = [mois_demande])
+        revenus_activites = calculate_with_extra_params(
+            individu, 'ppa_revenu_activite_individu', period, [mois_demande])
 
         # L'aah est pris en compte comme revenu d'activité si  revenu d'activité hors aah > 29 * smic horaire brut
         seuil_aah_activite = P.prestations.minima_sociaux.ppa.seuil_aah_activite * smic_horaire
@@ -263,10 +263,9 @@ class ppa_base_ressources(Variable):
     definition_period = MONTH
 
     def formula(famille, period, parameters, mois_demande):
-        ppa_revenu_activite = famille(
-            'ppa_revenu_activite', period, extra_params = [mois_demande])
-        ppa_ressources_hors_activite = famille(
-            'ppa_ressources_hors_activite', period, extra_params = [mois_demande])
+        ppa_revenu_activite = calculate_with_extra_params(famille, 'ppa_revenu_activite', period, [mois_demande])
+        ppa_ressources_hors_activite = calculate_with_extra_params(
+            famille, 'ppa_ressources_hors_activite', period, [mois_demande])
         return ppa_revenu_activite + ppa_ressources_hors_activite
 
 
@@ -280,8 +279,7 @@ class ppa_bonification(Variable):
         P = parameters(mois_demande)
         smic_horaire = P.cotsoc.gen.smic_h_b
         rsa_base = P.prestations.minima_sociaux.rmi.rmi
-        revenu_activite = individu(
-            'ppa_revenu_activite_individu', period, extra_params = [mois_demande])
+        revenu_activite = calculate_with_extra_params(individu, 'ppa_revenu_activite_individu', period, [mois_demande])
         seuil_1 = P.prestations.minima_sociaux.ppa.bonification.seuil_bonification * smic_horaire
         seuil_2 = P.prestations.minima_sociaux.ppa.bonification.seuil_max_bonification * smic_horaire
         bonification_max = round_(P.prestations.minima_sociaux.ppa.bonification.taux_bonification_max * rsa_base)
@@ -302,16 +300,16 @@ class ppa_fictive(Variable):
         forfait_logement = famille('rsa_forfait_logement', mois_demande)
         ppa_majoree_eligibilite = famille('rsa_majore_eligibilite', mois_demande)
 
-        elig = famille('ppa_eligibilite', period, extra_params = [mois_demande])
+        elig = calculate_with_extra_params(famille, 'ppa_eligibilite', period, [mois_demande])
         pente = parameters(mois_demande).prestations.minima_sociaux.ppa.pente
-        mff_non_majore = famille(
-            'ppa_montant_forfaitaire_familial_non_majore', period, extra_params = [mois_demande])
-        mff_majore = famille(
-            'ppa_montant_forfaitaire_familial_majore', period, extra_params = [mois_demande])
+        mff_non_majore = calculate_with_extra_params(
+            famille, 'ppa_montant_forfaitaire_familial_non_majore', period, [mois_demande])
+        mff_majore = calculate_with_extra_params(
+            famille, 'ppa_montant_forfaitaire_familial_majore', period, [mois_demande])
         montant_forfaitaire_familialise = where(ppa_majoree_eligibilite, mff_majore, mff_non_majore)
-        ppa_base_ressources = famille('ppa_base_ressources', period, extra_params = [mois_demande])
-        ppa_revenu_activite = famille('ppa_revenu_activite', period, extra_params = [mois_demande])
-        bonification_i = famille.members('ppa_bonification', period, extra_params = [mois_demande])
+        ppa_base_ressources = calculate_with_extra_params(famille, 'ppa_base_ressources', period, [mois_demande])
+        ppa_revenu_activite = calculate_with_extra_params(famille, 'ppa_revenu_activite', period, [mois_demande])
+        bonification_i = calculate_with_extra_params(famille.members, 'ppa_bonification', period, [mois_demande])
         bonification = famille.sum(bonification_i)
 
         ppa_montant_base = (
@@ -341,7 +339,7 @@ class ppa(Variable):
         # éligibilité étudiants
 
         ppa_eligibilite_etudiants = famille('ppa_eligibilite_etudiants', period)
-        ppa = famille('ppa_fictive', period.last_3_months, extra_params = [period], options = [ADD]) / 3
+        ppa = calculate_with_extra_params(famille, 'ppa_fictive', period.last_3_months, [period], options = [ADD]) / 3
         ppa = ppa * ppa_eligibilite_etudiants * (ppa >= seuil_non_versement)
 
         return ppa
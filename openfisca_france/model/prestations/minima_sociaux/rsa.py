@@ -16,8 +16,10 @@ class rsa_base_ressources(Variable):
     definition_period = MONTH
 
     def formula_2017_01_01(famille, mois_demande, parameters, mois_courant):
-        rsa_base_ressources_prestations_familiales = famille('rsa_base_ressources_prestations_familiales', mois_demande, extra_params = [mois_courant])
-        rsa_base_ressources_minima_sociaux = famille('rsa_base_ressources_minima_sociaux', mois_demande, extra_params = [mois_courant])
+        rsa_base_ressources_prestations_familiales = calculate_with_extra_params(
+            famille, 'rsa_base_ressources_prestations_familiales', mois_demande, [mois_courant])
+        rsa_base_ressources_minima_sociaux = calculate_with_extra_params(
+            famille, 'rsa_base_ressources_minima_sociaux', mois_demande, [mois_courant])
 
         enfant_i = famille.members('est_enfant_dans_famille', mois_courant)
         rsa_enfant_a_charge_i = famille.members('rsa_enfant_a_charge', mois_courant)
@@ -26,7 +28,7 @@ class rsa_base_ressources(Variable):
 
         ressources_individuelles_i = (
             famille.members('rsa_base_ressources_individu', mois_demande) +
-            famille.members('rsa_revenu_activite_individu', mois_demande, extra_params = [mois_courant])
+            calculate_with_extra_params(famille.members, 'rsa_revenu_activite_individu', mois_demande, [mois_courant])
             )
 
         ressources_individuelles = famille.sum(
@@ -102,7 +104,7 @@ class rsa_base_ressources_individu(Variable):
 
         # Les revenus pros interrompus au mois M sont neutralisés s'il n'y a pas de revenus de substitution.
         revenus_pro = sum(
-            individu(type_revenu, period.last_3_months, options = [ADD]) * not_(
+            calculate_window_sum(individu, type_revenu, period.last_3_months) * not_(
                 (individu(type_revenu, period) == 0) *
                 (individu(type_revenu, period.last_month) > 0) *
                 not_(has_ressources_substitution)
@@ -128,7 +130,7 @@ class rsa_base_ressources_individu(Variable):
         # sans condition de revenu de substitution.
         neutral_max_forfaitaire = 3 * parameters(period).prestations.minima_sociaux.rmi.rmi
         revenus_non_pros = sum(
-            max_(0, individu(type_revenu, period.last_3_months, options = [ADD]) - neutral_max_forfaitaire * (
+            max_(0, calculate_window_sum(individu, type_revenu, period.last_3_months) - neutral_max_forfaitaire * (
                 (individu(type_revenu, period) == 0) *
                 (individu(type_revenu, period.last_month) > 0)
                 ))
@@ -136,9 +138,10 @@ class rsa_base_ressources_individu(Variable):
             )
 
         # Revenus du foyer fiscal que l'on projette sur le premier invidividus
-        rev_cap_bar = max_(0, individu.foyer_fiscal('rev_cap_bar', period.last_3_months, options = [ADD]))
-        rev_cap_lib = max_(0, individu.foyer_fiscal('rev_cap_lib', period.last_3_months, options = [ADD]))
-        retraite_titre_onereux = individu.foyer_fiscal('retraite_titre_onereux', period.last_3_months, options = [ADD])
+        rev_cap_bar = max_(0, calculate_window_sum(individu.foyer_fiscal, 'rev_cap_bar', period.last_3_months))
+        rev_cap_lib = max_(0, calculate_window_sum(individu.foyer_fiscal, 'rev_cap_lib', period.last_3_months))
+        retraite_titre_onereux = calculate_window_sum(
+            individu.foyer_fiscal, 'retraite_titre_onereux', period.last_3_months)
         revenus_foyer_fiscal = rev_cap_bar + rev_cap_lib + retraite_titre_onereux
         revenus_foyer_fiscal_projetes = revenus_foyer_fiscal * individu.has_role(FoyerFiscal.DECLARANT_PRINCIPAL)
 
@@ -167,8 +170,8 @@ class rsa_base_ressources_minima_sociaux(Variable):
         aspa = famille('aspa', period)
         asi = famille('asi', period)
         ass = famille('ass', period)
-        aah_i = famille.members('aah', three_previous_months, options = [ADD])
-        caah_i = famille.members('caah', three_previous_months, options = [ADD])
+        aah_i = calculate_window_sum(famille.members, 'aah', three_previous_months)
+        caah_i = calculate_window_sum(famille.members, 'caah', three_previous_months)
 
         return aspa + asi + ass + famille.sum(aah_i + caah_i)
 
@@ -222,7 +225,7 @@ class rsa_base_ressources_prestations_familiales(Variable):
         result = sum(famille(prestation, period) for prestation in prestations_calculees)
 
         result += sum(
-            famille(prestation, period.last_3_months, options = [ADD]) / 3 for prestation in prestations_autres)
+            calculate_window_sum(famille, prestation, period.last_3_months) / 3 for prestation in prestations_autres)
 
         cf_non_majore_avant_cumul = famille('cf_non_majore_avant_cumul', period)
         cf = famille('cf', period)
@@ -334,9 +337,9 @@ class rsa_enfant_a_charge(Variable):
             m_3 = m_2.last_month
             ressources = (
                 individu('rsa_base_ressources_individu', period) +
-                individu('rsa_revenu_activite_individu', period, extra_params = [m_1]) / 3 +
-                individu('rsa_revenu_activite_individu', period, extra_params = [m_2]) / 3 +
-                individu('rsa_revenu_activite_individu', period, extra_params = [m_3]) / 3
+                calculate_with_extra_params(individu, 'rsa_revenu_activite_individu', period, [m_1]) / 3 +
+                calculate_with_extra_params(individu, 'rsa_revenu_activite_individu', period, [m_2]) / 3 +
+                calculate_with_extra_params(individu, 'rsa_revenu_activite_individu', period, [m_3]) / 3
                 )
         else:
             ressources = (
@@ -511,7 +514,7 @@ class rsa_revenu_activite_individu(Variable):
         # Les revenus pros interrompus au mois M sont neutralisés s'il n'y a pas de revenus de substitution.
 
         revenus_moyennes = sum(
-            individu(type_revenu, last_3_months, options = [ADD]) * not_(
+            calculate_window_sum(individu, type_revenu, last_3_months) * not_(
                 (individu(type_revenu, mois_demande) == 0) *
                 (individu(type_revenu, mois_demande.last_month) > 0) *
                 not_(has_ressources_substitution)
@@ -551,7 +554,7 @@ class rsa_revenu_activite_individu(Variable):
 
         # Les revenus pros interrompus au mois M sont neutralisés s'il n'y a pas de revenus de substitution.
         return sum(
-            individu(type_revenu, last_3_months, options = [ADD]) * not_(
+            calculate_window_sum(individu, type_revenu, last_3_months) * not_(
                 (individu(type_revenu, period.first_month) == 0) *
                 (individu(type_revenu, period.last_month) > 0) *
                 not_(has_ressources_substitution)
@@ -572,7 +575,7 @@ class rsa_fictif(Variable):
         rsa_socle = max_(rsa_socle_non_majore, rsa_socle_majore)
 
         rsa_forfait_logement = famille('rsa_forfait_logement', mois_demande)
-        rsa_base_ressources = famille('rsa_base_ressources', mois_demande, extra_params = [mois_courant])
+        rsa_base_ressources = calculate_with_extra_params(famille, 'rsa_base_ressources', mois_demande, [mois_courant])
 
         montant = rsa_socle - rsa_forfait_logement - rsa_base_ressources
         montant = max_(montant, 0)
@@ -590,7 +593,7 @@ class rsa_montant(Variable):
     def formula_2017_01_01(famille, period, parameters):
         seuil_non_versement = parameters(period).prestations.minima_sociaux.rsa.rsa_nv
 
-        rsa = famille('rsa_fictif', period.last_3_months, extra_params = [period], options = [ADD]) / 3
+        rsa = calculate_with_extra_params(famille, 'rsa_fictif', period.last_3_months, [period], options = [ADD]) / 3
         rsa = rsa * (rsa >= seuil_non_versement)
 
         return rsa
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from functools import partial
-from numpy import busday_count as original_busday_count, datetime64, timedelta64
+from numpy import datetime64, timedelta64
 from openfisca_france.model.base import *  # noqa analysis:ignore
 
 
@@ -646,14 +645,14 @@ class nombre_jours_calendaires(Variable):
         contrat_de_travail_debut = simulation.calculate('contrat_de_travail_debut', period)
         contrat_de_travail_fin = simulation.calculate('contrat_de_travail_fin', period)
 
-        busday_count = partial(original_busday_count, weekmask = "1" * 7)
         debut_mois = datetime64(period.start.offset('first-of', 'month'))
         fin_mois = datetime64(period.start.offset('last-of', 'month'))
+        # Tous les jours sont comptés : pas besoin de calendrier de jours ouvrés.
         jours_travailles = max_(
-            busday_count(
-                max_(contrat_de_travail_debut, debut_mois),
-                min_(contrat_de_travail_fin, fin_mois) + timedelta64(1, 'D')
-                ),
+            (
+                min_(contrat_de_travail_fin, fin_mois) + timedelta64(1, 'D') -
+                max_(contrat_de_travail_debut, debut_mois)
+                ).astype('timedelta64[D]').astype(int),
             0,
             )
 
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""Binary snapshot of the preprocessed legislation parameters.
+
+Parsing the YAML parameter files and preprocessing the `cotsoc` subtrees takes most of the time spent in
+`FranceTaxBenefitSystem()`. `build_parameters_snapshot` serializes the resulting `ParameterNode` to a single compressed
+pickle that `load_parameters_snapshot` reads back, as long as it is newer than every file it was built from.
+"""
+
+import cPickle
+import logging
+import os
+import zlib
+
+import pkg_resources
+
+
+log = logging.getLogger(__name__)
+
+# Bump this number whenever the layout of the snapshot changes.
+SNAPSHOT_FORMAT = 1
+
+
+def get_core_version():
+    try:
+        return pkg_resources.get_distribution('OpenFisca-Core').version
+    except pkg_resources.DistributionNotFound:
+        return None
+
+
+def get_sources_mtime(parameters_dir, extra_source_files = ()):
+    """Return the most recent modification time of the files the parameters are built from."""
+    mtime = os.path.getmtime(parameters_dir)
+    for directory, sub_directories, file_names in os.walk(parameters_dir):
+        mtime = max(mtime, os.path.getmtime(directory))
+        for file_name in file_names:
+            mtime = max(mtime, os.path.getmtime(os.path.join(directory, file_name)))
+    for file_path in extra_source_files:
+        if os.path.exists(file_path):
+            mtime = max(mtime, os.path.getmtime(file_path))
+    return mtime
+
+
+def is_snapshot_fresh(snapshot_path, parameters_dir, extra_source_files = ()):
+    if snapshot_path is None or not os.path.exists(snapshot_path):
+        return False
+    return os.path.getmtime(snapshot_path) > get_sources_mtime(parameters_dir, extra_source_files)
+
+
+def build_parameters_snapshot(parameters, snapshot_path):
+    """Write the (already preprocessed) `parameters` tree to `snapshot_path`."""
+    payload = cPickle.dumps(
+        dict(
+            core_version = get_core_version(),
+            format = SNAPSHOT_FORMAT,
+            parameters = parameters,
+            ),
+        cPickle.HIGHEST_PROTOCOL,
+        )
+    temporary_path = snapshot_path + '.tmp'
+    with open(temporary_path, 'wb') as snapshot_file:
+        snapshot_file.write(zlib.compress(payload))
+    # Rename atomically so that concurrent workers never read a partially written snapshot.
+    os.rename(temporary_path, snapshot_path)
+
+
+def load_parameters_snapshot(snapshot_path, parameters_dir, extra_source_files = ()):
+    """Return the parameters stored in `snapshot_path`, or None when the snapshot is missing, stale or unreadable."""
+    if not is_snapshot_fresh(snapshot_path, parameters_dir, extra_source_files):
+        return None
+    try:
+        with open(snapshot_path, 'rb') as snapshot_file:
+            snapshot = cPickle.loads(zlib.decompress(snapshot_file.read()))
+    except Exception:
+        log.warning(u'Ignoring unreadable parameters snapshot {}'.format(snapshot_path), exc_info = True)
+        return None
+    if snapshot.get('format') != SNAPSHOT_FORMAT or snapshot.get('core_version') != get_core_version():
+        log.info(u'Ignoring parameters snapshot {} built by another version'.format(snapshot_path))
+        return None
+    return snapshot['parameters']
@@ -3,7 +3,7 @@
 from __future__ import division
 
 from openfisca_core.reforms import Reform
-from numpy import vectorize, logical_or as or_, absolute as abs_
+from numpy import logical_or as or_, absolute as abs_
 
 from ..model.base import *
 
@@ -11,32 +11,26 @@ from ..model.base import *
 class perte_autonomie(Variable):
     value_type = bool
     entity = Individu
+    definition_period = MONTH
     label = u"Personne en perte d'autonomie"
 
 class resident_93(Variable):
     value_type = bool
     label = u"Résident en Seine-Saint-Denis"
     entity = Menage
+    definition_period = MONTH
 
     def formula(self, simulation, period):
         period = period.first_month
         depcom = simulation.calculate('depcom', period)
 
-        def is_resident_93(code_insee):
-            prefix = code_insee[0:2]
-            result = (prefix == "93")
-            return result
-
-        is_resident_93_vec = vectorize(is_resident_93)
-
-        result = is_resident_93_vec(depcom)
-
-        return result
+        return depcom_startswith(depcom, '93')
 
 class adpa_eligibilite(Variable):
     value_type = bool
     label = u"Eligibilité à l'ADPA"
     entity = Individu
+    definition_period = MONTH
 
     def formula(self, simulation, period):
         period = period.first_month
@@ -52,6 +46,7 @@ class adpa_base_ressources_i(Variable):
     value_type = float
     label = u"Base ressources ADPA pour un individu"
     entity = Individu
+    definition_period = MONTH
 
     def formula(self, simulation, period):
         period = period.first_month
@@ -78,6 +73,7 @@ class adpa_base_ressources(Variable):
     value_type = float
     label = u"Base ressources ADPA pour une famille"
     entity = Famille
+    definition_period = MONTH
 
     def formula(self, simulation, period):
         period = period.first_month
@@ -90,6 +86,7 @@ class adpa(Variable):
     value_type = float
     label = u"ADPA"
     entity = Famille
+    definition_period = MONTH
 
     def formula(self, simulation, period):
         period = period.first_month
@@ -2,34 +2,84 @@
 
 from __future__ import division
 
-from openfisca_core import columns
+import weakref
+
+from numpy import arange, concatenate, interp, maximum, sort, unique
+
 from openfisca_core.reforms import Reform
-from scipy.optimize import fsolve
 
 from .. import entities
+from ..inversion import calculate_inverse
 from ..model.base import *
+from ..model.prelevements_obligatoires.prelevements_sociaux.cotisations_sociales.base import \
+    get_rows_by_categorie_salarie
+
+
+# Salaries tabulated by get_salaire_net_a_payer_table, by tax and benefit system and then by (type_sal_name, period).
+salaire_net_a_payer_table_by_key_by_tax_benefit_system = weakref.WeakKeyDictionary()
+# Only the private sector salaries are made of piecewise linear contributions.
+TYPE_SAL_NAMES_WITH_TABLE = ('prive_non_cadre', 'prive_cadre')
+
+
+def get_salaire_net_a_payer_table(tax_benefit_system, type_sal_name, period):
+    """Return gross salaries and the matching net salaries of an employee of `type_sal_name` with default inputs.
+
+    The net salary is piecewise linear with respect to the gross salary, with breakpoints at the thresholds of the
+    employee contribution scales and of the CSG abattement. The gross salaries are these breakpoints, completed by
+    points every eighth of the plafond de la sécurité sociale.
+    """
+    table_by_key = salaire_net_a_payer_table_by_key_by_tax_benefit_system.setdefault(tax_benefit_system, {})
+    key = (type_sal_name, period)
+    table = table_by_key.get(key)
+    if table is not None:
+        return table
+
+    parameters = tax_benefit_system.get_parameters_at_instant(period.start)
+    thresholds = list(parameters.prelevements_sociaux.contributions.csg.activite.deductible.abattement.thresholds)
+    for bareme in parameters.cotsoc.cotisations_salarie[type_sal_name]._children.itervalues():
+        thresholds.extend(bareme.thresholds)
+    thresholds = unique(concatenate([thresholds, arange(0, max(thresholds) + 1.125, .125)]))
+
+    # Some contributions have a minimal amount, and thus breakpoints in euros: the table starts at a small positive
+    # salary instead of 0, and includes the salaire charnière of the GMP of the cadres.
+    salaires = [1]
+    if type_sal_name == 'prive_cadre':
+        salaires.append(parameters.prelevements_sociaux.gmp.salaire_charniere_annuel / 12)
+
+    simulation = tax_benefit_system.new_scenario().init_single_entity(
+        axes = [dict(count = len(salaires) + len(thresholds) - 1, name = 'salaire_de_base', min = 0, max = 1)],
+        parent1 = dict(categorie_salarie = type_sal_name),
+        period = period,
+        ).new_simulation()
+    # The thresholds apply to the plafond de la sécurité sociale prorated over the days of the month.
+    plafond_securite_sociale = simulation.calculate('plafond_securite_sociale', period)[0]
+    salaire_de_base = sort(concatenate([salaires, thresholds[1:] * plafond_securite_sociale]))
+    simulation.individu.get_holder('salaire_de_base').put_in_cache(salaire_de_base, period)
+    # Guard against small decreases due to rounding, so that the table can be inverted.
+    salaire_net_a_payer = maximum.accumulate(simulation.calculate('salaire_net_a_payer', period).astype(float))
+
+    table = table_by_key[key] = (salaire_de_base, salaire_net_a_payer)
+    return table
+
+
+def calculate_salaire_de_base_from_table(salaire_de_base_table, salaire_net_a_payer_table, salaire_net_a_payer):
+    """Invert the piecewise linear net salary, extrapolating the last segment beyond the table."""
+    last_slope = (
+        (salaire_de_base_table[-1] - salaire_de_base_table[-2]) /
+        (salaire_net_a_payer_table[-1] - salaire_net_a_payer_table[-2])
+        )
+    return select(
+        [
+            salaire_net_a_payer <= 0,
+            salaire_net_a_payer > salaire_net_a_payer_table[-1],
+            ],
+        [
+            0,
+            salaire_de_base_table[-1] + (salaire_net_a_payer - salaire_net_a_payer_table[-1]) * last_slope,
+            ],
+        interp(salaire_net_a_payer, salaire_net_a_payer_table, salaire_de_base_table),
+        )
 
-def calculate_net_from(salaire_de_base, simulation, period, requested_variable_names):
-
-    # We're not wanting to calculate salaire_de_base again, but instead manually set it as an input variable
-    # To avoid possible conflicts, remove its function
-    simulation.individu.get_holder('salaire_de_base').formula.function = None
-    simulation.individu.get_holder('salaire_de_base').array = salaire_de_base
-
-    # Work in isolation
-    temp_simulation = simulation.clone()
-
-    # Calculated variable holders might contain undesired cache
-    # (their entity.simulation points to the original simulation above)
-    for name in requested_variable_names:
-        temp_simulation.individu.get_holder[name].delete_arrays()
-
-    # Force recomputing of salaire_net
-    temp_simulation.individu.get_holder('salaire_net_a_payer').delete_arrays()
-
-    net = temp_simulation.calculate('salaire_net_a_payer', period)[0]
-
-    return net
 
 class salaire_de_base(Variable):
     value_type = float
@@ -46,32 +96,29 @@ class salaire_de_base(Variable):
         if net is None:
             return self.zeros()
 
-        simulation = self.holder.entity.simulation
-
-        # List of variables already calculated. We will need it to remove their holders,
-        # that might contain undesired cache
-        requested_variable_names = simulation.requested_periods_by_variable_name.keys()
-        if requested_variable_names:
-            requested_variable_names.remove(u'salaire_de_base')
-        # Clean 'requested_periods_by_variable_name', that is used by -core to check for computation cycles.
-        # This variable, salaire_de_base, might have been called from variable X,
-        # that will be calculated again in our iterations to compute the salaire_net requested
-        # as an input variable, hence producing a cycle error
-        simulation.requested_periods_by_variable_name = dict()
-
-        def solve_func(net):
-            def innerfunc(essai):
-                return calculate_net_from(essai, simulation, period, requested_variable_names) - net
-            return innerfunc
-
-        brut_calcule = \
-            fsolve(
-                solve_func(net),
-                net*1.5,  # on entend souvent parler cette méthode...
-                xtol = 1/10  # précision
-                )
-
-        return brut_calcule
+        # Inverse exactement le salaire net, linéaire par morceaux, des salariés du privé à temps plein. L'inversion
+        # numérique ne corrige que les salariés pour lesquels cette inversion ne suffit pas.
+        initial_guess = net.astype(float) * 1.5  # on entend souvent parler cette méthode...
+        categorie_salarie = simulation.calculate('categorie_salarie', period)
+        for type_sal_name, rows in get_rows_by_categorie_salarie(categorie_salarie):
+            if type_sal_name in TYPE_SAL_NAMES_WITH_TABLE and len(rows) > 0:
+                salaire_de_base_table, salaire_net_a_payer_table = get_salaire_net_a_payer_table(
+                    simulation.tax_benefit_system, type_sal_name, period)
+                initial_guess[rows] = calculate_salaire_de_base_from_table(
+                    salaire_de_base_table, salaire_net_a_payer_table, net[rows])
+
+        return calculate_inverse(
+            simulation,
+            'salaire_de_base',
+            'salaire_net_a_payer',
+            net,
+            period,
+            initial_guess = initial_guess,
+            # Chaque cotisation étant arrondie au centime, le salaire net n'est pas plus précis que quelques centimes.
+            tolerance = 0.05,
+            xtol = 1 / 10,  # précision
+            )
+
 
 class de_net_a_brut(Reform):
     name = u'Inversion du calcul brut -> net'
@@ -7,19 +7,10 @@ from openfisca_core import columns, reforms
 from openfisca_core.columns import MONTH, YEAR
 
 from .. import entities
-
-
-def brut_to_target(target_name = None, period = None, simulation = None, **input_array_by_name):
-    simulation = simulation.clone(debug = simulation.debug, debug_all = simulation.debug_all, trace = simulation.trace)
-    simulation.get_or_new_holder(target_name).delete_arrays()
-    for variable_name, array in input_array_by_name.iteritems():
-        simulation.get_or_new_holder(variable_name).put_in_cache(array, period)
-    return simulation.calculate_add(target_name)
+from ..inversion import calculate_inverse
 
 
 def build_reform(tax_benefit_system):
-    from scipy.optimize import fsolve
-
     Reform = reforms.make_reform(
         key = 'inversion_revenus',
         name = u'Inversion des revenus',
@@ -65,37 +56,23 @@ def build_reform(tax_benefit_system):
                 if salaire_net is not None:
                     # Calcule le salaire brut à partir du salaire net par inversion numérique.
                     if (salaire_net == 0).all():
-                        # Quick path to avoid fsolve when using default value of input variables.
+                        # Quick path to avoid the inversion when using default value of input variables.
                         return salaire_net
                     simulation = self.holder.entity.simulation
 
-                    def solve_function(salaire_de_base):
-                        return brut_to_target(
-                            target_name = 'salaire_net',
-                            period = period,
-                            salaire_de_base = salaire_de_base,
-                            simulation = simulation,
-                            ) - salaire_net
-                    return fsolve(solve_function, salaire_net)
+                    return calculate_inverse(simulation, 'salaire_de_base', 'salaire_net', salaire_net, period)
 
                 salaire_imposable_pour_inversion = simulation.calculate_divide('salaire_imposable_pour_inversion',
                     period)
 
             # Calcule le salaire brut à partir du salaire imposable par inversion numérique.
             if (salaire_imposable_pour_inversion == 0).all():
-                # Quick path to avoid fsolve when using default value of input variables.
+                # Quick path to avoid the inversion when using default value of input variables.
                 return salaire_imposable_pour_inversion
             simulation = self.holder.entity.simulation
 
-            def solve_function(salaire_de_base):
-                return brut_to_target(
-                    target_name = 'salaire_imposable',
-                    period = period,
-                    salaire_de_base = salaire_de_base,
-                    simulation = simulation,
-                    ) - salaire_imposable_pour_inversion
-
-            return fsolve(solve_function, salaire_imposable_pour_inversion)
+            return calculate_inverse(
+                simulation, 'salaire_de_base', 'salaire_imposable', salaire_imposable_pour_inversion, period)
 
     #       TODO: inclure un taux de prime et calculer les primes en même temps que salaire_de_base
 
@@ -192,18 +169,11 @@ def build_reform(tax_benefit_system):
                 if chomage_net is not None:
                     # Calcule les allocations chomage brutes à partir des allocations nettes par inversion numérique.
                     if (chomage_net == 0).all():
-                        # Quick path to avoid fsolve when using default value of input variables.
+                        # Quick path to avoid the inversion when using default value of input variables.
                         return chomage_net
                     simulation = self.holder.entity.simulation
 
-                    def solve_function(chomage_brut):
-                        return brut_to_target(
-                            chomage_brut = chomage_brut,
-                            target_name = 'chomage_net',
-                            period = period,
-                            simulation = simulation,
-                            ) - chomage_net
-                    return fsolve(solve_function, chomage_net)
+                    return calculate_inverse(simulation, 'chomage_brut', 'chomage_net', chomage_net, period)
 
                 chomage_imposable_pour_inversion = simulation.calculate_divide(
                     'chomage_imposable_pour_inversion', period)
@@ -211,19 +181,12 @@ def build_reform(tax_benefit_system):
             # Calcule les allocations chômage brutes à partir des allocations imposables.
             # taux_csg_remplacement = simulation.calculate('taux_csg_remplacement', period)
             if (chomage_imposable_pour_inversion == 0).all():
-                # Quick path to avoid fsolve when using default value of input variables.
+                # Quick path to avoid the inversion when using default value of input variables.
                 return chomage_imposable_pour_inversion
             simulation = self.holder.entity.simulation
 
-            def solve_function(chomage_brut):
-                return brut_to_target(
-                    chomage_brut = chomage_brut,
-                    # taux_csg_remplacement = taux_csg_remplacement,
-                    target_name = 'chomage_imposable',
-                    period = period,
-                    simulation = simulation,
-                    ) - chomage_imposable_pour_inversion
-            return fsolve(solve_function, chomage_imposable_pour_inversion)
+            return calculate_inverse(
+                simulation, 'chomage_brut', 'chomage_imposable', chomage_imposable_pour_inversion, period)
 
     class retraite_brute(Reform.Variable):
         value_type = float
@@ -243,37 +206,24 @@ def build_reform(tax_benefit_system):
                 if retraite_nette is not None:
                     # Calcule les pensions de retraite brutes à partir des pensions nettes par inversion numérique.
                     if (retraite_nette == 0).all():
-                        # Quick path to avoid fsolve when using default value of input variables.
+                        # Quick path to avoid the inversion when using default value of input variables.
                         return retraite_nette
                     simulation = self.holder.entity.simulation
 
-                    def solve_function(retraite_brute):
-                        return brut_to_target(
-                            target_name = 'retraite_nette',
-                            period = period,
-                            retraite_brute = retraite_brute,
-                            simulation = simulation,
-                            ) - retraite_nette
-                    return fsolve(solve_function, retraite_nette)
+                    return calculate_inverse(simulation, 'retraite_brute', 'retraite_nette', retraite_nette, period)
 
                 retraite_imposable_pour_inversion = simulation.calculate_divide(
                     'retraite_imposable_pour_inversion', period)
 
             # Calcule les pensions de retraite brutes à partir des pensions imposables.
-            taux_csg_remplacement = simulation.calculate('taux_csg_remplacement', period)
+            # Calculé avant l'inversion, pour rester fixe quand retraite_brute varie.
+            simulation.calculate('taux_csg_remplacement', period)
             if (retraite_imposable_pour_inversion == 0).all():
-                # Quick path to avoid fsolve when using default value of input variables.
+                # Quick path to avoid the inversion when using default value of input variables.
                 return retraite_imposable_pour_inversion
             simulation = self.holder.entity.simulation
 
-            def solve_function(retraite_brute):
-                return brut_to_target(
-                    retraite_brute = retraite_brute,
-                    taux_csg_remplacement = taux_csg_remplacement,
-                    target_name = 'retraite_imposable',
-                    period = period,
-                    simulation = simulation,
-                    ) - retraite_imposable_pour_inversion
-            return fsolve(solve_function, retraite_imposable_pour_inversion)
+            return calculate_inverse(
+                simulation, 'retraite_brute', 'retraite_imposable', retraite_imposable_pour_inversion, period)
 
     return Reform()
@@ -13,22 +13,46 @@ for year in range(1990, 2020):
     holidays += France().get_calendar_holidays(year)
 
 
-header = """#! /usr/bin/env python
+header = '''#! /usr/bin/env python
 # -*- coding: utf-8 -*-
 
-from datetime import datetime
+"""French holidays, generated by `openfisca_france/scripts/holidays_generator.py`."""
 
+import numpy as np
 
-holidays = ["""
 
-footer = """
-    ]
-"""
+# Sorted holidays, as days.
+holidays = np.array(sorted(['''
+
+footer = '''
+    ]), dtype = 'datetime64[D]')
+
+# Working days (Monday to Friday) but holidays, built once for all the calls of numpy.busday_count.
+holidays_calendar = np.busdaycalendar(weekmask = '1111100', holidays = holidays)
+
+# Number of working days of each month of the years of the holidays, from the first one.
+first_month = holidays[0].astype('datetime64[Y]').astype('datetime64[M]')
+last_month = holidays[-1].astype('datetime64[Y]').astype('datetime64[M]') + 11
+working_days_count_by_month = np.busday_count(
+    np.arange(first_month, last_month + 1).astype('datetime64[D]'),
+    np.arange(first_month + 1, last_month + 2).astype('datetime64[D]'),
+    busdaycal = holidays_calendar,
+    )
+
+
+def count_month_working_days(day):
+    """Return the number of working days of the month of `day`, a numpy.datetime64."""
+    month = np.datetime64(day, 'M')
+    if first_month <= month <= last_month:
+        return working_days_count_by_month[(month - first_month).astype(int)]
+    return np.busday_count(month.astype('datetime64[D]'), (month + 1).astype('datetime64[D]'),
+        busdaycal = holidays_calendar)
+'''
 
 with open("../assets/holidays.py", "w") as text_file:
     text_file.write(header)
     for holiday_date, holiday_name in OrderedDict(holidays).iteritems():
         text_file.write("""
-    datetime.strptime("{}", "%Y-%m-%d").date(), # {}""".format(holiday_date, holiday_name))
+    "{}",  # {}""".format(holiday_date, holiday_name))
 
     text_file.write(footer)
@@ -0,0 +1,71 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+
+"""
+Construit l'instantané binaire des paramètres de la législation.
+
+Les paramètres YAML sont chargés et prétraités une fois, puis sérialisés dans un fichier unique que
+`FranceTaxBenefitSystem` relit au démarrage tant qu'il est plus récent que les fichiers sources.
+
+Avec l'option --benchmark, mesure le temps de démarrage à froid de `FranceTaxBenefitSystem()` avec et sans instantané.
+"""
+
+
+import argparse
+import subprocess
+import sys
+import time
+
+from openfisca_france import parameters_snapshot
+from openfisca_france.france_taxbenefitsystem import FranceTaxBenefitSystem, PARAMETERS_SNAPSHOT_PATH
+
+
+COLD_START_SCRIPT = u"""\
+import time
+start_time = time.time()
+from openfisca_france.france_taxbenefitsystem import FranceTaxBenefitSystem
+FranceTaxBenefitSystem.parameters_snapshot_path = {snapshot_path!r}
+FranceTaxBenefitSystem()
+print(time.time() - start_time)
+"""
+
+
+def build(snapshot_path):
+    start_time = time.time()
+    FranceTaxBenefitSystem.parameters_snapshot_path = None
+    tax_benefit_system = FranceTaxBenefitSystem()
+    parameters_snapshot.build_parameters_snapshot(tax_benefit_system.parameters, snapshot_path)
+    print(u'Parameters snapshot written to {} in {:.2f} s'.format(snapshot_path, time.time() - start_time))
+
+
+def measure_cold_start(snapshot_path, runs):
+    """Start a new interpreter for each run, so that nothing is shared between runs."""
+    durations = [
+        float(subprocess.check_output([sys.executable, '-c', COLD_START_SCRIPT.format(snapshot_path = snapshot_path)]))
+        for _ in range(runs)
+        ]
+    return min(durations), sum(durations) / len(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-o', '--output', default = PARAMETERS_SNAPSHOT_PATH,
+        help = "path of the snapshot to write (default: %(default)s)")
+    parser.add_argument('-b', '--benchmark', action = 'store_true', default = False,
+        help = "measure the cold start time of FranceTaxBenefitSystem with and without snapshot")
+    parser.add_argument('-r', '--runs', default = 5, type = int, help = "number of cold starts per benchmark")
+    args = parser.parse_args()
+
+    build(args.output)
+
+    if args.benchmark:
+        for label, snapshot_path in ((u'YAML', None), (u'snapshot', args.output)):
+            best, mean = measure_cold_start(snapshot_path, args.runs)
+            print(u'Cold start with {}: best {:.3f} s, mean {:.3f} s over {} runs'.format(label, best, mean, args.runs))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
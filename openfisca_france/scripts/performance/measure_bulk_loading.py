@@ -0,0 +1,136 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Measure the loading of a population from columnar tables, compared with the loading of a test case.
+
+A synthetic population of ménages (1 or 2 adults and 0 to 3 children, each ménage being a single famille and a single
+foyer fiscal) is written to `.npz` archives and CSV files, read back and loaded in a simulation. The test case of the
+same population is only loaded for small populations, and the salaire_net of both simulations are compared.
+"""
+
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.microsimulation import new_simulation_from_tables, read_tables, write_tables
+
+
+def build_tables(menages_count, seed = 0):
+    random = np.random.RandomState(seed)
+    adults_count = random.randint(1, 3, size = menages_count)
+    children_count = random.randint(0, 4, size = menages_count)
+    members_count = adults_count + children_count
+    menage_id = np.repeat(np.arange(menages_count, dtype = np.int32), members_count)
+    count = len(menage_id)
+    # Position of each person in its ménage: the adults come first.
+    position = np.arange(len(menage_id)) - np.repeat(np.cumsum(members_count) - members_count, members_count)
+    is_adult = position < np.repeat(adults_count, members_count)
+    role = np.where(is_adult, position, 2)
+    individus = dict(
+        famille_id = menage_id,
+        famille_role = role,
+        foyer_fiscal_id = menage_id,
+        foyer_fiscal_role = role,
+        menage_id = menage_id,
+        menage_role = role,
+        age = np.where(is_adult, random.randint(20, 70, size = count), random.randint(0, 18, size = count)),
+        salaire_de_base = np.where(is_adult, np.round(random.uniform(0, 4000, size = count)), 0),
+        )
+    menages = dict(
+        loyer = np.round(random.uniform(0, 1000, size = menages_count)),
+        statut_occupation_logement = np.full(menages_count, 4, dtype = np.int16),
+        )
+    return dict(individus = individus, menages = menages)
+
+
+def build_test_case(tables):
+    individus = tables['individus']
+    count = len(individus['menage_id'])
+    menages_count = len(tables['menages']['loyer'])
+    test_case = dict(
+        individus = [
+            dict(id = 'i{}'.format(index), age = int(individus['age'][index]),
+                salaire_de_base = float(individus['salaire_de_base'][index]))
+            for index in range(count)
+            ],
+        familles = [dict(id = 'f{}'.format(index), parents = [], enfants = []) for index in range(menages_count)],
+        foyers_fiscaux = [
+            dict(id = 'ff{}'.format(index), declarants = [], personnes_a_charge = [])
+            for index in range(menages_count)
+            ],
+        menages = [
+            dict(id = 'm{}'.format(index), loyer = float(tables['menages']['loyer'][index]),
+                statut_occupation_logement = int(tables['menages']['statut_occupation_logement'][index]),
+                personne_de_reference = None, conjoint = None, enfants = [])
+            for index in range(menages_count)
+            ],
+        )
+    for index in range(count):
+        menage_index = individus['menage_id'][index]
+        role = individus['menage_role'][index]
+        person_id = 'i{}'.format(index)
+        test_case['familles'][menage_index]['parents' if role < 2 else 'enfants'].append(person_id)
+        test_case['foyers_fiscaux'][menage_index]['declarants' if role < 2 else 'personnes_a_charge'].append(person_id)
+        menage = test_case['menages'][menage_index]
+        if role == 2:
+            menage['enfants'].append(person_id)
+        else:
+            menage['personne_de_reference' if role == 0 else 'conjoint'] = person_id
+    return test_case
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-n', '--count', default = 1000000, type = int, help = "number of ménages")
+    parser.add_argument('-t', '--test-case-count', default = 1000, type = int,
+        help = "number of ménages loaded from a test case (0 to skip it)")
+    parser.add_argument('-p', '--period', default = '2017-01', help = "period of the inputs")
+    args = parser.parse_args()
+
+    tax_benefit_system = FranceTaxBenefitSystem()
+    directory = tempfile.mkdtemp()
+    try:
+        for count in sorted(set([args.test_case_count, args.count]) - set([0])):
+            tables = build_tables(count)
+            write_tables(directory, tables)
+            start_time = time.time()
+            tables = read_tables(tax_benefit_system, directory)
+            read_duration = time.time() - start_time
+            start_time = time.time()
+            simulation = new_simulation_from_tables(tax_benefit_system, tables, args.period)
+            print('{} menages, {} individus: npz read in {:.3f} s, simulation loaded in {:.3f} s'.format(
+                count, simulation.persons.count, read_duration, time.time() - start_time))
+
+            csv_directory = tempfile.mkdtemp(dir = directory)
+            for plural, table in tables.iteritems():
+                names = sorted(table)
+                np.savetxt('{}/{}.csv'.format(csv_directory, plural), np.column_stack([table[name] for name in names]),
+                    delimiter = ',', fmt = '%.15g', header = ','.join(names), comments = '')
+            start_time = time.time()
+            read_tables(tax_benefit_system, csv_directory)
+            print('{} menages: CSV read in {:.3f} s'.format(count, time.time() - start_time))
+
+            if count == args.test_case_count:
+                salaire_net = simulation.calculate('salaire_net', args.period)
+                test_case = build_test_case(tables)
+                start_time = time.time()
+                scenario = tax_benefit_system.new_scenario().init_from_test_case(period = args.period,
+                    test_case = test_case)
+                test_case_simulation = scenario.new_simulation()
+                print('{} menages: test case loaded in {:.3f} s, max salaire_net gap {:.4f}'.format(
+                    count, time.time() - start_time,
+                    np.abs(test_case_simulation.calculate('salaire_net', args.period) - salaire_net).max()))
+    finally:
+        shutil.rmtree(directory)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Measure the time and the peak memory of a simulation of a synthetic population, depending on its cache policy.
+
+The simulation is run without blacklist, with the blacklist of `openfisca_france.conf.cache_blacklist`, with the
+blacklist built by `build_cache_blacklist` from a sample of the population, and without blacklist but releasing each
+intermediate value after its last request, as counted on the sample (see `release_after_use`). Each run is done in its
+own process, so that its peak memory (maximum resident set size) is measured separately, and its outputs are compared
+with the ones of the first run.
+"""
+
+
+import argparse
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.microsimulation import (build_cache_blacklist, calculate, count_requests,
+    new_simulation_from_tables, release_after_use)
+
+from measure_bulk_loading import build_tables
+
+
+def run(args):
+    tax_benefit_system = FranceTaxBenefitSystem()
+    start_time = time.time()
+    requests_count_by_key = None
+    if args.policy in ('none', 'release'):
+        tax_benefit_system.cache_blacklist = None
+    if args.policy == 'derived':
+        tax_benefit_system.cache_blacklist = build_cache_blacklist(tax_benefit_system, build_tables(args.sample_count),
+            args.period, args.variables)
+    elif args.policy == 'release':
+        requests_count_by_key = count_requests(tax_benefit_system, build_tables(args.sample_count), args.period,
+            args.variables)
+    build_duration = time.time() - start_time
+    tables = build_tables(args.count)
+    start_time = time.time()
+    simulation = new_simulation_from_tables(tax_benefit_system, tables, args.period, opt_out_cache = True)
+    if requests_count_by_key is not None:
+        release_after_use(simulation, requests_count_by_key)
+    for variable_name in args.variables:
+        np.save(os.path.join(args.output, variable_name + '.npy'), calculate(simulation, variable_name, args.period))
+    if requests_count_by_key is None:
+        policy = '{} variables'.format(len(tax_benefit_system.cache_blacklist or []))
+    else:
+        policy = '{} of {} values released'.format(simulation.tracer.released_count, len(requests_count_by_key))
+    print('{}, built in {:.3f} s: {:.3f} s, peak memory {} MiB'.format(policy, build_duration,
+        time.time() - start_time, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-n', '--count', default = 20000, type = int, help = "number of ménages")
+    parser.add_argument('-s', '--sample-count', default = 100, type = int,
+        help = "number of ménages of the sample on which the requests of the values are counted")
+    parser.add_argument('-p', '--period', default = '2017', help = "period of the inputs and of the outputs")
+    parser.add_argument('-v', '--variables', default = 'revenu_disponible', help = "comma-separated output variables")
+    parser.add_argument('--policy', choices = ['none', 'current', 'derived', 'release'], help = argparse.SUPPRESS)
+    parser.add_argument('--output', help = argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.variables = args.variables.split(',')
+
+    if args.output is not None:
+        run(args)
+        return 0
+
+    directory = tempfile.mkdtemp()
+    try:
+        outputs = []
+        for policy in ['none', 'current', 'derived', 'release']:
+            output = os.path.join(directory, policy)
+            os.mkdir(output)
+            result = subprocess.check_output([sys.executable, __file__, '-n', str(args.count), '-s',
+                str(args.sample_count), '-p', args.period, '-v', ','.join(args.variables), '--policy', policy,
+                '--output', output])
+            outputs.append(output)
+            gaps = [
+                np.nanmax(np.abs(
+                    np.load(os.path.join(output, variable_name + '.npy')) -
+                    np.load(os.path.join(outputs[0], variable_name + '.npy'))
+                    ))
+                for variable_name in args.variables
+                ]
+            print('{} menages, {}: {}, max gap with the first run {}'.format(
+                args.count, policy, result.strip(), max(gaps)))
+    finally:
+        shutil.rmtree(directory)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
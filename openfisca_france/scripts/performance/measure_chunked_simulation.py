@@ -0,0 +1,80 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Measure the time and the peak memory of a simulation of a synthetic population, in one piece or chunk by chunk.
+
+Each mode is run in its own process, so that its peak memory (maximum resident set size) is measured separately. The
+outputs of the chunked simulations are written to `.npy` files and compared with the ones of the whole simulation.
+"""
+
+
+import argparse
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.microsimulation import calculate_by_chunk
+
+from measure_bulk_loading import build_tables
+
+
+def run(args):
+    tax_benefit_system = FranceTaxBenefitSystem()
+    tables = build_tables(args.count)
+    start_time = time.time()
+    calculate_by_chunk(tax_benefit_system, tables, args.period, args.variables,
+        chunk_size = args.chunk_size or len(tables['individus']['menage_id']), output_directory = args.output)
+    print('{:.3f} s, peak memory {} MiB'.format(
+        time.time() - start_time, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-n', '--count', default = 20000, type = int, help = "number of ménages")
+    parser.add_argument('-c', '--chunk-sizes', default = '0,20000,5000', help = "comma-separated numbers of individus "
+        "by chunk (0 for the whole population in a single simulation)")
+    parser.add_argument('-p', '--period', default = '2017', help = "period of the inputs and of the outputs")
+    parser.add_argument('-v', '--variables', default = 'revenu_disponible', help = "comma-separated output variables")
+    parser.add_argument('--chunk-size', type = int, help = argparse.SUPPRESS)
+    parser.add_argument('--output', help = argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.variables = args.variables.split(',')
+
+    if args.output is not None:
+        run(args)
+        return 0
+
+    directory = tempfile.mkdtemp()
+    try:
+        outputs = []
+        for chunk_size in [int(chunk_size) for chunk_size in args.chunk_sizes.split(',')]:
+            output = os.path.join(directory, str(chunk_size))
+            os.mkdir(output)
+            result = subprocess.check_output([sys.executable, __file__, '-n', str(args.count), '-p', args.period,
+                '-v', ','.join(args.variables), '--chunk-size', str(chunk_size), '--output', output])
+            outputs.append(output)
+            gaps = [
+                np.nanmax(np.abs(
+                    np.load(os.path.join(output, variable_name + '.npy')) -
+                    np.load(os.path.join(outputs[0], variable_name + '.npy'))
+                    ))
+                for variable_name in args.variables
+                ]
+            print('{} menages, {}: {}, max gap with the first run {}'.format(
+                args.count, 'chunks of {} individus'.format(chunk_size) if chunk_size else 'single simulation',
+                result.strip(), max(gaps)))
+    finally:
+        shutil.rmtree(directory)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
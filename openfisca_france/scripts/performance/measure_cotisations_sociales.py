@@ -0,0 +1,115 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Measure the evaluation of the contribution scales used in travail_prive.py on a large payroll."""
+
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.model.base import CATEGORIE_SALARIE
+from openfisca_france.model.prelevements_obligatoires.prelevements_sociaux.cotisations_sociales.base import \
+    apply_bareme_for_relevant_type_sal
+
+
+# (cotisation_type, bareme_name) of the contributions computed with apply_bareme in travail_prive.py
+TRAVAIL_PRIVE_BAREMES = [
+    ('employeur', 'agffc'),
+    ('employeur', 'agffnc'),
+    ('employeur', 'agirc'),
+    ('employeur', 'apec'),
+    ('employeur', 'arrco'),
+    ('employeur', 'assedic'),
+    ('employeur', 'cet'),
+    ('employeur', 'chomfg'),
+    ('employeur', 'csa'),
+    ('employeur', 'famille'),
+    ('employeur', 'maladie'),
+    ('employeur', 'penibilite_additionnelle'),
+    ('employeur', 'penibilite_base'),
+    ('employeur', 'vieillesse_deplafonnee'),
+    ('employeur', 'vieillesse_plafonnee'),
+    ('salarie', 'agff'),
+    ('salarie', 'agirc'),
+    ('salarie', 'apec'),
+    ('salarie', 'arrco'),
+    ('salarie', 'assedic'),
+    ('salarie', 'cet'),
+    ('salarie', 'maladie'),
+    ('salarie', 'maladie_alsace_moselle'),
+    ('salarie', 'vieillesse'),
+    ('salarie', 'vieillesse_deplafonnee'),
+    ]
+
+
+def apply_bareme_for_relevant_type_sal_by_mask(bareme_by_type_sal_name, bareme_name, categorie_salarie, base,
+        plafond_securite_sociale, round_base_decimals = 2):
+    # Former implementation of apply_bareme_for_relevant_type_sal, kept as a reference.
+    def iter_cotisations():
+        for type_sal_name, type_sal_index in CATEGORIE_SALARIE:
+            if type_sal_name not in bareme_by_type_sal_name:
+                continue
+            node = bareme_by_type_sal_name[type_sal_name]
+            if bareme_name in node._children:
+                bareme = getattr(node, bareme_name)
+                yield bareme.calc(
+                    base * (categorie_salarie == type_sal_index),
+                    factor = plafond_securite_sociale,
+                    round_base_decimals = round_base_decimals,
+                    )
+    return - sum(iter_cotisations())
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-n', '--count', default = 1000000, type = int, help = "number of employees")
+    parser.add_argument('-p', '--period', default = '2016-01-01', help = "instant of the legislation")
+    parser.add_argument('-s', '--seed', default = 0, type = int, help = "random seed")
+    args = parser.parse_args()
+
+    tax_benefit_system = FranceTaxBenefitSystem()
+    cotsoc = tax_benefit_system.get_parameters_at_instant(args.period).cotsoc
+
+    # A private sector payroll: mostly non cadres and cadres, plus a few public sector employees.
+    random = np.random.RandomState(args.seed)
+    categorie_salarie = random.choice(
+        [CATEGORIE_SALARIE[name] for name in ('prive_non_cadre', 'prive_cadre', 'public_titulaire_etat',
+            'public_non_titulaire', 'non_pertinent')],
+        size = args.count,
+        p = [0.7, 0.2, 0.04, 0.03, 0.03],
+        ).astype(np.int16)
+    assiette_cotisations_sociales = np.round(random.lognormal(np.log(2500), 0.6, size = args.count), 2)
+    plafond_securite_sociale = np.ones(args.count) * 3218
+
+    mask_duration = 0
+    grouped_duration = 0
+    for cotisation_type, bareme_name in TRAVAIL_PRIVE_BAREMES:
+        arguments = dict(
+            bareme_by_type_sal_name = getattr(cotsoc, 'cotisations_' + cotisation_type),
+            bareme_name = bareme_name,
+            categorie_salarie = categorie_salarie,
+            base = assiette_cotisations_sociales,
+            plafond_securite_sociale = plafond_securite_sociale,
+            )
+        start_time = time.time()
+        expected = apply_bareme_for_relevant_type_sal_by_mask(**arguments)
+        mask_duration += time.time() - start_time
+
+        start_time = time.time()
+        cotisation = apply_bareme_for_relevant_type_sal(**arguments)
+        grouped_duration += time.time() - start_time
+
+        assert (cotisation == expected).all(), (cotisation_type, bareme_name)
+
+    print('{} employees, {} contributions: masked evaluation {:.3f} s, grouped evaluation {:.3f} s ({:.1f}x)'.format(
+        args.count, len(TRAVAIL_PRIVE_BAREMES), mask_duration, grouped_duration, mask_duration / grouped_duration))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Measure the computation of gross salaries from net salaries with the de_net_a_brut reform.
+
+The reform inverts the tabulated net salary of private sector employees, and checks the result with the batched
+numerical inversion. It is compared with the numerical inversion alone. The former implementation, which called scipy
+fsolve on a clone of the simulation for every trial, is only run on small populations, to compare its results.
+"""
+
+
+from __future__ import division
+
+import argparse
+import sys
+import time
+
+from numpy import abs as abs_
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.inversion import calculate_inverse
+from openfisca_france.reforms.de_net_a_brut import de_net_a_brut
+
+
+def former_salaire_de_base(simulation, period):
+    from scipy.optimize import fsolve
+
+    net = simulation.calculate('salaire_net_a_payer', period)
+    simulation.individu.get_holder('salaire_de_base').formula.function = None
+
+    def solve_function(salaire_de_base):
+        simulation.individu.get_holder('salaire_de_base').put_in_cache(salaire_de_base, period)
+        temp_simulation = simulation.clone()
+        temp_simulation.individu.get_holder('salaire_net_a_payer').delete_arrays()
+        return temp_simulation.calculate('salaire_net_a_payer', period) - net
+
+    return fsolve(solve_function, net * 1.5, xtol = 1 / 10)
+
+
+def new_simulation(tax_benefit_system, count, period, categorie_salarie):
+    return tax_benefit_system.new_scenario().init_single_entity(
+        axes = [dict(count = count, name = 'salaire_net_a_payer', min = 0, max = 10000)],
+        parent1 = dict(
+            categorie_salarie = categorie_salarie,
+            effectif_entreprise = 1,
+            ),
+        period = period,
+        ).new_simulation()
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-n', '--count', default = 100000, type = int, help = "number of employees")
+    parser.add_argument('-f', '--former-count', default = 20, type = int,
+        help = "number of employees for the former implementation (0 to skip it)")
+    parser.add_argument('-p', '--period', default = '2016-02', help = "month of the payroll")
+    parser.add_argument('-c', '--categorie-salarie', default = 'prive_non_cadre', help = "categorie of the employees")
+    args = parser.parse_args()
+
+    tax_benefit_system = de_net_a_brut(FranceTaxBenefitSystem())
+    # Load the parameters and tabulate the net salaries before measuring.
+    simulation = new_simulation(tax_benefit_system, 10, args.period, args.categorie_salarie)
+    simulation.calculate('salaire_de_base', args.period)
+
+    for count in sorted(set([args.former_count, args.count]) - set([0])):
+        simulation = new_simulation(tax_benefit_system, count, args.period, args.categorie_salarie)
+        net = simulation.calculate('salaire_net_a_payer', args.period)
+        start_time = time.time()
+        salaire_de_base = simulation.calculate('salaire_de_base', args.period)
+        duration = time.time() - start_time
+
+        simulation = new_simulation(tax_benefit_system, count, args.period, args.categorie_salarie)
+        start_time = time.time()
+        numerical = calculate_inverse(simulation, 'salaire_de_base', 'salaire_net_a_payer', net, simulation.period,
+            initial_guess = net * 1.5, tolerance = 0.05, xtol = 1 / 10)
+        numerical_duration = time.time() - start_time
+
+        # Check convergence by computing the net salary of the gross salaries found.
+        for label, result, result_duration in (
+                ('tabulated', salaire_de_base, duration),
+                ('numerical', numerical, numerical_duration),
+                ):
+            check_simulation = new_simulation(FranceTaxBenefitSystem(), count, args.period, args.categorie_salarie)
+            check_simulation.individu.get_holder('salaire_net_a_payer').delete_arrays()
+            check_simulation.individu.get_holder('salaire_de_base').put_in_cache(result, check_simulation.period)
+            gap = abs_(check_simulation.calculate('salaire_net_a_payer', args.period) - net)
+            print('{} employees: {} inversion {:.3f} s, max net gap {:.4f}, {} gaps above 0.1'.format(
+                count, label, result_duration, gap.max(), (gap > 0.1).sum()))
+
+        if count == args.former_count:
+            simulation = new_simulation(tax_benefit_system, count, args.period, args.categorie_salarie)
+            start_time = time.time()
+            former = former_salaire_de_base(simulation, simulation.period)
+            print('{} employees: former fsolve inversion {:.3f} s, max gross gap with tabulated one {:.4f}'.format(
+                count, time.time() - start_time, abs_(former - salaire_de_base).max()))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
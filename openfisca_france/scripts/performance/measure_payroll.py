@@ -0,0 +1,70 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Measure a payroll simulation, with and without the fused evaluation of the contributions."""
+
+
+import argparse
+import sys
+import time
+
+from openfisca_core.periods import YEAR, period as make_period
+
+from openfisca_france import FranceTaxBenefitSystem
+
+
+OUTPUT_VARIABLES = [
+    'cotisations_salariales',
+    'cotisations_employeur',
+    'salaire_net',
+    ]
+
+
+def new_simulation(tax_benefit_system, count, period):
+    months_count = period.size * 12 if period.unit == YEAR else period.size
+    return tax_benefit_system.new_scenario().init_single_entity(
+        # Monthly gross salaries from 0 to 15000 €, spread over the months of the period.
+        axes = [dict(count = count, name = 'salaire_de_base', min = 0, max = 15000 * months_count)],
+        parent1 = dict(
+            categorie_salarie = 'prive_cadre',
+            effectif_entreprise = 50,
+            ),
+        period = period,
+        ).new_simulation()
+
+
+def measure(tax_benefit_system, count, period):
+    simulation = new_simulation(tax_benefit_system, count, period)
+    start_time = time.time()
+    months_count = period.size * 12 if period.unit == YEAR else period.size
+    results = [
+        simulation.calculate(variable_name, period.first_month.offset(month_index))
+        for month_index in range(months_count)
+        for variable_name in OUTPUT_VARIABLES
+        ]
+    return time.time() - start_time, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-n', '--count', default = 100000, type = int, help = "number of employees")
+    parser.add_argument('-p', '--period', default = '2016-01',
+        help = "month of the payroll, or year to compute the payroll of each month")
+    args = parser.parse_args()
+    period = make_period(args.period)
+
+    tax_benefit_system = FranceTaxBenefitSystem()
+    separate_duration, expected = measure(tax_benefit_system, args.count, period)
+    tax_benefit_system.fused_cotisations_sociales = True
+    fused_duration, results = measure(tax_benefit_system, args.count, period)
+
+    for result, expected_result in zip(results, expected):
+        assert (result == expected_result).all()
+    print('{} employees: separate contributions {:.3f} s, fused contributions {:.3f} s ({:.1f}x)'.format(
+        args.count, separate_duration, fused_duration, separate_duration / fused_duration))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Measure the computation of the RSA and the PPA over a year, and report the reuse of their intermediate results.
+
+The RSA and the PPA of a month average the resources of the 3 previous months once for each of these months, and
+consecutive months share the same windows of resources. For each variable, the number of window sums requested by the
+formulas is compared with the number of sums actually computed. The values computed for a month of demand (with
+extra_params) found in cache and computed are reported too.
+"""
+
+
+import argparse
+import sys
+import time
+
+from openfisca_france import FranceTaxBenefitSystem, cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-n', '--count', default = 1000, type = int, help = "number of families")
+    parser.add_argument('-y', '--year', default = 2017, type = int, help = "year of the RSA and the PPA")
+    parser.add_argument('-v', '--variables', default = 20, type = int, help = "number of variables to report")
+    parser.add_argument('-s', '--extra-params-cache-max-size', default = 256, type = int,
+        help = "number of values computed with extra_params kept in the simulation (0 to keep them all)")
+    args = parser.parse_args()
+
+    tax_benefit_system = FranceTaxBenefitSystem()
+    tax_benefit_system.extra_params_cache_max_size = args.extra_params_cache_max_size or None
+
+    months = ['{}-{:02d}'.format(args.year - 1, month) for month in range(10, 13)] + [
+        '{}-{:02d}'.format(args.year, month) for month in range(1, 13)]
+    simulation = tax_benefit_system.new_scenario().init_single_entity(
+        axes = [[
+            dict(count = args.count, name = 'salaire_net', min = 0, max = 2000, period = month)
+            for month in months
+            ]],
+        parent1 = dict(age = 40),
+        parent2 = dict(age = 38),
+        enfants = [dict(age = 5)],
+        period = months[3],
+        ).new_simulation()
+
+    start_time = time.time()
+    for month in months[3:]:
+        simulation.calculate('rsa', month)
+        simulation.calculate('ppa', month)
+    print('{} families: RSA and PPA over {} in {:.3f} s'.format(args.count, args.year, time.time() - start_time))
+
+    calls_count_by_variable_name = cache.get_window_sum_calls_count(simulation)
+    computations_count_by_variable_name = cache.get_window_sum_computations_count(simulation)
+    print('{} window sums requested, {} computed'.format(
+        sum(calls_count_by_variable_name.values()), sum(computations_count_by_variable_name.values())))
+    for variable_name, calls_count in calls_count_by_variable_name.most_common(args.variables):
+        print('{:<50} {:>5} requested {:>5} computed'.format(
+            variable_name, calls_count, computations_count_by_variable_name[variable_name]))
+
+    hits_count_by_variable_name = cache.get_extra_params_hits_count(simulation)
+    misses_count_by_variable_name = cache.get_extra_params_misses_count(simulation)
+    print('{} values computed with extra_params found in cache, {} computed, {} kept'.format(
+        sum(hits_count_by_variable_name.values()), sum(misses_count_by_variable_name.values()),
+        cache.get_extra_params_cached_count(simulation)))
+    for variable_name, misses_count in misses_count_by_variable_name.most_common(args.variables):
+        print('{:<50} {:>5} found {:>5} computed'.format(
+            variable_name, hits_count_by_variable_name[variable_name], misses_count))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
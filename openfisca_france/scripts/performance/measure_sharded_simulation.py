@@ -0,0 +1,59 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Measure a simulation of a synthetic population split in chunks of ménages over pools of processes of several sizes.
+
+The outputs of each pool are compared with the ones of the first pool. No speedup can be expected from more processes
+than CPUs.
+"""
+
+
+import argparse
+import multiprocessing
+import sys
+import time
+
+import numpy as np
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.microsimulation import calculate_by_process
+
+from measure_bulk_loading import build_tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-n', '--count', default = 20000, type = int, help = "number of ménages")
+    parser.add_argument('-w', '--workers', default = '1,2,4,8,16', help = "comma-separated numbers of processes")
+    parser.add_argument('-c', '--chunk-size', default = 5000, type = int, help = "number of individus by chunk")
+    parser.add_argument('-p', '--period', default = '2017', help = "period of the inputs and of the outputs")
+    parser.add_argument('-v', '--variables', default = 'revenu_disponible', help = "comma-separated output variables")
+    args = parser.parse_args()
+    variable_names = args.variables.split(',')
+
+    tax_benefit_system = FranceTaxBenefitSystem()
+    tables = build_tables(args.count)
+    print('{} menages, {} individus, {} CPUs'.format(
+        args.count, len(tables['individus']['menage_id']), multiprocessing.cpu_count()))
+    reference_duration = None
+    reference_value_by_variable_name = None
+    for processes_count in [int(processes_count) for processes_count in args.workers.split(',')]:
+        start_time = time.time()
+        value_by_variable_name = calculate_by_process(tax_benefit_system, tables, args.period, variable_names,
+            processes_count = processes_count, chunk_size = args.chunk_size)
+        duration = time.time() - start_time
+        if reference_duration is None:
+            reference_duration = duration
+            reference_value_by_variable_name = value_by_variable_name
+        gap = max(
+            np.nanmax(np.abs(value - reference_value_by_variable_name[variable_name]))
+            for variable_name, value in value_by_variable_name.iteritems()
+            )
+        print('{} processes: {:.3f} s, speedup {:.2f}, max gap with the first run {}'.format(
+            processes_count, duration, reference_duration / duration, gap))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Measure the memory of the values of a simulation of the réductions and crédits d'impôt, with and without shared
+default inputs (see `shared_default_value`).
+
+Almost all the declaration boxes read by these formulas are empty for a synthetic population: without shared default
+inputs, each of them gets its own array of zeros. The memory is the size of the distinct arrays stored in the holders
+of the simulation, and the outputs of both runs are compared.
+"""
+
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.microsimulation import new_simulation_from_tables
+
+from measure_bulk_loading import build_tables
+
+
+def iter_arrays(simulation):
+    for entity in simulation.entities.itervalues():
+        for holder in entity._holders.itervalues():
+            for value in (holder._array_by_period or {}).itervalues():
+                if isinstance(value, dict):
+                    for array in value.itervalues():
+                        yield array
+                else:
+                    yield value
+
+
+def run(tables, period, variables, shared_default_inputs):
+    tax_benefit_system_class = type('TaxBenefitSystem', (FranceTaxBenefitSystem,),
+        dict(shared_default_inputs = shared_default_inputs))
+    tax_benefit_system = tax_benefit_system_class()
+    start_time = time.time()
+    simulation = new_simulation_from_tables(tax_benefit_system, tables, period)
+    outputs = [simulation.calculate_add(variable_name, period) for variable_name in variables]
+    duration = time.time() - start_time
+    arrays = list(iter_arrays(simulation))
+    array_by_id = dict((id(array), array) for array in arrays)
+    print('shared default inputs {}: {:.3f} s, {} values in {} arrays of {} MiB'.format(shared_default_inputs, duration,
+        len(arrays), len(array_by_id), sum(array.nbytes for array in array_by_id.itervalues()) // (1024 * 1024)))
+    return outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-n', '--count', default = 100000, type = int, help = "number of ménages")
+    parser.add_argument('-p', '--period', default = '2016', help = "period of the inputs and of the outputs")
+    parser.add_argument('-v', '--variables', default = 'reductions,credits_impot',
+        help = "comma-separated output variables")
+    args = parser.parse_args()
+    variables = args.variables.split(',')
+
+    tables = build_tables(args.count)
+    print('{} ménages'.format(args.count))
+    expected = run(tables, args.period, variables, False)
+    outputs = run(tables, args.period, variables, True)
+    print('max gap: {}'.format(max(np.abs(output - expected_output).max()
+        for output, expected_output in zip(outputs, expected))))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
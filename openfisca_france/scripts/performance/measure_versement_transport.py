@@ -0,0 +1,79 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Compare the per-employee lookup of taux_versement_transport with the compiled table on a large payroll."""
+
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+from openfisca_core import periods
+
+from openfisca_france.france_taxbenefitsystem import COUNTRY_DIR
+from openfisca_france.model.prelevements_obligatoires.prelevements_sociaux.contributions_sociales import \
+    versement_transport
+
+
+def get_taux_versement_transport_by_dict_lookup(table_versement_transport, depcom_entreprise, instant):
+    # Former implementation of taux_versement_transport.formula, kept as a reference.
+    def select_temporal_taux_versement_transport(rates):
+        if rates is None:
+            return 0.0
+        taux = rates.get('taux')
+        for date in sorted(taux, reverse = True):
+            if str(instant) >= date:
+                return float(taux[date])
+        return 0.0
+
+    def get_taux(code_commune):
+        taux_commune = table_versement_transport.get(code_commune, None)
+        if taux_commune is None:
+            return 0.0
+        return (
+            select_temporal_taux_versement_transport(taux_commune.get('aot', None)) +
+            select_temporal_taux_versement_transport(taux_commune.get('smt', None))
+            )
+
+    return np.fromiter((get_taux(code_commune) for code_commune in depcom_entreprise), dtype = 'float')
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-n', '--count', default = 1000000, type = int, help = "number of employees")
+    parser.add_argument('-p', '--period', default = '2015-03', help = "month of the payroll")
+    parser.add_argument('-s', '--seed', default = 0, type = int, help = "random seed")
+    args = parser.parse_args()
+    instant = periods.period(args.period).start
+
+    with open(COUNTRY_DIR + '/assets/versement_transport/taux.json') as data_file:
+        table_versement_transport = json.load(data_file)
+    start_time = time.time()
+    versement_transport.preload_taux_versement_transport()
+    print('Table compiled in {:.3f} s'.format(time.time() - start_time))
+
+    random = np.random.RandomState(args.seed)
+    known_depcom = np.array(sorted(table_versement_transport.keys()), dtype = 'S5')
+    depcom_entreprise = known_depcom[random.randint(len(known_depcom), size = args.count)]
+    unknown = random.rand(args.count) < 0.2
+    depcom_entreprise[unknown] = '99999'
+
+    start_time = time.time()
+    expected = get_taux_versement_transport_by_dict_lookup(table_versement_transport, depcom_entreprise, instant)
+    dict_duration = time.time() - start_time
+
+    start_time = time.time()
+    taux_versement_transport = versement_transport.get_taux_versement_transport(depcom_entreprise, instant)
+    vectorized_duration = time.time() - start_time
+
+    assert (taux_versement_transport == expected).all()
+    print('{} employees: dict lookup {:.3f} s, compiled table {:.3f} s ({:.1f}x)'.format(
+        args.count, dict_duration, vectorized_duration, dict_duration / vectorized_duration))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
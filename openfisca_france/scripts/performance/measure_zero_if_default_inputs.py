@@ -0,0 +1,97 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Measure the calculation of the impôt sur le revenu of a synthetic population, with and without skipping the formulas
+of the réductions and crédits d'impôt whose inputs all have their default value (see `zero_if_default_inputs`).
+
+A few percent of the foyers fiscaux claim a réduction or a crédit d'impôt, through one or two of the most common
+declaration boxes (dons, emploi d'un salarié à domicile, frais de garde, etc.); all the other boxes are empty. The time
+of the sums of the réductions and crédits d'impôt is measured alone, once the variables they share with the rest of the
+impôt sur le revenu are calculated. The outputs of both runs are compared.
+"""
+
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from openfisca_core.base_functions import requested_period_default_value
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.microsimulation import new_simulation_from_tables
+from openfisca_france.model import base
+
+from measure_bulk_loading import build_tables
+
+
+claimed_boxes = ['f7db', 'f7ga', 'f7uf', 'f7ud', 'f7cf', 'f7gz', 'f7uh']
+# Variables read by the réductions and crédits d'impôt, but also by the rest of the impôt sur le revenu.
+shared_variables = ['ip_net', 'maries_ou_pacses', 'nb_pac', 'nb_pac2', 'nbptr', 'rbg_int', 'rfr', 'rng',
+    'salaire_imposable', 'retraite_imposable', 'chomage_imposable']
+
+
+def build_claims(foyers_count, share, seed = 0):
+    random = np.random.RandomState(seed)
+    claimant = random.uniform(size = foyers_count) < share
+    first_box = random.randint(0, len(claimed_boxes), size = foyers_count)
+    second_box = np.where(random.randint(0, 2, size = foyers_count), random.randint(0, len(claimed_boxes),
+        size = foyers_count), -1)
+    return dict(
+        (box, np.where(claimant & ((first_box == index) | (second_box == index)),
+            random.randint(100, 5000, size = foyers_count), 0))
+        for index, box in enumerate(claimed_boxes)
+        )
+
+
+def run(tax_benefit_system, tables, period, variables):
+    start_time = time.time()
+    simulation = new_simulation_from_tables(tax_benefit_system, tables, period)
+    for variable_name in shared_variables:
+        simulation.calculate_add(variable_name, period)
+    sums_start_time = time.time()
+    simulation.calculate('reductions', period)
+    simulation.calculate('credits_impot', period)
+    sums_duration = time.time() - sums_start_time
+    outputs = [simulation.calculate(variable_name, period) for variable_name in variables]
+    skipped_formulas_count = sum(base.get_skipped_formulas_count(simulation).itervalues())
+    return outputs, time.time() - start_time, sums_duration, skipped_formulas_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-n', '--count', default = 100000, type = int, help = "number of ménages")
+    parser.add_argument('-s', '--share', default = 0.05, type = float,
+        help = "share of the foyers fiscaux claiming a réduction or a crédit d'impôt")
+    parser.add_argument('-p', '--period', default = '2016', help = "period of the inputs and of the outputs")
+    parser.add_argument('-v', '--variables', default = 'irpp', help = "comma-separated output variables")
+    args = parser.parse_args()
+    variables = args.variables.split(',')
+
+    tables = build_tables(args.count)
+    tables['foyers_fiscaux'] = build_claims(args.count, args.share)
+
+    # Formulas are only skipped when the default values of the inputs are shared.
+    tax_benefit_system = type('TaxBenefitSystem', (FranceTaxBenefitSystem,), dict(shared_default_inputs = True))()
+    # Warm up the parameters and the formulas.
+    warm_up_tables = build_tables(10)
+    warm_up_tables['foyers_fiscaux'] = build_claims(10, 1)
+    run(tax_benefit_system, warm_up_tables, args.period, variables)
+    expected, duration, sums_duration, skipped_formulas_count = run(tax_benefit_system, tables, args.period, variables)
+    print('{} ménages, {:.0%} of claimants: {:.3f} s, réductions and crédits in {:.3f} s, {} formulas skipped'.format(
+        args.count, args.share, duration, sums_duration, skipped_formulas_count))
+
+    for variable in tax_benefit_system.variables.itervalues():
+        if hasattr(variable.formula.base_function.im_func, 'input_variables'):
+            variable.formula.base_function = requested_period_default_value
+    outputs, duration, sums_duration, _ = run(tax_benefit_system, tables, args.period, variables)
+    print('without skipping: {:.3f} s, réductions and crédits in {:.3f} s, max gap: {}'.format(duration,
+        sums_duration, max(np.abs(output - expected_output).max()
+        for output, expected_output in zip(outputs, expected))))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
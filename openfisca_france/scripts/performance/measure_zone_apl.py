@@ -0,0 +1,59 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Compare the per-ménage dict lookup of zone_apl with the vectorized lookup on a large population."""
+
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from openfisca_france.model.prestations import aides_logement
+
+
+def get_zone_apl_by_dict_lookup(zone_apl_by_depcom, depcom, default_value = 2):
+    # Former implementation of zone_apl.formula, kept as a reference.
+    return np.fromiter(
+        (
+            zone_apl_by_depcom.get(depcom_cell, default_value)
+            for depcom_cell in depcom
+            ),
+        dtype = np.int16,
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-n', '--count', default = 1000000, type = int, help = "number of ménages")
+    parser.add_argument('-s', '--seed', default = 0, type = int, help = "random seed")
+    args = parser.parse_args()
+
+    zone_apl_by_depcom = aides_logement.load_zone_apl_by_depcom()
+    aides_logement.preload_zone_apl()
+
+    # Mostly known communes, plus 5 % of unknown or empty codes which must fall back to the default zone.
+    random = np.random.RandomState(args.seed)
+    known_depcom = np.array(sorted(zone_apl_by_depcom.keys()), dtype = 'S5')
+    depcom = known_depcom[random.randint(len(known_depcom), size = args.count)]
+    unknown = random.rand(args.count) < 0.05
+    depcom[unknown] = np.array(['', '00000', '99999', '2C001'], dtype = 'S5')[random.randint(4, size = unknown.sum())]
+
+    start_time = time.time()
+    expected = get_zone_apl_by_dict_lookup(zone_apl_by_depcom, depcom)
+    dict_duration = time.time() - start_time
+
+    start_time = time.time()
+    zone_apl = aides_logement.get_zone_apl(depcom)
+    vectorized_duration = time.time() - start_time
+
+    assert (zone_apl == expected).all()
+    print('{} menages: dict lookup {:.3f} s, vectorized lookup {:.3f} s ({:.1f}x)'.format(
+        args.count, dict_duration, vectorized_duration, dict_duration / vectorized_duration))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Profile the calculation of variables on a synthetic population, value by value (see `Profiler`).
+
+Print the values on which the most time is spent, and optionally write the own times by stack of requested variables
+in the folded format of flame graph tools, e.g. `flamegraph.pl profile.folded > profile.svg`.
+"""
+
+
+import argparse
+import sys
+import time
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.microsimulation import calculate, new_simulation_from_tables, profile
+
+from measure_bulk_loading import build_tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('-n', '--count', default = 20000, type = int, help = "number of ménages")
+    parser.add_argument('-p', '--period', default = '2017', help = "period of the inputs and of the outputs")
+    parser.add_argument('-v', '--variables', default = 'revenu_disponible', help = "comma-separated output variables")
+    parser.add_argument('-t', '--top', default = 30, type = int, help = "number of variables or values in the report")
+    parser.add_argument('-s', '--sort', default = 'own_time',
+        choices = ['own_time', 'cumulative_time', 'calls_count', 'allocated_bytes'], help = "sort key of the report")
+    parser.add_argument('-b', '--by-period', action = 'store_true', help = "report values instead of variables")
+    parser.add_argument('-f', '--flame-graph', help = "path of the folded stacks file to write")
+    args = parser.parse_args()
+
+    tax_benefit_system = FranceTaxBenefitSystem()
+    simulation = new_simulation_from_tables(tax_benefit_system, build_tables(args.count), args.period)
+    profiler = profile(simulation)
+    start_time = time.time()
+    for variable_name in args.variables.split(','):
+        calculate(simulation, variable_name, simulation.period)
+    print('{} ménages: {:.3f} s, {} values'.format(args.count, time.time() - start_time, len(profiler.profile_by_key)))
+    print(profiler.format_report(args.top, args.sort, args.by_period).encode('utf-8'))
+    if args.flame_graph is not None:
+        profiler.write_flame_graph(args.flame_graph)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,569 @@
+# -*- coding: utf-8 -*-
+
+"""Run YAML tests in batches, over a pool of processes.
+
+`openfisca-run-test` builds and calculates a simulation by test. Here, the tests sharing their period, their reforms,
+their output variables and the inputs of their formulas are stacked in a single simulation, whose outputs are then
+checked test by test, and these batches are spread over processes forked once the tax and benefit system is loaded.
+The parsed tests of each YAML file are cached, and the file is parsed again only when it or the tax and benefit system
+changes. The tests are reported under the same titles, and `--name_filter`, `--verbose`, `--country-package`,
+`--extensions` and `--reforms` work as with `openfisca-run-test`, which remains the runner of `make test`.
+
+Usage: `python -m openfisca_france.yaml_runner tests`
+"""
+
+import argparse
+import collections
+import cPickle
+import glob
+import hashlib
+import inspect
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import traceback
+
+import pkg_resources
+import yaml
+
+from openfisca_core import conv, scenarios
+from openfisca_core.base_functions import requested_period_default_value
+from openfisca_core.scripts import add_tax_benefit_system_arguments, build_tax_benefit_system
+from openfisca_core.tools import assert_near
+
+
+class YamlTestsLoader(yaml.Loader):
+    """Load the mappings of the YAML tests as ordered dicts, like `openfisca-run-test`."""
+
+
+YamlTestsLoader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
+    lambda loader, node: collections.OrderedDict(loader.construct_pairs(node)))
+
+
+def iter_yaml_paths(path):
+    """Iterate over the YAML files of `path` (a file or a directory), in the order of `openfisca-run-test`."""
+    if not os.path.isdir(path):
+        yield path
+        return
+    for yaml_path in glob.glob(os.path.join(path, '*.yaml')):
+        yield yaml_path
+    for subdirectory in glob.glob(os.path.join(path, '*/')):
+        for yaml_path in iter_yaml_paths(subdirectory):
+            yield yaml_path
+
+
+# Version of the format of the cached tests, to increment when it or `parse_yaml_tests` changes.
+cache_format_version = 2
+# Number of YAML files whose tests are loaded by `load_tests`, by source: parsed (`yaml`) or loaded from the `cache`.
+loaded_files_count_by_source = collections.Counter()
+# Durations (in seconds) of the parsing and of the calculation of the tests run by `run_tests`, and number of their
+# simulations.
+run_statistics = collections.Counter()
+
+
+def get_fingerprint(tax_benefit_system):
+    """Return a hash of what the parsed tests depend on, besides their YAML files.
+
+    This is the code turning a YAML test into a scenario, the entities and their roles, and the types of the variables.
+    """
+    fingerprint = hashlib.sha1()
+    fingerprint.update(repr((cache_format_version, pkg_resources.get_distribution('OpenFisca-Core').version)))
+    with open(inspect.getsourcefile(tax_benefit_system.Scenario)) as source_file:
+        fingerprint.update(source_file.read())
+    for entity in tax_benefit_system.entities:
+        fingerprint.update(repr((entity.key, entity.plural, [
+            (role.key, role.plural, role.max, [subrole.key for subrole in role.subroles or []])
+            for role in (entity.roles if not entity.is_person else [])
+            ])))
+    for variable_name, variable in sorted(tax_benefit_system.variables.iteritems()):
+        possible_values = getattr(variable, 'possible_values', None)
+        fingerprint.update(repr((variable_name, variable.entity.key, variable.value_type.__name__,
+            variable.definition_period, variable.default_value, getattr(variable, 'max_length', None),
+            sorted(possible_values._vars.iteritems()) if possible_values is not None else None)))
+    return fingerprint.hexdigest()
+
+
+def get_reform_paths(tax_benefit_system):
+    """Return the paths of the reforms applied to the tax and benefit system of a test, from the first one."""
+    reform_paths = []
+    while tax_benefit_system.baseline is not None:
+        reform_paths.insert(0, '{}.{}'.format(tax_benefit_system.__module__, tax_benefit_system.__class__.__name__))
+        tax_benefit_system = tax_benefit_system.baseline
+    return tuple(reform_paths)
+
+
+def dump_tests(cache_path, tests):
+    """Write the tests parsed from a YAML file to `cache_path`, without the tax and benefit systems of their scenarios.
+
+    Instead, the paths of their reforms are written, with the fingerprints of the reformed tax and benefit systems.
+    """
+    fingerprint_by_reform_paths = {}
+    cached_tests = []
+    for _, name, period_str, test in tests:
+        scenario = test['scenario']
+        reform_paths = get_reform_paths(scenario.tax_benefit_system)
+        if reform_paths not in fingerprint_by_reform_paths:
+            fingerprint_by_reform_paths[reform_paths] = get_fingerprint(scenario.tax_benefit_system)
+        cached_test = test.copy()
+        del cached_test['scenario']
+        cached_tests.append((name, period_str, reform_paths, cached_test, dict(
+            axes = scenario.axes,
+            input_variables = scenario.input_variables,
+            period = scenario.period,
+            test_case = scenario.test_case,
+            )))
+    # Write a temporary file first, so that an interrupted run leaves no truncated cache file.
+    cache_file_descriptor, temporary_path = tempfile.mkstemp(dir = os.path.dirname(cache_path))
+    with os.fdopen(cache_file_descriptor, 'wb') as cache_file:
+        cPickle.dump((fingerprint_by_reform_paths, cached_tests), cache_file, cPickle.HIGHEST_PROTOCOL)
+    os.rename(temporary_path, cache_path)
+
+
+def load_cached_tests(cache_path, yaml_path, reformed_by_paths, fingerprint_by_reform_paths):
+    """Read the tests written by `dump_tests` to `cache_path`, or return None if their reforms have changed since.
+
+    `reformed_by_paths` and `fingerprint_by_reform_paths` contain the reformed tax and benefit systems already built,
+    by reform paths, and their fingerprints.
+    """
+    with open(cache_path, 'rb') as cache_file:
+        cached_fingerprint_by_reform_paths, cached_tests = cPickle.load(cache_file)
+    for reform_paths, fingerprint in cached_fingerprint_by_reform_paths.iteritems():
+        if reform_paths not in reformed_by_paths:
+            reformed = reformed_by_paths[()]
+            for reform_path in reform_paths:
+                reformed = reformed.apply_reform(reform_path)
+            reformed_by_paths[reform_paths] = reformed
+            fingerprint_by_reform_paths[reform_paths] = get_fingerprint(reformed)
+        if fingerprint_by_reform_paths[reform_paths] != fingerprint:
+            return None
+    tests = []
+    for name, period_str, reform_paths, test, scenario_attributes in cached_tests:
+        tax_benefit_system = reformed_by_paths[reform_paths]
+        scenario = tax_benefit_system.Scenario()
+        scenario.tax_benefit_system = tax_benefit_system
+        for attribute_name, value in scenario_attributes.iteritems():
+            setattr(scenario, attribute_name, value)
+        test['scenario'] = scenario
+        tests.append((yaml_path, name, period_str, test))
+    return tests
+
+
+def parse_yaml_tests(tax_benefit_system, yaml_path):
+    """Parse the tests of a YAML file like `openfisca-run-test`, and return a list of `(yaml_path, name, period_str,
+    test)` tuples."""
+    with open(yaml_path) as yaml_file:
+        tests = yaml.load(yaml_file, Loader = YamlTestsLoader)
+    tests, error = conv.pipe(
+        conv.make_item_to_singleton(),
+        conv.uniform_sequence(conv.noop, drop_none_items = True),
+        )(tests)
+    if error is not None:
+        raise ValueError("Error in test {}:\n{}".format(yaml_path, error))
+
+    filename = os.path.splitext(os.path.basename(yaml_path))[0]
+    parsed_tests = []
+    for test in tests:
+        test_tax_benefit_system = tax_benefit_system
+        reform_paths = test.pop('reforms', None) or []
+        for reform_path in reform_paths if isinstance(reform_paths, list) else [reform_paths]:
+            test_tax_benefit_system = test_tax_benefit_system.apply_reform(reform_path)
+        test, error = scenarios.make_json_or_python_to_test(tax_benefit_system = test_tax_benefit_system)(test)
+        if error is not None:
+            raise ValueError("Error in test {}:\n{}".format(yaml_path, error))
+        parsed_tests.append((yaml_path, test.get('name') or filename, unicode(test['scenario'].period), test))
+    return parsed_tests
+
+
+def parse_test_file(tax_benefit_system, yaml_path, cache_directory = None, reformed_by_paths = None,
+        fingerprint_by_reform_paths = None):
+    """Parse the tests of a YAML file, like `openfisca-run-test`, or load them from `cache_directory`.
+
+    The cache file of a YAML file is named after a hash of its content and of the fingerprint of `tax_benefit_system`.
+    See `load_cached_tests` for the other arguments.
+    """
+    if cache_directory is None:
+        loaded_files_count_by_source['yaml'] += 1
+        return parse_yaml_tests(tax_benefit_system, yaml_path)
+
+    with open(yaml_path, 'rb') as yaml_file:
+        content = yaml_file.read()
+    cache_path = os.path.join(cache_directory, '{}.pickle'.format(
+        hashlib.sha1(fingerprint_by_reform_paths[()] + content).hexdigest()))
+    if os.path.exists(cache_path):
+        tests = load_cached_tests(cache_path, yaml_path, reformed_by_paths, fingerprint_by_reform_paths)
+        if tests is not None:
+            loaded_files_count_by_source['cache'] += 1
+            return tests
+
+    loaded_files_count_by_source['yaml'] += 1
+    tests = parse_yaml_tests(tax_benefit_system, yaml_path)
+    dump_tests(cache_path, tests)
+    return tests
+
+
+def load_tests(tax_benefit_system, paths, name_filter = None, cache_directory = None):
+    """Parse the tests of the YAML files of `paths`, or load them from `cache_directory` (see `parse_test_file`).
+
+    Return a list of `(title, period_str, test)` tuples, with the titles given to the tests by `openfisca-run-test`.
+    """
+    if isinstance(name_filter, str):
+        name_filter = name_filter.decode('utf-8')
+    reformed_by_paths = {(): tax_benefit_system}
+    fingerprint_by_reform_paths = {}
+    if cache_directory is not None:
+        if not os.path.isdir(cache_directory):
+            os.makedirs(cache_directory)
+        fingerprint_by_reform_paths[()] = get_fingerprint(tax_benefit_system)
+    tests = []
+    for path in paths:
+        for yaml_path in iter_yaml_paths(path):
+            filename = os.path.splitext(os.path.basename(yaml_path))[0]
+            for _, name, period_str, test in parse_test_file(tax_benefit_system, yaml_path, cache_directory,
+                    reformed_by_paths, fingerprint_by_reform_paths):
+                keywords = test.get('keywords', [])
+                if name_filter is not None and name_filter not in filename \
+                        and name_filter not in test.get('name', u'') and name_filter not in keywords:
+                    continue
+                title = "{}: {}{} - {}".format(
+                    os.path.basename(yaml_path),
+                    u'[{}] '.format(u', '.join(keywords)).encode('utf-8') if keywords else '',
+                    name.encode('utf-8'),
+                    period_str,
+                    )
+                # Suggested inputs (e.g. dates of birth) are inputs like the others: add them before batching.
+                test['scenario'].suggest()
+                tests.append((title, period_str, test))
+    return tests
+
+
+def get_input_periods(scenario):
+    """Return the periods of the inputs of the test case of `scenario`, by variable name."""
+    tax_benefit_system = scenario.tax_benefit_system
+    periods_by_variable_name = collections.defaultdict(set)
+    for entity in tax_benefit_system.entities:
+        for member in scenario.test_case[entity.plural]:
+            for variable_name, cell in member.iteritems():
+                if variable_name not in tax_benefit_system.variables:
+                    # An id or a role
+                    continue
+                if isinstance(cell, dict):
+                    periods_by_variable_name[variable_name].update(
+                        period for period, value in cell.iteritems() if value is not None)
+                elif cell is not None:
+                    periods_by_variable_name[variable_name].add(scenario.period)
+    return periods_by_variable_name
+
+
+def get_batch_key(test):
+    """Return the key of the tests that `test` can be stacked with, and the periods of its input variables without
+    formula, or `(None, None)` if `test` must be run alone.
+
+    In a simulation stacking several tests, an input of any of them is set for all of them, with its default value for
+    the tests that do not give it. The key is made of the period, the reforms and the output variables of `test`, and
+    of the inputs of its variables with a formula: a formula must not be replaced by a default value. Defaults are
+    harmless for input variables without formula, as long as their inputs have periods of the same size in each test:
+    otherwise, dividing a yearly input into months would deduce the default months from it. Inputs whose value for
+    other periods is deduced from their known values (e.g. `requested_period_last_value`) must even have the same
+    periods in each test: otherwise, the default value of another test would be their last known value.
+    """
+    scenario = test['scenario']
+    if scenario.test_case is None or scenario.axes is not None:
+        return None, None
+    tax_benefit_system = scenario.tax_benefit_system
+    reforms_classes = []
+    while tax_benefit_system.baseline is not None:
+        reforms_classes.append(tax_benefit_system.__class__)
+        tax_benefit_system = tax_benefit_system.baseline
+    formula_inputs = set()
+    input_periods_by_variable_name = {}
+    for variable_name, input_periods in get_input_periods(scenario).iteritems():
+        variable = scenario.tax_benefit_system.variables[variable_name]
+        if not variable.is_input_variable():
+            formula_inputs.update((variable_name, period) for period in input_periods)
+        elif variable.base_function == requested_period_default_value:
+            input_periods_by_variable_name[variable_name] = frozenset(
+                (period.unit, period.size) for period in input_periods)
+        else:
+            input_periods_by_variable_name[variable_name] = frozenset(input_periods)
+    outputs = frozenset(
+        (variable_name, period)
+        for variable_name, array_by_period in (test.get('output_variables') or {}).iteritems()
+        for period in array_by_period
+        )
+    key = (scenario.period, tuple(reforms_classes), outputs, frozenset(formula_inputs))
+    return key, input_periods_by_variable_name
+
+
+def build_batches(tests, batch_size):
+    """Split the indexes of `tests` in batches of at most `batch_size` tests that can be stacked in a simulation."""
+    batches = []
+    open_batches_by_key = collections.defaultdict(list)
+    for index, (_, _, test) in enumerate(tests):
+        key, input_periods_by_variable_name = get_batch_key(test)
+        if key is None:
+            batches.append([index])
+            continue
+        for batch_input_periods_by_variable_name, batch in open_batches_by_key[key]:
+            if len(batch) < batch_size and all(
+                    batch_input_periods_by_variable_name.get(variable_name, input_periods) == input_periods
+                    for variable_name, input_periods in input_periods_by_variable_name.iteritems()
+                    ):
+                batch.append(index)
+                batch_input_periods_by_variable_name.update(input_periods_by_variable_name)
+                break
+        else:
+            batch = [index]
+            open_batches_by_key[key].append((dict(input_periods_by_variable_name), batch))
+            batches.append(batch)
+    return batches
+
+
+def stack_scenarios(scenarios):
+    """Stack the test cases of `scenarios` in a single scenario.
+
+    Return this scenario and, by entity plural, the index of the first entity of each test case in it. The ids of the
+    entities are prefixed by the index of their test case, to keep them unique.
+    """
+    first_scenario = scenarios[0]
+    tax_benefit_system = first_scenario.tax_benefit_system
+    test_case = dict((entity.plural, []) for entity in tax_benefit_system.entities)
+    starts_by_plural = dict((entity.plural, []) for entity in tax_benefit_system.entities)
+    for index, scenario in enumerate(scenarios):
+        for entity in tax_benefit_system.entities:
+            members = test_case[entity.plural]
+            starts_by_plural[entity.plural].append(len(members))
+            for member in scenario.test_case[entity.plural]:
+                member = member.copy()
+                member['id'] = u'{}-{}'.format(index, member['id'])
+                if not entity.is_person:
+                    for role in entity.roles:
+                        role_name = role.plural or role.key
+                        persons_ids = member.get(role_name)
+                        if isinstance(persons_ids, list):
+                            member[role_name] = [u'{}-{}'.format(index, person_id) for person_id in persons_ids]
+                        elif persons_ids is not None:
+                            member[role_name] = u'{}-{}'.format(index, persons_ids)
+                members.append(member)
+    scenario = first_scenario.__class__()
+    scenario.tax_benefit_system = tax_benefit_system
+    scenario.period = first_scenario.period
+    scenario.test_case = test_case
+    return scenario, starts_by_plural
+
+
+def format_error():
+    """Return the message of the exception being handled, with its traceback unless it is a failed assertion."""
+    error_type, error, error_traceback = sys.exc_info()
+    if isinstance(error, AssertionError):
+        return ''.join(traceback.format_exception_only(error_type, error))
+    return ''.join(traceback.format_exception(error_type, error, error_traceback))
+
+
+def run_test(period_str, test, verbose = False):
+    """Run `test` alone, like `openfisca-run-test`, and return its error message, or None if it passes.
+
+    With `verbose`, the simulation is traced and its computation log is printed.
+    """
+    simulation = test['scenario'].new_simulation(trace = verbose)
+    try:
+        for variable_name, expected_value in (test.get('output_variables') or {}).iteritems():
+            expected_value_by_period = expected_value if isinstance(expected_value, dict) else {
+                period_str: expected_value}
+            for requested_period, expected_value_at_period in expected_value_by_period.iteritems():
+                assert_near(
+                    simulation.calculate(variable_name, requested_period),
+                    expected_value_at_period,
+                    absolute_error_margin = test.get('absolute_error_margin'),
+                    message = u'{}@{}: '.format(variable_name, requested_period),
+                    relative_error_margin = test.get('relative_error_margin'),
+                    )
+    except Exception:
+        return format_error()
+    finally:
+        if verbose:
+            print('Computation log:')
+            simulation.tracer.print_computation_log()
+    return None
+
+
+def run_batch(tests):
+    """Run `tests` in a single simulation, and return the error message of each of them, or None if it passes.
+
+    If the simulation fails, each test is run alone, so that the error is reported for the tests that raise it.
+    """
+    if len(tests) == 1:
+        return [run_test(period_str, test) for _, period_str, test in tests]
+    errors = [None] * len(tests)
+    try:
+        scenario, starts_by_plural = stack_scenarios([test['scenario'] for _, _, test in tests])
+        simulation = scenario.new_simulation()
+        for variable_name, array_by_period in (tests[0][2].get('output_variables') or {}).iteritems():
+            entity = simulation.get_variable_entity(variable_name)
+            stops = starts_by_plural[entity.plural][1:] + [entity.count]
+            for requested_period in array_by_period:
+                value = simulation.calculate(variable_name, requested_period)
+                for index, (_, _, test) in enumerate(tests):
+                    if errors[index] is not None:
+                        # Like a test run alone, stop at the first failed assertion.
+                        continue
+                    try:
+                        assert_near(
+                            value[starts_by_plural[entity.plural][index]:stops[index]],
+                            test['output_variables'][variable_name][requested_period],
+                            absolute_error_margin = test.get('absolute_error_margin'),
+                            message = u'{}@{}: '.format(variable_name, requested_period),
+                            relative_error_margin = test.get('relative_error_margin'),
+                            )
+                    except AssertionError:
+                        errors[index] = format_error()
+    except Exception:
+        return [run_test(period_str, test) for _, period_str, test in tests]
+    return errors
+
+
+# Tests run by a worker process of `run_batches`, set by `init_worker` in the worker only.
+worker_tests = None
+
+
+def init_worker(tests):
+    global worker_tests
+    worker_tests = tests
+
+
+def run_worker_batch(batch):
+    return batch, run_batch([worker_tests[index] for index in batch])
+
+
+def run_batches(tests, batches, processes_count = None, progress = None):
+    """Run the batches of `tests` (see `build_batches`) in a pool of `processes_count` processes (by default, one by
+    CPU), and return the error message of each test, or None if it passes.
+
+    `progress`, if given, is called with the index and the error of each test as soon as it is run. The tests are
+    handed to each worker process when the pool starts it, without being pickled: the workers must be forked, which
+    requires a Unix-like system.
+    """
+    errors = [None] * len(tests)
+
+    def set_errors(batch, batch_errors):
+        for index, error in zip(batch, batch_errors):
+            errors[index] = error
+            if progress is not None:
+                progress(index, error)
+
+    if processes_count == 1:
+        for batch in batches:
+            set_errors(batch, run_batch([tests[index] for index in batch]))
+        return errors
+
+    pool = multiprocessing.Pool(processes_count, initializer = init_worker, initargs = (tests,))
+    try:
+        # The largest batches first, so that no process is left with a large batch at the end.
+        for batch, batch_errors in pool.imap_unordered(run_worker_batch, sorted(batches, key = len, reverse = True)):
+            set_errors(batch, batch_errors)
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    return errors
+
+
+def run_verbose(tests, progress = None):
+    """Run `tests` one by one in the calling process, like `openfisca-run-test --verbose`, printing the title and the
+    computation log of each of them, and return the error message of each test, or None if it passes."""
+    errors = []
+    for index, (title, period_str, test) in enumerate(tests):
+        print(title)
+        errors.append(run_test(period_str, test, verbose = True))
+        if progress is not None:
+            progress(index, errors[-1])
+    return errors
+
+
+def run_tests(tax_benefit_system, paths, name_filter = None, processes_count = None, batch_size = 100,
+        cache_directory = None, progress = None, verbose = False):
+    """Run the YAML tests of `paths` in batches of at most `batch_size` tests, in a pool of `processes_count` processes.
+
+    Return the list of the `(title, error)` of the tests, in the order of `openfisca-run-test`, with `error` None for
+    the tests that pass. `progress`, if given, is called with the title and the error of each test as soon as it is
+    run. With `verbose`, the tests are run one by one instead (see `run_verbose`). See `load_tests` and `run_batches`
+    for the other arguments. The durations of the parsing and of the calculations are added to `run_statistics`.
+    """
+    start_time = time.time()
+    tests = load_tests(tax_benefit_system, paths, name_filter = name_filter, cache_directory = cache_directory)
+    parse_duration = time.time() - start_time
+
+    def progress_by_index(index, error):
+        if progress is not None:
+            progress(tests[index][0], error)
+
+    if verbose:
+        batches = [[index] for index in range(len(tests))]
+        errors = run_verbose(tests, progress = progress_by_index)
+    else:
+        batches = build_batches(tests, batch_size)
+        errors = run_batches(tests, batches, processes_count = processes_count, progress = progress_by_index)
+    run_statistics['parse_duration'] += parse_duration
+    run_statistics['calculation_duration'] += time.time() - start_time - parse_duration
+    run_statistics['simulations_count'] += len(batches)
+    return [(title, error) for (title, _, _), error in zip(tests, errors)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('paths', nargs = '+', help = "paths (files or directories) of the tests to run")
+    parser = add_tax_benefit_system_arguments(parser)
+    parser.set_defaults(country_package = 'openfisca_france')
+    parser.add_argument('-n', '--name_filter', default = None,
+        help = "partial name of the tests to run, as with openfisca-run-test")
+    parser.add_argument('-v', '--verbose', action = 'store_true', default = False,
+        help = "run the tests one by one, printing their computation logs, as with openfisca-run-test")
+    parser.add_argument('-p', '--processes', default = None, type = int,
+        help = "number of processes (by default, one by CPU)")
+    parser.add_argument('-b', '--batch-size', default = 100, type = int, help = "maximum number of tests by simulation")
+    parser.add_argument('--cache-directory',
+        default = os.path.join(os.path.expanduser('~'), '.cache', 'openfisca-france', 'yaml-tests'),
+        help = "directory of the parsed tests (default: %(default)s)")
+    parser.add_argument('--no-cache', action = 'store_true', default = False,
+        help = "parse every YAML file, without reading nor writing the cache")
+    args = parser.parse_args()
+    logging.basicConfig(level = logging.DEBUG if args.verbose else logging.WARNING, stream = sys.stdout)
+
+    tax_benefit_system = build_tax_benefit_system(args.country_package, args.extensions, args.reforms)
+
+    def progress(title, error):
+        if args.verbose:
+            print('{} ... {}'.format(title, 'ok' if error is None else 'FAIL'))
+        else:
+            sys.stdout.write('.' if error is None else 'F')
+            sys.stdout.flush()
+
+    start_time = time.time()
+    results = run_tests(tax_benefit_system, map(os.path.abspath, args.paths), name_filter = args.name_filter,
+        processes_count = args.processes, batch_size = args.batch_size,
+        cache_directory = None if args.no_cache else args.cache_directory, progress = progress, verbose = args.verbose)
+    failures = [(title, error) for title, error in results if error is not None]
+    print('')
+    for title, error in failures:
+        print('=' * 70)
+        print('FAIL: {}'.format(title))
+        print('-' * 70)
+        print(error)
+    print('-' * 70)
+    print('Ran {} tests in {:.3f}s'.format(len(results), time.time() - start_time))
+    print('Parsed {} YAML files in {:.3f}s ({} from the cache), calculated {} simulations in {:.3f}s'.format(
+        sum(loaded_files_count_by_source.values()), run_statistics['parse_duration'],
+        loaded_files_count_by_source['cache'], run_statistics['simulations_count'],
+        run_statistics['calculation_duration']))
+    print('')
+    print('FAILED (failures={})'.format(len(failures)) if failures else 'OK')
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,7 +7,7 @@ from setuptools import setup, find_packages
 
 setup(
     name = 'OpenFisca-France',
-    version = '18.11.0',
+    version = '18.26.0',
     author = 'OpenFisca Team',
     author_email = 'contact@openfisca.fr',
     classifiers = [
@@ -34,19 +34,12 @@ setup(
             'lxml >= 3.8.0, < 4.0',
             'Biryani[datetimeconv] >= 0.10.4',
             ],
-        'inversion_revenus': [
-            'scipy >= 0.17',
-            ],
-        'de_net_a_brut': [
-            'scipy >= 0.17',
-            ],
         'taxipp': [
             'pandas >= 0.13',
             ],
         'test': [
             'nose',
             'flake8 == 3.4.1',
-            'scipy >= 0.17', # Only used to test de_net_a_brut reform
             ],
         },
     include_package_data = True,  # Will read MANIFEST.in
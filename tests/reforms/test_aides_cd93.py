@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+from openfisca_core import periods
+from openfisca_france.reforms.aides_cd93 import aides_cd93
+from ..cache import tax_benefit_system
+
+
+def test_aides_cd93():
+    period = periods.period('2017-01')
+    reform = aides_cd93(tax_benefit_system)
+    simulation = reform.new_scenario().init_from_test_case(
+        period = period,
+        test_case = dict(
+            individus = [
+                dict(id = 'a', age = 70, perte_autonomie = True),
+                dict(id = 'b', age = 70, perte_autonomie = True),
+                dict(id = 'c', age = 70, perte_autonomie = True),
+                ],
+            familles = [dict(parents = ['a']), dict(parents = ['b']), dict(parents = ['c'])],
+            foyers_fiscaux = [dict(declarants = ['a']), dict(declarants = ['b']), dict(declarants = ['c'])],
+            menages = [
+                dict(personne_de_reference = 'a', depcom = '93001'),
+                dict(personne_de_reference = 'b', depcom = '75110'),
+                dict(personne_de_reference = 'c', depcom = '2A004'),
+                ],
+            ),
+        ).new_simulation()
+
+    assert (simulation.calculate('resident_93', period) == [True, False, False]).all()
+    assert (simulation.calculate('adpa', period) == [100, 0, 0]).all()
+
+
+if __name__ == '__main__':
+    import logging
+    import sys
+    logging.basicConfig(level = logging.ERROR, stream = sys.stdout)
+    test_aides_cd93()
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from openfisca_france.microsimulation import new_simulation_from_tables
+from openfisca_france.model.base import depcom_startswith, nth_member_value, rank_members
+
+from .cache import tax_benefit_system
+from .utils import build_tables
+
+
+period = '2017-01'
+
+
+def test_depcom_startswith():
+    depcom = np.array(['97101', '75056', '2A004', '93001', '9'])
+    assert depcom_startswith(depcom, '971').tolist() == [True, False, False, False, False]
+    # Prefixes of different lengths.
+    assert depcom_startswith(depcom, ['971', '75', '2A']).tolist() == [True, True, True, False, False]
+    assert depcom_startswith(depcom, ['9', '2A004']).tolist() == [True, False, True, True, True]
+
+
+def test_rank_members():
+    simulation = new_simulation_from_tables(tax_benefit_system, build_tables(), period)
+    famille = simulation.famille
+    age = np.array([40, 38, 5, 35, 10, 10])
+    assert (rank_members(famille, age) == [2, 1, 0, 2, 0, 1]).all()
+    assert (rank_members(famille, age, reverse = True) == [0, 1, 2, 0, 1, 2]).all()
+    enfant = famille.members_role == famille.ENFANT
+    rank = rank_members(famille, age, condition = enfant, reverse = True)
+    assert (rank == [-1, -1, 0, -1, 0, 1]).all()
+    assert (rank_members(famille, age * 1.5, condition = enfant) == rank).all()
+    assert (nth_member_value(famille, age, rank, 1, default = -1) == [-1, 10]).all()
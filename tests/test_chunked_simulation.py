@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+
+import shutil
+import tempfile
+
+from nose.tools import assert_raises
+
+from openfisca_france.microsimulation import (calculate_by_chunk, calculate_by_process, iter_chunks,
+    new_simulation_from_tables, read_tables, write_tables)
+
+from .cache import tax_benefit_system
+from .utils import build_tables
+
+
+period = '2017-01'
+
+
+def test_calculate_by_chunk():
+    tables = build_tables()
+    # The child of the second ménage is declared in the foyer fiscal of the first one.
+    tables['individus']['foyer_fiscal_id'][5] = 0
+    chunks = list(iter_chunks(tax_benefit_system, tables, chunk_size = 1))
+    assert len(chunks) == 1
+
+    tables = build_tables()
+    chunks = list(iter_chunks(tax_benefit_system, tables, chunk_size = 1))
+    assert [list(index_by_plural['individus']) for index_by_plural, _ in chunks] == [[0, 1, 2], [3, 4, 5]]
+    assert list(chunks[1][1]['individus']['menage_id']) == [0, 0, 0]
+    assert list(chunks[1][1]['menages']['loyer']) == [500]
+
+    simulation = new_simulation_from_tables(tax_benefit_system, tables, period)
+    value_by_variable_name = calculate_by_chunk(tax_benefit_system, tables, period, ['salaire_net', 'aide_logement'],
+        chunk_size = 1)
+    for variable_name, value in value_by_variable_name.iteritems():
+        assert (value == simulation.calculate(variable_name, period)).all(), variable_name
+
+
+def test_calculate_by_chunk_from_csv():
+    tables = build_tables()
+    tables['individus']['famille_role'] = [0, 1, 2, 0, 2, 2]
+    directory = tempfile.mkdtemp()
+    try:
+        write_tables(directory, tables, extension = '.csv')
+        csv_tables = read_tables(tax_benefit_system, directory)
+    finally:
+        shutil.rmtree(directory)
+    # Columns read from CSV files are floats, indexes included.
+    assert csv_tables['individus']['menage_id'].dtype.kind == 'f'
+    simulation = new_simulation_from_tables(tax_benefit_system, tables, period)
+    value_by_variable_name = calculate_by_chunk(tax_benefit_system, csv_tables, period,
+        ['salaire_net', 'aide_logement'], chunk_size = 1)
+    for variable_name, value in value_by_variable_name.iteritems():
+        assert (value == simulation.calculate(variable_name, period)).all(), variable_name
+
+
+def test_calculate_by_process():
+    tables = build_tables()
+    simulation = new_simulation_from_tables(tax_benefit_system, tables, period)
+    value_by_variable_name = calculate_by_process(tax_benefit_system, tables, period, ['salaire_net', 'aide_logement'],
+        processes_count = 2, chunk_size = 1)
+    for variable_name, value in value_by_variable_name.iteritems():
+        assert (value == simulation.calculate(variable_name, period)).all(), variable_name
+
+    tables['individus']['famille_id'] = [0, 0, 0, 2, 2, 2]
+    assert_raises(ValueError, calculate_by_process, tax_benefit_system, tables, period, ['salaire_net'],
+        processes_count = 2)
+
+
+def test_calculate_empty_population():
+    tables = dict(individus = dict((name, []) for name in build_tables()['individus']))
+    for calculate in (calculate_by_chunk, calculate_by_process):
+        value_by_variable_name = calculate(tax_benefit_system, tables, period, ['salaire_net', 'aide_logement'],
+            release_values = True)
+        assert [len(value) for value in value_by_variable_name.itervalues()] == [0, 0]
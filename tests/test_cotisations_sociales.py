@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+from openfisca_core import periods, reforms
+from openfisca_core.tools import assert_near
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.model.prelevements_obligatoires.prelevements_sociaux.cotisations_sociales.base import \
+    calculate_cumul, compute_cotisations, fused_cotisations_cache
+
+
+tax_benefit_system = FranceTaxBenefitSystem()
+year = periods.period(2016)
+month = periods.period('2016-01')
+
+
+def new_simulation():
+    return tax_benefit_system.new_scenario().init_single_entity(
+        axes = [dict(count = 5, name = 'salaire_de_base', min = 0, max = 15000 * 12)],
+        parent1 = dict(
+            categorie_salarie = 'prive_cadre',
+            effectif_entreprise = 50,
+            ),
+        period = year,
+        ).new_simulation()
+
+
+def test_calculate_cumul():
+    simulation = new_simulation()
+    january_to_november = year.start.period('month', 11)
+    tax_benefit_system.fused_cotisations_sociales = True
+    try:
+        cumul = calculate_cumul(simulation, 'assiette_cotisations_sociales', january_to_november)
+        assert_near(cumul, simulation.calculate_add('assiette_cotisations_sociales', january_to_november))
+        assert calculate_cumul(simulation, 'assiette_cotisations_sociales', january_to_november) is cumul
+        assert not cumul.flags.writeable
+        # The running sum is extended up to December.
+        assert_near(
+            calculate_cumul(simulation, 'assiette_cotisations_sociales', year),
+            simulation.calculate_add('assiette_cotisations_sociales', year),
+            )
+        # Shorter sums than the one already kept are computed from scratch.
+        assert_near(
+            calculate_cumul(simulation, 'assiette_cotisations_sociales', january_to_november),
+            simulation.calculate_add('assiette_cotisations_sociales', january_to_november),
+            )
+        # The running sum is computed again when a month it adds up is deleted or replaced.
+        holder = simulation.individu.get_holder('assiette_cotisations_sociales')
+        holder.put_in_cache(holder.default_array(), periods.period('2016-03'))
+        assert_near(
+            calculate_cumul(simulation, 'assiette_cotisations_sociales', year),
+            simulation.calculate_add('assiette_cotisations_sociales', year),
+            )
+    finally:
+        tax_benefit_system.fused_cotisations_sociales = False
+    # Without the payroll mode, the sums are not kept.
+    assert calculate_cumul(simulation, 'assiette_cotisations_sociales', year) is not \
+        calculate_cumul(simulation, 'assiette_cotisations_sociales', year)
+
+
+def test_fused_cotisations_sociales():
+    for variable_name in ['cotisations_salariales', 'cotisations_employeur']:
+        expected = new_simulation().calculate_add(variable_name, year)
+        tax_benefit_system.fused_cotisations_sociales = True
+        try:
+            assert_near(new_simulation().calculate_add(variable_name, year), expected)
+        finally:
+            tax_benefit_system.fused_cotisations_sociales = False
+
+
+def test_fused_cotisations_sociales_reform():
+    class neutral_reform(reforms.Reform):
+        def apply(self):
+            pass
+
+    reform = neutral_reform(tax_benefit_system)
+    tax_benefit_system.fused_cotisations_sociales = True
+    try:
+        simulation = reform.new_scenario().init_single_entity(
+            parent1 = dict(categorie_salarie = 'prive_cadre', salaire_de_base = 3000),
+            period = month,
+            ).new_simulation()
+        simulation.calculate('cotisations_salariales', month)
+    finally:
+        tax_benefit_system.fused_cotisations_sociales = False
+    assert fused_cotisations_cache.get(simulation, ('salarie', month)) is not None
+
+
+def test_fused_cotisations_sociales_invalidation():
+    simulation = new_simulation()
+    cotisation_by_bareme_name = compute_cotisations(simulation, month, cotisation_type = 'salarie')
+    assert compute_cotisations(simulation, month, cotisation_type = 'salarie') is cotisation_by_bareme_name
+    # The results are computed again when their inputs are replaced.
+    holder = simulation.individu.get_holder('assiette_cotisations_sociales')
+    holder.put_in_cache(holder.get_array(month) * 2, month)
+    assert_near(
+        compute_cotisations(simulation, month, cotisation_type = 'salarie')['vieillesse_deplafonnee'],
+        cotisation_by_bareme_name['vieillesse_deplafonnee'] * 2,
+        absolute_error_margin = 0.05,
+        )
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+from openfisca_core import reforms
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.cache import (get_extra_params_cached_count, get_extra_params_hits_count,
+    get_extra_params_misses_count)
+
+
+class neutral_reform(reforms.Reform):
+    def apply(self):
+        pass
+
+
+def compute_rsa_ppa(extra_params_cache_max_size, reform = False):
+    tax_benefit_system = FranceTaxBenefitSystem()
+    tax_benefit_system.extra_params_cache_max_size = extra_params_cache_max_size
+    if reform:
+        tax_benefit_system = neutral_reform(tax_benefit_system)
+    simulation = tax_benefit_system.new_scenario().init_single_entity(
+        axes = [[
+            dict(count = 3, name = 'salaire_net', min = 0, max = 1500, period = month)
+            for month in ['2016-11', '2016-12', '2017-01', '2017-02', '2017-03']
+            ]],
+        parent1 = dict(age = 40),
+        enfants = [dict(age = 5)],
+        period = '2017-02',
+        ).new_simulation()
+    values = [
+        simulation.calculate(variable_name, month)
+        for month in ['2017-02', '2017-03']
+        for variable_name in ['rsa', 'ppa']
+        ]
+    return simulation, values
+
+
+def test_extra_params_cache_eviction():
+    simulation, values = compute_rsa_ppa(None)
+    evicting_simulation, evicting_values = compute_rsa_ppa(2)
+    assert get_extra_params_cached_count(evicting_simulation) == 2
+    assert get_extra_params_cached_count(evicting_simulation) < get_extra_params_cached_count(simulation)
+    for value, evicting_value in zip(values, evicting_values):
+        assert (value == evicting_value).all()
+
+
+def test_extra_params_cache_eviction_reform():
+    # Reforms use the limit of the tax and benefit system they are built on.
+    evicting_simulation, _ = compute_rsa_ppa(2, reform = True)
+    assert get_extra_params_cached_count(evicting_simulation) == 2
+
+
+def test_extra_params_counts_by_simulation():
+    simulation, _ = compute_rsa_ppa(None)
+    other_simulation, _ = compute_rsa_ppa(None)
+    misses_count = get_extra_params_misses_count(simulation)
+    assert sum(misses_count.values()) == get_extra_params_cached_count(simulation)
+    assert sum(get_extra_params_hits_count(simulation).values()) > 0
+    assert get_extra_params_misses_count(other_simulation) == misses_count
+    assert get_extra_params_misses_count(other_simulation) is not misses_count
+
+
+def test_extra_params_cache_eviction_frees_values():
+    simulation, _ = compute_rsa_ppa(2)
+    holder = simulation.get_variable_entity('rsa_base_ressources').get_holder('rsa_base_ressources')
+    cached_values = [
+        value
+        for value_by_extra_params in holder._array_by_period.itervalues()
+        for value in value_by_extra_params.itervalues()
+        if value is not None
+        ]
+    assert len(cached_values) <= 2
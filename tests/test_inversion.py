@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+from openfisca_core import periods, reforms
+from openfisca_core.model_api import MONTH, Variable, where
+from openfisca_core.tools import assert_near
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.entities import Individu
+from openfisca_france.inversion import calculate_inverse
+from openfisca_france.reforms.de_net_a_brut import calculate_salaire_de_base_from_table, get_salaire_net_a_payer_table
+
+
+tax_benefit_system = FranceTaxBenefitSystem()
+month = periods.period('2016-02')
+
+
+def new_simulation(**input_variables):
+    parent1 = dict(categorie_salarie = 'prive_non_cadre', effectif_entreprise = 1)
+    parent1.update(input_variables)
+    return tax_benefit_system.new_scenario().init_single_entity(
+        axes = [dict(count = 5, name = 'salaire_net_a_payer', min = 0, max = 10000)],
+        parent1 = parent1,
+        period = month,
+        ).new_simulation()
+
+
+def test_calculate_inverse():
+    simulation = new_simulation()
+    salaire_net_a_payer = simulation.calculate('salaire_net_a_payer', month)
+    salaire_de_base = calculate_inverse(simulation, 'salaire_de_base', 'salaire_net_a_payer', salaire_net_a_payer,
+        month, initial_guess = salaire_net_a_payer * 1.5)
+    # The input net salaries are restored, and nothing computed for a trial is left in cache.
+    assert (simulation.calculate('salaire_net_a_payer', month) == salaire_net_a_payer).all()
+    assert simulation.individu.get_holder('salaire_de_base').get_array(month) is None
+
+    check_simulation = new_simulation()
+    check_simulation.individu.get_holder('salaire_net_a_payer').delete_arrays()
+    check_simulation.individu.get_holder('salaire_de_base').put_in_cache(salaire_de_base, month)
+    assert_near(
+        check_simulation.calculate('salaire_net_a_payer', month),
+        salaire_net_a_payer,
+        absolute_error_margin = 0.1,
+        )
+
+
+class inversion_input(Variable):
+    value_type = float
+    entity = Individu
+    definition_period = MONTH
+
+
+class inversion_bonus(Variable):
+    value_type = float
+    entity = Individu
+    definition_period = MONTH
+
+    def formula(individu, period):
+        return individu('inversion_input', period) / 2
+
+
+class inversion_target(Variable):
+    value_type = float
+    entity = Individu
+    definition_period = MONTH
+
+    def formula(individu, period):
+        inversion_input = individu('inversion_input', period)
+        above_threshold = inversion_input > 10
+        if not above_threshold.any():
+            return inversion_input
+        return inversion_input + where(above_threshold, individu('inversion_bonus', period), 0)
+
+
+class inversion_branches(reforms.Reform):
+    def apply(self):
+        for variable in [inversion_input, inversion_bonus, inversion_target]:
+            self.add_variable(variable)
+
+
+def test_calculate_inverse_branches():
+    simulation = inversion_branches(tax_benefit_system).new_scenario().init_single_entity(
+        parent1 = dict(),
+        period = month,
+        ).new_simulation()
+    # The first trial doesn't compute inversion_bonus, the next ones do: its values must not be reused between trials.
+    inversion_input = calculate_inverse(simulation, 'inversion_input', 'inversion_target',
+        simulation.individu.filled_array(30), month, initial_guess = simulation.individu.filled_array(1))
+    assert_near(inversion_input, [20], absolute_error_margin = 0.01)
+    assert simulation.individu.get_holder('inversion_bonus').get_array(month) is None
+
+
+def test_salaire_net_a_payer_table():
+    simulation = new_simulation()
+    salaire_net_a_payer = simulation.calculate('salaire_net_a_payer', month)
+    salaire_de_base_table, salaire_net_a_payer_table = get_salaire_net_a_payer_table(
+        tax_benefit_system, 'prive_non_cadre', month)
+    salaire_de_base = calculate_salaire_de_base_from_table(
+        salaire_de_base_table, salaire_net_a_payer_table, salaire_net_a_payer)
+
+    # The piecewise linear inversion is exact, up to the rounding of the contributions.
+    check_simulation = new_simulation()
+    check_simulation.individu.get_holder('salaire_net_a_payer').delete_arrays()
+    check_simulation.individu.get_holder('salaire_de_base').put_in_cache(salaire_de_base, month)
+    assert_near(
+        check_simulation.calculate('salaire_net_a_payer', month),
+        salaire_net_a_payer,
+        absolute_error_margin = 0.05,
+        )
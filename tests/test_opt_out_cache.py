@@ -1,6 +1,10 @@
 import openfisca_france
 import datetime
 
+from openfisca_france.microsimulation import build_cache_blacklist, calculate_by_chunk, new_simulation_from_tables
+
+from .utils import build_tables
+
 tbs = openfisca_france.FranceTaxBenefitSystem()
 
 reference_period = "2016-01"
@@ -25,3 +29,20 @@ def test_variable_not_in_blacklist():
     simulation = scenario.new_simulation(opt_out_cache = True)
     simulation.calculate('aide_logement_montant_brut', period = reference_period)
     assert(simulation.get_or_new_holder('aide_logement_montant_brut')._array_by_period is not None)
+
+
+def test_build_cache_blacklist():
+    tables = build_tables()
+    cache_blacklist = build_cache_blacklist(tbs, tables, reference_period, ['aide_logement'])
+    assert 'aide_logement_montant_brut_avant_degressivite' in cache_blacklist
+    assert not cache_blacklist & set(['aide_logement', 'loyer', 'salaire_de_base', 'age'])
+
+    simulation = new_simulation_from_tables(tbs, tables, reference_period)
+    conf_cache_blacklist = tbs.cache_blacklist
+    tbs.cache_blacklist = cache_blacklist
+    try:
+        value_by_variable_name = calculate_by_chunk(tbs, tables, reference_period, ['aide_logement'],
+            opt_out_cache = True)
+    finally:
+        tbs.cache_blacklist = conf_cache_blacklist
+    assert (value_by_variable_name['aide_logement'] == simulation.calculate('aide_logement', reference_period)).all()
@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 
 import datetime
-import json
+import os
+import shutil
+import tempfile
 
-from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france import FranceTaxBenefitSystem, parameters_snapshot
+from openfisca_france.france_taxbenefitsystem import PARAMETERS_DIR
 
 
 # Exceptionally for this test do not import TaxBenefitSystem from tests.base.
@@ -16,3 +19,21 @@ def test_parameters():
     for year in range(2006, datetime.date.today().year + 1):
         parameters_at_instant = tax_benefit_system.get_parameters_at_instant(year)
         assert parameters_at_instant is not None
+
+
+def test_parameters_snapshot():
+    snapshot_dir = tempfile.mkdtemp()
+    try:
+        snapshot_path = os.path.join(snapshot_dir, 'parameters.snapshot')
+        parameters_snapshot.build_parameters_snapshot(tax_benefit_system.parameters, snapshot_path)
+        parameters = parameters_snapshot.load_parameters_snapshot(snapshot_path, PARAMETERS_DIR)
+        assert parameters is not None
+        # Children order is not preserved by dicts, so compare the sorted lines of both trees.
+        assert sorted(repr(parameters.get_at_instant('2016-01-01')).splitlines()) == \
+            sorted(repr(tax_benefit_system.parameters.get_at_instant('2016-01-01')).splitlines())
+
+        # A snapshot older than the sources is ignored.
+        os.utime(snapshot_path, (0, 0))
+        assert parameters_snapshot.load_parameters_snapshot(snapshot_path, PARAMETERS_DIR) is None
+    finally:
+        shutil.rmtree(snapshot_dir)
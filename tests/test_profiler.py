@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from openfisca_core import periods
+
+from openfisca_france.microsimulation import new_simulation_from_tables, profile
+
+from .cache import tax_benefit_system
+from .utils import build_tables
+
+
+period = '2017-01'
+period_ = periods.period(period)
+
+
+def test_profile():
+    simulation = new_simulation_from_tables(tax_benefit_system, build_tables(), period)
+    profiler = profile(simulation)
+    simulation.calculate('salaire_net', period)
+    simulation.calculate('salaire_net', period)
+    salaire_net_profile = profiler.profile_by_key[('salaire_net', period_)]
+    assert salaire_net_profile.calls_count == 2
+    assert salaire_net_profile.size == 6
+    assert salaire_net_profile.allocated_bytes == simulation.calculate('salaire_net', period).nbytes
+    assert profiler.profile_by_variable_name['salaire_net'].cumulative_time == salaire_net_profile.cumulative_time
+    own_time = sum(profiler.own_time_by_stack.itervalues())
+    assert abs(own_time - salaire_net_profile.cumulative_time) < 1e-6
+    assert salaire_net_profile.own_time < salaire_net_profile.cumulative_time
+    assert profiler.format_report(count = 1, sort_key = 'cumulative_time').splitlines()[1].startswith('salaire_net ')
+
+    directory = tempfile.mkdtemp()
+    try:
+        file_path = os.path.join(directory, 'profile.folded')
+        profiler.write_flame_graph(file_path)
+        with open(file_path) as flame_graph_file:
+            lines = flame_graph_file.read().splitlines()
+    finally:
+        shutil.rmtree(directory)
+    assert all(line.startswith('salaire_net') for line in lines)
+    assert any(line.startswith('salaire_net;crds_salaire ') for line in lines)
+
+
+def test_profile_traced():
+    # The profiler is chained to the tracer of a traced simulation.
+    simulation = new_simulation_from_tables(tax_benefit_system, build_tables(), period, trace = True)
+    tracer = simulation.tracer
+    profiler = profile(simulation)
+    salaire_net = simulation.calculate('salaire_net', period)
+    assert profiler.profile_by_key[('salaire_net', period_)].calls_count == 1
+    assert tracer.trace['salaire_net<{}>'.format(period)]['value'] == salaire_net.tolist()
+    assert profiler.trace is tracer.trace
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+from openfisca_core import periods
+
+from openfisca_france.microsimulation import (calculate_by_chunk, count_requests, iter_chunks,
+    new_simulation_from_tables, release_after_use)
+
+from .cache import tax_benefit_system
+from .utils import build_tables
+
+
+period = '2017-01'
+year = '2017'
+
+
+def test_release_after_use():
+    tables = build_tables()
+    requests_count_by_key = count_requests(tax_benefit_system, tables, period, ['aide_logement', 'rsa'])
+    assert ('aide_logement_montant_brut_avant_degressivite', periods.period(period), ()) in requests_count_by_key
+    assert not any(key[0] in ('aide_logement', 'rsa', 'loyer', 'age') for key in requests_count_by_key)
+    # Variables which may return the values of other periods are never released.
+    assert not any(key[0] == 'rsa_eligibilite' for key in requests_count_by_key)
+
+    simulation = new_simulation_from_tables(tax_benefit_system, tables, period)
+    released_simulation = new_simulation_from_tables(tax_benefit_system, tables, period)
+    values_releaser = release_after_use(released_simulation, requests_count_by_key)
+    for variable_name in ['aide_logement', 'rsa']:
+        assert (released_simulation.calculate(variable_name, period) ==
+            simulation.calculate(variable_name, period)).all(), variable_name
+    assert values_releaser.released_count > 0
+    for variable_name, key_period, extra_params in requests_count_by_key:
+        holder = released_simulation.get_variable_entity(variable_name).get_holder(variable_name)
+        assert holder.get_array(key_period, extra_params) is None, variable_name
+
+    value_by_variable_name = calculate_by_chunk(tax_benefit_system, tables, period, ['aide_logement'],
+        chunk_size = 1, release_values = True)
+    assert (value_by_variable_name['aide_logement'] == simulation.calculate('aide_logement', period)).all()
+
+
+def test_release_after_use_traced():
+    tables = build_tables()
+    requests_count_by_key = count_requests(tax_benefit_system, tables, period, ['salaire_net'])
+    simulation = new_simulation_from_tables(tax_benefit_system, tables, period, trace = True)
+    tracer = simulation.tracer
+    values_releaser = release_after_use(simulation, requests_count_by_key)
+    simulation.calculate('salaire_net', period)
+    # The tracer of the simulation still records the calculations.
+    assert values_releaser.tracer is tracer
+    assert 'salaire_net<2017-01>' in tracer.requested_calculations
+    for variable_name, key_period, _ in requests_count_by_key:
+        assert '{}<{}>'.format(variable_name, key_period) in simulation.tracer.trace
+
+
+def test_release_after_use_sample_branches():
+    tables = build_tables()
+    # Contributions are paid yearly in the first ménage, and monthly in the second one: the sample of the first ménage
+    # doesn't compute the monthly contributions.
+    tables['individus']['cotisation_sociale_mode_recouvrement'] = [1, 1, 1, 0, 0, 0]
+    _, sample_tables = next(iter_chunks(tax_benefit_system, tables, chunk_size = 1))
+    sample_requests_count_by_key = count_requests(tax_benefit_system, sample_tables, year, ['salaire_net'])
+    requests_count_by_key = count_requests(tax_benefit_system, tables, year, ['salaire_net'])
+    assert any(
+        requests_count != sample_requests_count_by_key.get(key)
+        for key, requests_count in requests_count_by_key.iteritems()
+        )
+
+    simulation = new_simulation_from_tables(tax_benefit_system, tables, period)
+    released_simulation = new_simulation_from_tables(tax_benefit_system, tables, period)
+    values_releaser = release_after_use(released_simulation, sample_requests_count_by_key)
+    for variable_name in ['salaire_net', 'cotisations_salariales', 'revenu_disponible']:
+        assert (released_simulation.calculate_add(variable_name, year) ==
+            simulation.calculate_add(variable_name, year)).all(), variable_name
+    assert values_releaser.released_count > 0
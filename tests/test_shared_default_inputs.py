@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.microsimulation import new_simulation_from_tables
+from openfisca_france.model.base import is_default_input
+
+from .cache import tax_benefit_system
+from .utils import build_tables
+
+
+class SharedDefaultInputsTaxBenefitSystem(FranceTaxBenefitSystem):
+    shared_default_inputs = True
+
+
+shared_default_inputs_tax_benefit_system = SharedDefaultInputsTaxBenefitSystem()
+period = '2017-01'
+
+
+def test_shared_default_value():
+    simulation = new_simulation_from_tables(shared_default_inputs_tax_benefit_system, build_tables(), period)
+    f7ga = simulation.calculate('f7ga', '2017')
+    assert is_default_input(f7ga)
+    assert not f7ga.flags.writeable
+    assert simulation.calculate('f7gb', '2017') is f7ga
+    assert simulation.calculate('caseE', '2017') is not f7ga  # Its default value is a boolean.
+    assert not is_default_input(simulation.calculate('salaire_de_base', period))
+    assert is_default_input(simulation.calculate('salaire_de_base', '2017-02'))  # Only given for 2017-01.
+    assert not is_default_input(f7ga.copy())
+
+
+def test_shared_default_inputs_disabled():
+    simulation = new_simulation_from_tables(tax_benefit_system, build_tables(), period)
+    f7ga = simulation.calculate('f7ga', '2017')
+    assert not is_default_input(f7ga)
+    assert f7ga.flags.writeable
+    assert simulation.calculate('f7gb', '2017') is not f7ga
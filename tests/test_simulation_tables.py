@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+import shutil
+import tempfile
+
+import numpy as np
+from nose.tools import assert_raises
+
+from openfisca_france.microsimulation import new_simulation_from_tables, read_tables, write_tables
+
+from .cache import tax_benefit_system
+from .utils import build_tables
+
+
+period = '2017-01'
+
+
+def test_new_simulation_from_tables():
+    simulation = new_simulation_from_tables(tax_benefit_system, build_tables(), period)
+    assert simulation.persons.count == 6
+    assert simulation.famille.count == 2
+    assert (simulation.famille.members_legacy_role == [0, 1, 2, 0, 2, 3]).all()
+    assert (simulation.menage.members_position == [0, 1, 2, 0, 1, 2]).all()
+
+    test_case_simulation = tax_benefit_system.new_scenario().init_from_test_case(
+        period = period,
+        test_case = dict(
+            individus = [
+                dict(id = 'a', age = 40, salaire_de_base = 2000),
+                dict(id = 'b', age = 38, salaire_de_base = 1500),
+                dict(id = 'c', age = 5),
+                dict(id = 'd', age = 35, salaire_de_base = 1200),
+                dict(id = 'e', age = 10),
+                dict(id = 'f', age = 8),
+                ],
+            familles = [
+                dict(id = 'f1', parents = ['a', 'b'], enfants = ['c']),
+                dict(id = 'f2', parents = ['d'], enfants = ['e', 'f']),
+                ],
+            foyers_fiscaux = [
+                dict(id = 'ff1', declarants = ['a', 'b'], personnes_a_charge = ['c']),
+                dict(id = 'ff2', declarants = ['d'], personnes_a_charge = ['e', 'f']),
+                ],
+            menages = [
+                dict(id = 'm1', personne_de_reference = 'a', conjoint = 'b', enfants = ['c'], loyer = 800,
+                    statut_occupation_logement = 4),
+                dict(id = 'm2', personne_de_reference = 'd', enfants = ['e', 'f'], loyer = 500,
+                    statut_occupation_logement = 4),
+                ],
+            ),
+        ).new_simulation()
+    assert (test_case_simulation.famille.members_legacy_role == simulation.famille.members_legacy_role).all()
+    for variable_name in ['salaire_net', 'af', 'aide_logement', 'rsa']:
+        assert (simulation.calculate(variable_name, period) ==
+            test_case_simulation.calculate(variable_name, period)).all(), variable_name
+
+
+def test_read_tables():
+    directory = tempfile.mkdtemp()
+    try:
+        write_tables(directory, build_tables())
+        tables = read_tables(tax_benefit_system, directory)
+    finally:
+        shutil.rmtree(directory)
+    assert sorted(tables) == ['individus', 'menages']
+    assert (tables['individus']['famille_role'] == build_tables()['individus']['famille_role']).all()
+    simulation = new_simulation_from_tables(tax_benefit_system, tables, period)
+    assert (simulation.calculate('loyer', period) == [800, 500]).all()
+
+
+def test_invalid_tables():
+    tables = build_tables()
+    tables['individus']['famille_role'][2] = 'conjoint'
+    assert_raises(ValueError, new_simulation_from_tables, tax_benefit_system, tables, period)
+
+    tables = build_tables()
+    tables['menages']['loyer'].append(0)
+    assert_raises(ValueError, new_simulation_from_tables, tax_benefit_system, tables, period)
+
+    tables = build_tables()
+    tables['individus']['salaire_imposable_inconnu'] = np.zeros(6)
+    assert_raises(ValueError, new_simulation_from_tables, tax_benefit_system, tables, period)
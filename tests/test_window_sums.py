@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+from openfisca_core import periods
+
+from openfisca_france import FranceTaxBenefitSystem
+from openfisca_france.cache import calculate_window_sum, get_window_sum_calls_count, get_window_sum_computations_count
+
+
+tax_benefit_system = FranceTaxBenefitSystem()
+last_3_months = periods.period('month:2016-11:3')
+
+
+def test_calculate_window_sum():
+    simulation = tax_benefit_system.new_scenario().init_single_entity(
+        parent1 = dict(salaire_de_base = {'2016-11': 1000, '2016-12': 1000, '2017-01': 1000}),
+        period = '2017-02',
+        ).new_simulation()
+    window_sum = calculate_window_sum(simulation.individu, 'salaire_de_base', last_3_months)
+    assert window_sum.tolist() == [3000]
+    assert not window_sum.flags.writeable
+    assert calculate_window_sum(simulation.individu, 'salaire_de_base', last_3_months) is window_sum
+    assert get_window_sum_calls_count(simulation) == {'salaire_de_base': 2}
+    assert get_window_sum_computations_count(simulation) == {'salaire_de_base': 1}
+
+    # The sum is computed again when a month it adds up is replaced.
+    simulation.individu.get_holder('salaire_de_base').put_in_cache(
+        simulation.individu.filled_array(2000.), periods.period('2016-12'))
+    assert calculate_window_sum(simulation.individu, 'salaire_de_base', last_3_months).tolist() == [4000]
+    assert get_window_sum_computations_count(simulation) == {'salaire_de_base': 2}
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+
+from openfisca_france import yaml_runner
+
+from .cache import tax_benefit_system
+
+
+yaml_tests = u"""
+- name: "Adult"
+  period: 2017-01
+  individus:
+    - date_naissance: 1980-06-01
+  output_variables:
+    age: 36
+- name: "Parent and child"
+  period: 2017-01
+  individus:
+    - id: parent
+      date_naissance: 1970-01-01
+    - id: child
+      date_naissance: 2010-01-01
+  familles:
+    parents: parent
+    enfants: child
+  output_variables:
+    age: [47, 7]
+- name: "Wrong age"
+  period: 2017-01
+  individus:
+    - date_naissance: 1990-01-01
+  output_variables:
+    age: 30
+- name: "Given age"
+  period: 2017-01
+  individus:
+    - age: 20
+  output_variables:
+    age: 20
+"""
+
+reform_yaml_test = u"""
+name: "SMIC horaire brut à 9 euros"
+reforms: openfisca_france.reforms.smic_h_b_9_euros.smic_h_b_9_euros
+period: 2013-06
+absolute_error_margin: 0.01
+individus:
+  - id: salarie
+output_variables:
+  smic_proratise: 9 * 35 * 52 / 12
+"""
+
+last_value_yaml_tests = u"""
+- name: "Effectif known in January"
+  period: 2017-03
+  individus:
+    - effectif_entreprise:
+        2017-01: 10
+  output_variables:
+    effectif_entreprise: 10
+- name: "Effectif known in February"
+  period: 2017-03
+  individus:
+    - effectif_entreprise:
+        2017-02: 30
+  output_variables:
+    effectif_entreprise: 30
+"""
+
+
+def test_run_tests():
+    directory = tempfile.mkdtemp()
+    try:
+        with open(os.path.join(directory, 'ages.yaml'), 'w') as yaml_file:
+            yaml_file.write(yaml_tests.encode('utf-8'))
+        tests = yaml_runner.load_tests(tax_benefit_system, [directory])
+        # The input of a formula (age) must not be replaced by a default value in other tests.
+        assert yaml_runner.build_batches(tests, 100) == [[0, 1, 2], [3]]
+        assert yaml_runner.build_batches(tests, 2) == [[0, 1], [2], [3]]
+
+        # With verbose, the tests are run one by one, printing their computation logs.
+        for options in (dict(processes_count = 1), dict(processes_count = 2), dict(verbose = True)):
+            progress_results = []
+            results = yaml_runner.run_tests(tax_benefit_system, [directory],
+                progress = lambda title, error: progress_results.append((title, error)), **options)
+            assert [title for title, _ in results] == [
+                'ages.yaml: Adult - 2017-01',
+                'ages.yaml: Parent and child - 2017-01',
+                'ages.yaml: Wrong age - 2017-01',
+                'ages.yaml: Given age - 2017-01',
+                ]
+            assert sorted(progress_results) == sorted(results)
+            errors = [error for _, error in results]
+            assert errors[0] is None and errors[1] is None and errors[3] is None, errors
+            assert 'age@2017-01' in errors[2]
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_last_value_inputs():
+    # The last known value of an input must not be the default value given by another test for a later period.
+    directory = tempfile.mkdtemp()
+    try:
+        with open(os.path.join(directory, 'effectifs.yaml'), 'w') as yaml_file:
+            yaml_file.write(last_value_yaml_tests.encode('utf-8'))
+        tests = yaml_runner.load_tests(tax_benefit_system, [directory])
+        assert yaml_runner.build_batches(tests, 100) == [[0], [1]]
+        assert yaml_runner.run_batches(tests, [[0, 1]], processes_count = 1)[0] is not None
+        assert yaml_runner.run_batches(tests, [[0], [1]], processes_count = 1) == [None, None]
+    finally:
+        shutil.rmtree(directory)
+
+
+def test_cache():
+    directory = tempfile.mkdtemp()
+    try:
+        tests_directory = os.path.join(directory, 'tests')
+        cache_directory = os.path.join(directory, 'cache')
+        os.mkdir(tests_directory)
+        for filename, content in (('ages.yaml', yaml_tests), ('reform.yaml', reform_yaml_test)):
+            with open(os.path.join(tests_directory, filename), 'w') as yaml_file:
+                yaml_file.write(content.encode('utf-8'))
+        parsed_tests = yaml_runner.load_tests(tax_benefit_system, [tests_directory])
+
+        for source in ('yaml', 'cache'):
+            yaml_runner.loaded_files_count_by_source.clear()
+            tests = yaml_runner.load_tests(tax_benefit_system, [tests_directory], cache_directory = cache_directory)
+            assert yaml_runner.loaded_files_count_by_source == {source: 2}
+            assert [title for title, _, _ in tests] == [title for title, _, _ in parsed_tests]
+            reform_scenario = tests[-1][2]['scenario']
+            assert reform_scenario.tax_benefit_system.baseline is tax_benefit_system
+            assert reform_scenario.test_case['individus'] == parsed_tests[-1][2]['scenario'].test_case['individus']
+            assert [error is None for error in yaml_runner.run_batches(tests, yaml_runner.build_batches(tests, 100),
+                processes_count = 1)] == [True, True, False, True, True]
+
+        with open(os.path.join(tests_directory, 'ages.yaml'), 'a') as yaml_file:
+            yaml_file.write('\n')
+        yaml_runner.loaded_files_count_by_source.clear()
+        yaml_runner.load_tests(tax_benefit_system, [tests_directory], cache_directory = cache_directory)
+        assert yaml_runner.loaded_files_count_by_source == {'yaml': 1, 'cache': 1}
+    finally:
+        shutil.rmtree(directory)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+from openfisca_core import periods
+
+from openfisca_france.microsimulation import new_simulation_from_tables
+from openfisca_france.model.base import get_skipped_formulas_count, is_default_input
+
+from .cache import tax_benefit_system
+from .test_shared_default_inputs import shared_default_inputs_tax_benefit_system
+from .utils import build_tables
+
+
+def get_input_variables(variable):
+    return getattr(variable.formula.base_function.im_func, 'input_variables', None)
+
+
+def test_zero_if_default_inputs():
+    tables = build_tables()
+    simulation = new_simulation_from_tables(shared_default_inputs_tax_benefit_system, tables, '2013')
+    assert is_default_input(simulation.calculate('cappme', '2013'))
+    assert get_skipped_formulas_count(simulation) == {'cappme': 1}
+
+    tables['foyers_fiscaux'] = dict(f7cf = [0, 1000])
+    simulation = new_simulation_from_tables(shared_default_inputs_tax_benefit_system, tables, '2013')
+    cappme = simulation.calculate('cappme', '2013')
+    assert cappme[0] == 0 and cappme[1] > 0
+    assert not get_skipped_formulas_count(simulation)
+
+    # Formulas are always called when the default values of the inputs are not shared.
+    simulation = new_simulation_from_tables(tax_benefit_system, build_tables(), '2013')
+    assert not is_default_input(simulation.calculate('cappme', '2013'))
+    assert not get_skipped_formulas_count(simulation)
+
+
+def test_declared_input_variables():
+    # Each input variable read by a formula skipped when its inputs have their default values must be declared.
+    variables = tax_benefit_system.variables
+    declared_variable_names = [
+        variable_name
+        for variable_name, variable in sorted(variables.iteritems())
+        if get_input_variables(variable) is not None
+        ]
+    assert 'cappme' in declared_variable_names
+    # The impôt sur le revenu of 2003 can't be calculated: the parameters of intemp are missing.
+    for year in [2002] + range(2004, 2018):
+        period = periods.period(str(year))
+        simulation = tax_benefit_system.new_scenario().init_single_entity(
+            parent1 = dict(),
+            period = period,
+            ).new_simulation(trace = True)
+        for variable_name in declared_variable_names:
+            if simulation.foyer_fiscal.get_holder(variable_name).formula.find_function(period) is None:
+                continue
+            simulation.calculate(variable_name, period)
+            input_variables = get_input_variables(variables[variable_name])
+            for key in simulation.tracer.trace['{}<{}>'.format(variable_name, period)]['dependencies']:
+                dependency_name = key.split('<')[0]
+                assert not variables[dependency_name].is_input_variable() or dependency_name in input_variables, \
+                    (variable_name, year, dependency_name)
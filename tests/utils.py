@@ -73,3 +73,23 @@ def zip_period_with_values(period_str, values):
         casted_values = values
     period_list = [str(period.start.period(period.unit).offset(index)) for index in range(size)]
     return dict(zip(period_list, casted_values))
+
+
+def build_tables():
+    # A couple with a child, and a single parent with two children.
+    return dict(
+        individus = dict(
+            famille_id = [0, 0, 0, 1, 1, 1],
+            famille_role = ['demandeur', 'conjoint', 'enfant', 'demandeur', 'enfant', 'enfant'],
+            foyer_fiscal_id = [0, 0, 0, 1, 1, 1],
+            foyer_fiscal_role = [0, 1, 2, 0, 2, 2],
+            menage_id = [0, 0, 0, 1, 1, 1],
+            menage_role = [0, 1, 2, 0, 2, 2],
+            age = [40, 38, 5, 35, 10, 8],
+            salaire_de_base = [2000., 1500., 0., 1200., 0., 0.],
+            ),
+        menages = dict(
+            loyer = [800., 500.],
+            statut_occupation_logement = [4, 4],
+            ),
+        )